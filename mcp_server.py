@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """MCP Server wrapper for README-MCP service."""
 
+import json
+import os
+from collections import OrderedDict
+
 import httpx
 from mcp.server.fastmcp import FastMCP
 
@@ -8,19 +12,53 @@ from mcp.server.fastmcp import FastMCP
 mcp = FastMCP("readme-mcp")
 BASE_URL = "http://localhost:8000"
 
+# Seconds to wait for the service; sent along so it stops working at the same time
+REQUEST_TIMEOUT = float(os.environ.get("README_MCP_CLIENT_TIMEOUT", "30"))
+
+# Last body and ETag seen per request, revalidated on the next identical call
+ETAG_CACHE_SIZE = 256
+_etag_cache: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+
+
+async def _post(client: httpx.AsyncClient, endpoint: str, payload: dict) -> dict:
+    """POST a request to the service and return the decoded JSON body.
+
+    A request made before is sent with ``If-None-Match``; on 304 Not Modified
+    the stored body is returned instead of being transferred again. The
+    client's timeout is sent as ``X-Request-Timeout``, so the service gives up
+    on the request when this client does.
+    """
+    key = endpoint + json.dumps(payload, sort_keys=True)
+    cached = _etag_cache.get(key)
+    headers = {"X-Request-Timeout": str(REQUEST_TIMEOUT)}
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    response = await client.post(
+        f"{BASE_URL}{endpoint}", json=payload, timeout=REQUEST_TIMEOUT, headers=headers
+    )
+    if cached is not None and response.status_code == 304:
+        _etag_cache.move_to_end(key)
+        return cached[1]
+
+    response.raise_for_status()
+    data = response.json()
+    etag = response.headers.get("etag")
+    if etag:
+        _etag_cache[key] = (etag, data)
+        _etag_cache.move_to_end(key)
+        while len(_etag_cache) > ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return data
+
 
 @mcp.tool()
 async def get_readme(repo_url: str, ref: str = "main", token: str | None = None) -> str:
     """Get README content from a GitHub repository"""
     async with httpx.AsyncClient() as client:
         try:
-            response = await client.post(
-                f"{BASE_URL}/readme",
-                json={"repo_url": repo_url, "ref": ref, "token": token},
-                timeout=30,
+            data = await _post(
+                client, "/readme", {"repo_url": repo_url, "ref": ref, "token": token}
             )
-            response.raise_for_status()
-            data = response.json()
             return data["content"]
         except httpx.HTTPStatusError as e:
             raise RuntimeError(
@@ -37,13 +75,11 @@ async def get_file(
     """Get a specific file from a GitHub repository"""
     async with httpx.AsyncClient() as client:
         try:
-            response = await client.post(
-                f"{BASE_URL}/file",
-                json={"repo_url": repo_url, "path": path, "ref": ref, "token": token},
-                timeout=30,
+            data = await _post(
+                client,
+                "/file",
+                {"repo_url": repo_url, "path": path, "ref": ref, "token": token},
             )
-            response.raise_for_status()
-            data = response.json()
             return data["content"]
         except httpx.HTTPStatusError as e:
             raise RuntimeError(
@@ -55,18 +91,32 @@ async def get_file(
 
 @mcp.tool()
 async def list_directory(
-    repo_url: str, dir: str = "", ref: str = "main", token: str | None = None
+    repo_url: str,
+    dir: str = "",
+    ref: str = "main",
+    token: str | None = None,
+    limit: int = 200,
+    cursor: str | None = None,
 ) -> str:
-    """List contents of a directory in a GitHub repository"""
+    """List contents of a directory in a GitHub repository.
+
+    Large directories are returned a page at a time; pass the cursor printed at
+    the end of a listing to fetch the next page.
+    """
     async with httpx.AsyncClient() as client:
         try:
-            response = await client.post(
-                f"{BASE_URL}/ls",
-                json={"repo_url": repo_url, "dir": dir, "ref": ref, "token": token},
-                timeout=30,
+            data = await _post(
+                client,
+                "/ls",
+                {
+                    "repo_url": repo_url,
+                    "dir": dir,
+                    "ref": ref,
+                    "token": token,
+                    "limit": limit,
+                    "cursor": cursor,
+                },
             )
-            response.raise_for_status()
-            data = response.json()
 
             # Format directory listing
             entries = data["entries"]
@@ -82,6 +132,11 @@ async def list_directory(
 
             result = f"Directory listing for {dir or 'root'} ({data['total_count']} entries):\n\n"
             result += "\n".join(formatted_entries)
+            if data.get("next_cursor"):
+                result += (
+                    f"\n\nShowing {len(entries)} of {data['total_count']} entries. "
+                    f"Next page cursor: {data['next_cursor']}"
+                )
 
             return result
         except httpx.HTTPStatusError as e:
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Measure the hot-path overhead of README-MCP's in-process metrics.
+
+Reports the cost of individual metric operations and the per-request cost of
+``MetricsMiddleware`` by driving a trivial ASGI app directly, without a server
+or HTTP client in the way.
+
+Usage: uv run python scripts/bench_metrics.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+
+from readme_mcp.metrics import (
+    CACHE_REQUESTS,
+    REQUEST_DURATION,
+    UPSTREAM_REQUESTS,
+    MetricsMiddleware,
+)
+
+
+def per_op_ns(fn, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app, iterations: int) -> float:
+    """Return mean nanoseconds per request through the ASGI app."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(min(1000, iterations)):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    counter = UPSTREAM_REQUESTS.labels("bench", "200")
+    histogram = REQUEST_DURATION.labels("GET", "/bench", "200")
+    print(f"counter.inc():              {per_op_ns(counter.inc, iterations):8.0f} ns")
+    print(
+        "labels().inc():             "
+        f"{per_op_ns(lambda: CACHE_REQUESTS.labels('bench', 'hit').inc(), iterations):8.0f} ns"
+    )
+    print(
+        "histogram.observe():        "
+        f"{per_op_ns(lambda: histogram.observe(0.0123), iterations):8.0f} ns"
+    )
+
+    plain = asyncio.run(drive(build_app(False), iterations))
+    instrumented = asyncio.run(drive(build_app(True), iterations))
+    print(f"request without middleware: {plain / 1000:8.1f} us")
+    print(f"request with middleware:    {instrumented / 1000:8.1f} us")
+    print(
+        f"middleware overhead:        {(instrumented - plain) / 1000:8.1f} us "
+        f"({(instrumented - plain) / plain:.1%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Admission control for upstream work in README-MCP.
+
+Every GitHub call takes one of ``settings.admission_max_in_flight`` slots.
+Calls beyond that wait in a bounded queue, but only until their request's
+admission deadline: ``settings.admission_queue_timeout`` seconds after the
+request arrived, as recorded by ``AdmissionMiddleware``, or the request's own
+deadline from ``deadline`` if that is sooner. A call that would overflow the
+queue, or whose expected wait already exceeds the time left, is rejected at
+once with 503 and a ``Retry-After`` estimate instead of piling up in memory.
+Work answered from the tree, snapshot and response caches never takes a slot,
+nor does resolving a reference whose resolution is still cached, so a response
+cache hit makes no upstream call at all.
+
+Calls are scheduled in priority lanes. Each lane may hold a share of the
+slots in proportion to its weight, so bulk work always leaves room for
+interactive calls, and freed slots go to waiting lanes by weighted fair
+queuing. A call waiting longer than ``settings.priority_max_wait`` is served
+ahead of the weights, so lower lanes keep moving under sustained load. Within
+a lane, callers take turns, so one caller's burst cannot hold up the others.
+"""
+
+import asyncio
+import contextvars
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from . import deadline, metrics
+from .config import settings
+
+# Lanes from most to least urgent, with their relative share of slots
+PRIORITY_WEIGHTS = {"interactive": 6, "batch": 3, "background": 1}
+PRIORITIES = tuple(PRIORITY_WEIGHTS)
+
+# Routes doing bulk work; every other route is interactive
+ROUTE_PRIORITIES = {"/ls/batch": "batch", "/tree": "batch", "/grep": "batch"}
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "readme_mcp_admission_deadline", default=None
+)
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "readme_mcp_priority", default="interactive"
+)
+_caller: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "readme_mcp_caller", default=""
+)
+
+# Weight of the latest sample in the moving average of slot hold times
+HOLD_TIME_ALPHA = 0.2
+
+
+def current_priority() -> str:
+    """Return the priority lane of the current request or task."""
+    return _priority.get()
+
+
+@contextmanager
+def priority(lane: str) -> Iterator[None]:
+    """Run the block's upstream calls in ``lane``."""
+    token = _priority.set(lane)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_caller() -> str:
+    """Return the identity of the caller the current request is made for."""
+    return _caller.get()
+
+
+@contextmanager
+def caller(identity: str) -> Iterator[None]:
+    """Queue the block's upstream calls on behalf of ``identity``."""
+    token = _caller.set(identity)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+class AdmissionController:
+    """Bounded concurrency with bounded, deadline-aware priority queues.
+
+    Args:
+        max_in_flight: Calls running at once; 0 disables admission control
+        max_queue: Calls waiting at once, over all lanes; further calls are
+            rejected
+    """
+
+    def __init__(self, max_in_flight: int | None = None, max_queue: int | None = None):
+        self.max_in_flight = (
+            settings.admission_max_in_flight if max_in_flight is None else max_in_flight
+        )
+        self.max_queue = (
+            settings.admission_max_queue if max_queue is None else max_queue
+        )
+        self.in_flight = 0
+        # Moving average of seconds a slot is held, used to estimate waits
+        self.hold_time = 0.0
+        self.lane_in_flight = dict.fromkeys(PRIORITIES, 0)
+        self.lane_queued = dict.fromkeys(PRIORITIES, 0)
+        # Per lane, each waiting caller's (enqueue time, future) pairs, oldest
+        # first; callers are served round-robin in the order of the mapping
+        self._waiters: dict[str, OrderedDict[str, deque[tuple]]] = {
+            lane: OrderedDict() for lane in PRIORITIES
+        }
+        # Weighted fair queuing: a lane's virtual time advances by 1/weight per
+        # admitted waiter, and the lane furthest behind goes next
+        self._passes = dict.fromkeys(PRIORITIES, 0.0)
+        self._virtual_time = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(self.lane_queued.values())
+
+    def lane_limit(self, lane: str) -> int:
+        """Slots ``lane`` may hold at once: its weighted share, at least one."""
+        share = PRIORITY_WEIGHTS[lane] / max(PRIORITY_WEIGHTS.values())
+        return max(1, math.ceil(self.max_in_flight * share))
+
+    def expected_wait(self, position: int) -> float:
+        """Estimate seconds until the call at queue ``position`` gets a slot."""
+        return position * self.hold_time / max(1, self.max_in_flight)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot in the current priority lane for the block.
+
+        Raises:
+            HTTPException: 503 with ``Retry-After`` if no slot is free in time
+        """
+        if self.max_in_flight <= 0:
+            yield
+            return
+        lane = current_priority()
+        await self._acquire(lane)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.hold_time += HOLD_TIME_ALPHA * (
+                time.monotonic() - start - self.hold_time
+            )
+            self._release(lane)
+
+    async def _acquire(self, lane: str = "interactive") -> None:
+        if self._runnable(lane) and self._next_lane() is None:
+            self._start(lane)
+            return
+
+        queue_deadline = _deadline.get()
+        now = time.monotonic()
+        remaining = (
+            settings.admission_queue_timeout
+            if queue_deadline is None
+            else queue_deadline - now
+        )
+        # Nor past the deadline the client gave for the whole request
+        request_left = deadline.remaining()
+        if request_left is not None:
+            remaining = min(remaining, request_left)
+        if self.queued >= self.max_queue:
+            raise self._reject(lane, "queue_full")
+        if remaining <= 0 or self.expected_wait(self._position(lane)) > remaining:
+            raise self._reject(lane, "deadline")
+
+        callers = self._waiters[lane]
+        if not callers:
+            # A lane returning from idle doesn't get credit for its idle time
+            self._passes[lane] = max(self._passes[lane], self._virtual_time)
+        identity = current_caller()
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (now, waiter)
+        queue = callers.get(identity)
+        if queue is None:
+            queue = callers[identity] = deque()
+        queue.append(entry)
+        self.lane_queued[lane] += 1
+        metrics.ADMISSION_QUEUED.inc()
+        try:
+            done, _ = await asyncio.wait((waiter,), timeout=remaining)
+        except asyncio.CancelledError:
+            self._abandon(lane, identity, entry)
+            raise
+        finally:
+            metrics.ADMISSION_QUEUED.dec()
+        if not done:
+            self._abandon(lane, identity, entry)
+            raise self._reject(lane, "deadline")
+        metrics.ADMISSION_WAIT.labels(lane).observe(time.monotonic() - now)
+
+    def _runnable(self, lane: str) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        return self.lane_in_flight[lane] < self.lane_limit(lane)
+
+    def _start(self, lane: str) -> None:
+        self.in_flight += 1
+        self.lane_in_flight[lane] += 1
+
+    def _position(self, lane: str) -> int:
+        """Queue position of a new call in ``lane``, counting lanes above it."""
+        above = PRIORITIES[: PRIORITIES.index(lane) + 1]
+        return 1 + sum(self.lane_queued[other] for other in above)
+
+    def _next_lane(self) -> str | None:
+        """Pick the lane whose oldest waiter gets the next free slot."""
+        starved_before = time.monotonic() - settings.priority_max_wait
+        best, best_key = None, None
+        for lane in PRIORITIES:
+            callers = self._waiters[lane]
+            if not callers or not self._runnable(lane):
+                continue
+            # Oldest waiter of the caller whose turn it is
+            enqueued = next(iter(callers.values()))[0][0]
+            # Starved waiters first, oldest first; then the lowest virtual time
+            key = (
+                (0, enqueued) if enqueued <= starved_before else (1, self._passes[lane])
+            )
+            if best_key is None or key < best_key:
+                best, best_key = lane, key
+        return best
+
+    def _release(self, lane: str) -> None:
+        self.in_flight -= 1
+        self.lane_in_flight[lane] -= 1
+        self._admit()
+
+    def _admit(self) -> None:
+        """Hand free slots to waiters by lane weight, then caller turn."""
+        while (lane := self._next_lane()) is not None:
+            callers = self._waiters[lane]
+            identity, queue = next(iter(callers.items()))
+            _, waiter = queue.popleft()
+            self.lane_queued[lane] -= 1
+            if queue:
+                callers.move_to_end(identity)
+            else:
+                del callers[identity]
+            if waiter.done():
+                continue
+            self._virtual_time = self._passes[lane]
+            self._passes[lane] += 1 / PRIORITY_WEIGHTS[lane]
+            self._start(lane)
+            waiter.set_result(None)
+
+    def _abandon(self, lane: str, identity: str, entry: tuple) -> None:
+        """Leave the queue; pass the slot on if it was handed over meanwhile."""
+        waiter = entry[1]
+        if waiter.done():
+            self._release(lane)
+            return
+        waiter.cancel()
+        callers = self._waiters[lane]
+        callers[identity].remove(entry)
+        self.lane_queued[lane] -= 1
+        if not callers[identity]:
+            del callers[identity]
+
+    def _reject(self, lane: str, reason: str) -> HTTPException:
+        metrics.ADMISSION_REJECTED.labels(lane, reason).inc()
+        retry_after = max(1, math.ceil(self.expected_wait(self._position(lane))))
+        return HTTPException(
+            status_code=503,
+            detail="Service overloaded, retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class AdmissionMiddleware:
+    """ASGI middleware starting each request's admission deadline on arrival.
+
+    It also picks the request's priority lane from its route. An
+    ``X-Priority`` header may move a request to a lower lane, never a higher
+    one.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = _deadline.set(time.monotonic() + settings.admission_queue_timeout)
+        lane = _priority.set(self._lane(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _priority.reset(lane)
+            _deadline.reset(deadline)
+
+    @staticmethod
+    def _lane(scope: Scope) -> str:
+        lane = ROUTE_PRIORITIES.get(scope["path"], "interactive")
+        requested = Headers(scope=scope).get("x-priority", "").strip().lower()
+        if requested not in PRIORITY_WEIGHTS:
+            return lane
+        return max(lane, requested, key=PRIORITIES.index)
@@ -1,30 +1,72 @@
 """API endpoints for README-MCP."""
 
+import asyncio
 import base64
+import hashlib
+import json
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from itertools import islice
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 
+from . import deadline, find, grep, offload, timing, tree
+from .config import settings
 from .github_client import GitHubClient
 from .models import (
-    DirectoryEntry,
+    BatchDirectoryRequest,
+    BatchDirectoryResponse,
     DirectoryRequest,
     DirectoryResponse,
     FileRequest,
     FileResponse,
+    FindMatch,
+    FindRequest,
+    FindResponse,
+    GrepMatch,
+    GrepRequest,
+    GrepResponse,
     ReadmeRequest,
     ReadmeResponse,
+    TreeRequest,
+    TreeResponse,
 )
+from .records import DirectoryRecord, FileRecord
+from .response_cache import ResponseCache
+from .serialization import JSONBytesResponse, dumps
+from .snapshot import SnapshotLease, SnapshotStore
 
-router = APIRouter()
+router = APIRouter(route_class=timing.TimedRoute)
 github_client = GitHubClient()
+snapshot_store = SnapshotStore()
+response_cache = ResponseCache()
+
+# Number of NDJSON lines written per streamed chunk
+TREE_STREAM_BATCH = 512
+
+# Sort keys for /ls; "type" lists directories first, then files, then the rest
+DIRECTORY_SORT_KEYS = {
+    "name": lambda item: item.name,
+    "size": lambda item: (item.size or 0, item.name),
+    "type": lambda item: ({"dir": 0, "file": 1}.get(item.type, 2), item.name),
+}
 
 
 @router.post("/readme", response_model=ReadmeResponse)
-async def get_readme(request: ReadmeRequest) -> ReadmeResponse:
+async def get_readme(
+    request: ReadmeRequest, if_none_match: str | None = Header(None)
+) -> Response:
     """Get README file from GitHub repository.
 
+    The reference is resolved to a commit first; the encoded body is cached
+    per commit. The ETag is the README's blob SHA, so a caller revalidating
+    with ``If-None-Match`` (header or field) gets a 304 until the README
+    itself changes.
+
     Args:
         request: README request with repo URL, ref, and optional token
+        if_none_match: ``If-None-Match`` header
 
     Returns:
         README content and metadata
@@ -35,21 +77,27 @@ async def get_readme(request: ReadmeRequest) -> ReadmeResponse:
     owner, repo = github_client.parse_repo_url(request.repo_url)
 
     try:
-        readme_data = await github_client.get_readme(
-            owner, repo, request.ref, request.token
-        )
+        sha = await github_client.resolve_ref(owner, repo, request.ref, request.token)
+        key = response_cache.key("readme", owner, repo, sha, request.token, request.ref)
+        if_none_match = request.if_none_match or if_none_match
+        cached = response_cache.get(key)
+        if cached is not None:
+            return await response_cache.respond(key, cached, if_none_match)
 
-        content = base64.b64decode(readme_data["content"]).decode("utf-8")
+        # Fetched by ref, not SHA, so download_url names the ref and the body
+        # stays identical across commits that leave the README unchanged
+        readme = await github_client.get_readme(owner, repo, request.ref, request.token)
 
-        return ReadmeResponse(
-            content=content,
-            name=readme_data["name"],
-            path=readme_data["path"],
-            sha=readme_data["sha"],
-            size=readme_data["size"],
-            encoding=readme_data["encoding"],
-            download_url=readme_data["download_url"],
-        )
+        content = readme.content
+        with timing.phase("decode"):
+            content = await offload.run(
+                "base64", offload.decode_base64_text, content, size=len(content)
+            )
+
+        with timing.phase("encode"):
+            body = dumps(_file_body(readme, content))
+        cached = response_cache.put(key, body, etag=f'"{readme.sha}"')
+        return await response_cache.respond(key, cached, if_none_match)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -57,11 +105,17 @@ async def get_readme(request: ReadmeRequest) -> ReadmeResponse:
 
 
 @router.post("/file", response_model=FileResponse)
-async def get_file(request: FileRequest) -> FileResponse:
+async def get_file(
+    request: FileRequest, if_none_match: str | None = Header(None)
+) -> Response:
     """Get file from GitHub repository.
 
+    The reference is resolved to a commit first; the encoded body is cached
+    per commit. The ETag is the file's blob SHA, as for ``/readme``.
+
     Args:
         request: File request with repo URL, path, ref, and optional token
+        if_none_match: ``If-None-Match`` header
 
     Returns:
         File content and metadata
@@ -72,24 +126,32 @@ async def get_file(request: FileRequest) -> FileResponse:
     owner, repo = github_client.parse_repo_url(request.repo_url)
 
     try:
-        file_data = await github_client.get_file(
+        sha = await github_client.resolve_ref(owner, repo, request.ref, request.token)
+        key = response_cache.key(
+            "file", owner, repo, sha, request.token, request.ref, request.path
+        )
+        if_none_match = request.if_none_match or if_none_match
+        cached = response_cache.get(key)
+        if cached is not None:
+            return await response_cache.respond(key, cached, if_none_match)
+
+        # By ref, like the README, for a body that depends on the blob only
+        file = await github_client.get_file(
             owner, repo, request.path, request.ref, request.token
         )
 
         # Decode content if it's base64 encoded
-        content = file_data["content"]
-        if file_data.get("encoding") == "base64":
-            content = base64.b64decode(content).decode("utf-8")
-
-        return FileResponse(
-            content=content,
-            name=file_data["name"],
-            path=file_data["path"],
-            sha=file_data["sha"],
-            size=file_data["size"],
-            encoding=file_data["encoding"],
-            download_url=file_data["download_url"],
-        )
+        content = file.content
+        if file.encoding == "base64":
+            with timing.phase("decode"):
+                content = await offload.run(
+                    "base64", offload.decode_base64_text, content, size=len(content)
+                )
+
+        with timing.phase("encode"):
+            body = dumps(_file_body(file, content))
+        cached = response_cache.put(key, body, etag=f'"{file.sha}"')
+        return await response_cache.respond(key, cached, if_none_match)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -97,46 +159,527 @@ async def get_file(request: FileRequest) -> FileResponse:
 
 
 @router.post("/ls", response_model=DirectoryResponse)
-async def list_directory(request: DirectoryRequest) -> DirectoryResponse:
+async def list_directory(
+    request: DirectoryRequest, if_none_match: str | None = Header(None)
+) -> Response:
     """List directory contents from GitHub repository.
 
+    Entries are served from the cached recursive tree of the resolved commit,
+    so directories of any size can be paged through with ``limit`` and
+    ``cursor``. The cursor pins the commit, keeping later pages consistent even
+    if the branch moves. Encoded pages are cached per commit. The ETag is
+    derived from the commit SHA and the listing parameters, since entries link
+    to files at that commit.
+
     Args:
-        request: Directory request with repo URL, directory path, ref, and optional token
+        request: Directory request with repo URL, directory path, ref, paging,
+            sorting and type filter, and optional token
+        if_none_match: ``If-None-Match`` header
 
     Returns:
-        Directory listing with entries and metadata
+        Directory listing with one page of entries and the next page cursor
 
     Raises:
-        HTTPException: If repository/directory not found, path invalid, or other errors
+        HTTPException: If repository/directory not found, path invalid, cursor
+            invalid, or other errors
     """
     owner, repo = github_client.parse_repo_url(request.repo_url)
 
     try:
-        directory_data = await github_client.list_directory(
-            owner, repo, request.dir, request.ref, request.token
+        ref, offset = request.ref, 0
+        if request.cursor:
+            ref, offset = _decode_cursor(request.cursor, _listing_key(request))
+
+        sha = await github_client.resolve_ref(owner, repo, ref, request.token)
+        key = response_cache.key(
+            "ls",
+            owner,
+            repo,
+            sha,
+            request.token,
+            request.dir,
+            offset,
+            request.limit,
+            request.sort,
+            request.order,
+            request.type,
+        )
+        if_none_match = request.if_none_match or if_none_match
+        cached = response_cache.get(key)
+        if cached is not None:
+            return await response_cache.respond(key, cached, if_none_match)
+
+        snapshot = await github_client.get_tree_at(owner, repo, sha, request.token)
+        items = await _directory_items(
+            owner, repo, snapshot, request.dir, request.token
         )
 
-        # Convert GitHub API response to our DirectoryEntry model
-        entries = []
-        for item in directory_data:
-            entry = DirectoryEntry(
-                name=item["name"],
-                path=item["path"],
-                sha=item["sha"],
-                size=item.get("size"),  # Directories don't have size
-                type=item["type"],
-                download_url=item.get(
-                    "download_url"
-                ),  # Directories don't have download_url
+        page = _directory_page(request, snapshot.sha, items, offset)
+        with timing.phase("encode"):
+            body = dumps(page)
+        cached = response_cache.put(key, body, etag=_listing_etag(key))
+        return await response_cache.respond(key, cached, if_none_match)
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e)) from None
+
+
+@router.post("/ls/batch", response_model=BatchDirectoryResponse)
+async def list_directories(request: BatchDirectoryRequest) -> JSONBytesResponse:
+    """List several directories of one repository in a single request.
+
+    All directories are answered from one recursive tree fetch of the resolved
+    commit. If GitHub truncated that tree, each directory falls back to its own
+    contents API call, run concurrently under the client's shared fan-out limit.
+
+    Args:
+        request: Batch request with repo URL, directory paths, ref, paging,
+            sorting and type filter, and optional token
+
+    Returns:
+        First page of each listing keyed by path, and errors keyed by path
+
+    Raises:
+        HTTPException: If repository or reference not found, or other errors
+    """
+    owner, repo = github_client.parse_repo_url(request.repo_url)
+
+    try:
+        snapshot = await github_client.get_tree(owner, repo, request.ref, request.token)
+
+        async def list_one(path: str) -> dict:
+            items = await _directory_items(owner, repo, snapshot, path, request.token)
+            listing = DirectoryRequest(
+                repo_url=request.repo_url,
+                dir=path,
+                limit=request.limit,
+                sort=request.sort,
+                order=request.order,
+                type=request.type,
             )
-            entries.append(entry)
+            return _directory_page(listing, snapshot.sha, items, 0)
 
-        return DirectoryResponse(
-            entries=entries,
-            total_count=len(entries),
-            path=request.dir,
+        outcomes = await asyncio.gather(
+            *(list_one(path) for path in request.dirs), return_exceptions=True
         )
+
+        results, errors = {}, {}
+        for path, outcome in zip(request.dirs, outcomes, strict=True):
+            if isinstance(outcome, HTTPException):
+                errors[path] = {
+                    "status_code": outcome.status_code,
+                    "detail": outcome.detail,
+                }
+            elif isinstance(outcome, Exception):
+                errors[path] = {"status_code": 500, "detail": str(outcome)}
+            else:
+                results[path] = outcome
+
+        with timing.phase("encode"):
+            return JSONBytesResponse(
+                {"sha": snapshot.sha, "results": results, "errors": errors}
+            )
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=str(e)) from None
+
+
+async def _directory_items(
+    owner: str,
+    repo: str,
+    snapshot: tree.TreeSnapshot,
+    path: str,
+    token: str | None,
+) -> list[DirectoryRecord]:
+    """Return the children of ``path`` at the snapshot's commit as records."""
+    if not snapshot.truncated:
+        return _snapshot_directory(owner, repo, snapshot, path)
+
+    # Recursive tree is incomplete; fall back to the contents API
+    async with github_client.fanout:
+        return await github_client.list_directory(
+            owner, repo, path, snapshot.sha, token
+        )
+
+
+def _directory_page(
+    request: DirectoryRequest, sha: str, items: list[DirectoryRecord], offset: int
+) -> dict:
+    """Filter, sort and slice directory entry records into one response page.
+
+    Returns:
+        Page body in the ``DirectoryResponse`` shape
+    """
+    if request.type is not None:
+        items = [item for item in items if item.type == request.type]
+    _sort_directory(items, request.sort, request.order)
+
+    page = items[offset : offset + request.limit]
+    next_cursor = None
+    if offset + request.limit < len(items):
+        next_cursor = _encode_cursor(sha, offset + request.limit, _listing_key(request))
+
+    return {
+        "entries": [
+            {
+                "name": item.name,
+                "path": item.path,
+                "sha": item.sha,
+                "size": item.size,
+                "type": item.type,
+                "download_url": item.download_url,
+            }
+            for item in page
+        ],
+        "total_count": len(items),
+        "path": request.dir,
+        "next_cursor": next_cursor,
+    }
+
+
+def _file_body(record: FileRecord, content: str) -> dict:
+    """Return a ``FileResponse``/``ReadmeResponse`` body for a decoded file."""
+    return {
+        "content": content,
+        "name": record.name,
+        "path": record.path,
+        "sha": record.sha,
+        "size": record.size,
+        "encoding": record.encoding,
+        "download_url": record.download_url,
+    }
+
+
+def _snapshot_directory(
+    owner: str, repo: str, snapshot: tree.TreeSnapshot, path: str
+) -> list[DirectoryRecord]:
+    """Return the immediate children of ``path`` as directory entry records."""
+    path_type = snapshot.type_of(path)
+    if path_type is None:
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if path_type != "dir":
+        raise HTTPException(status_code=400, detail="Path is a file, not a directory")
+
+    raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{snapshot.sha}/"
+    items = []
+    for i in snapshot.children(path):
+        entry_path, entry_type = snapshot.paths[i], snapshot.types[i]
+        parent, _, name = entry_path.rpartition("/")
+        items.append(
+            DirectoryRecord(
+                parent=parent,
+                name=name,
+                sha=snapshot.shas[i],
+                size=snapshot.size_of(i),
+                type=entry_type,
+                download_url=raw_url + entry_path if entry_type == "file" else None,
+            )
+        )
+    return items
+
+
+def _sort_directory(items: list[DirectoryRecord], sort: str, order: str) -> None:
+    """Sort directory entry records in place by name, size or type."""
+    items.sort(key=DIRECTORY_SORT_KEYS[sort], reverse=order == "desc")
+
+
+def _listing_etag(key: tuple) -> str:
+    """Return the strong ETag of a listing page from its response cache key."""
+    return f'"{hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()}"'
+
+
+def _listing_key(request: DirectoryRequest) -> str:
+    """Identify the listing a cursor belongs to."""
+    return f"{request.repo_url}|{request.dir}|{request.sort}|{request.order}|{request.type}"
+
+
+def _encode_cursor(sha: str, offset: int, key: str) -> str:
+    """Encode an opaque page cursor for a listing at a fixed commit."""
+    payload = json.dumps({"sha": sha, "offset": offset, "key": key})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, key: str) -> tuple[str, int]:
+    """Decode a page cursor into (commit SHA, offset).
+
+    Raises:
+        HTTPException: If the cursor is malformed or belongs to another listing
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        sha, offset = str(payload["sha"]), int(payload["offset"])
+        valid = payload["key"] == key and offset >= 0
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sha, offset
+
+
+@router.post("/tree", response_model=TreeResponse)
+async def get_tree(request: TreeRequest):
+    """Recursively list a directory subtree from GitHub repository.
+
+    The subtree is computed from one recursive git tree fetch per commit. With
+    ``stream`` set, entries are written as NDJSON lines as they are produced
+    instead of being collected into a single JSON body.
+
+    Args:
+        request: Tree request with repo URL, path, ref, depth and filters
+
+    Returns:
+        Tree listing with entries and metadata, or an NDJSON stream of entries
+
+    Raises:
+        HTTPException: If repository/path not found, path is a file, or other errors
+    """
+    owner, repo = github_client.parse_repo_url(request.repo_url)
+
+    try:
+        snapshot = await github_client.get_tree(owner, repo, request.ref, request.token)
+
+        path_type = snapshot.type_of(request.path)
+        if path_type is None:
+            raise HTTPException(status_code=404, detail="Directory not found")
+        if path_type != "dir":
+            raise HTTPException(
+                status_code=400, detail="Path is a file, not a directory"
+            )
+
+        indices = tree.walk(
+            snapshot,
+            request.path,
+            depth=request.depth,
+            include=request.include,
+            exclude=request.exclude,
+            min_size=request.min_size,
+            max_size=request.max_size,
+        )
+
+        if request.stream:
+            return StreamingResponse(
+                _ndjson_entries(snapshot, indices),
+                media_type="application/x-ndjson",
+                headers={
+                    "X-Tree-Sha": snapshot.sha,
+                    "X-Tree-Truncated": str(snapshot.truncated).lower(),
+                },
+            )
+
+        entries = [snapshot.entry(i) for i in indices]
+
+        with timing.phase("encode"):
+            return JSONBytesResponse(
+                {
+                    "entries": entries,
+                    "total_count": len(entries),
+                    "path": request.path,
+                    "sha": snapshot.sha,
+                    "truncated": snapshot.truncated,
+                }
+            )
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e)) from None
+
+
+@router.post("/find", response_model=FindResponse)
+async def find_files(request: FindRequest) -> FindResponse:
+    """Search a repository's file and directory names.
+
+    Evaluates either a glob ``pattern`` or a fuzzy filename ``query`` against a
+    trigram index built once per commit from the recursive tree.
+
+    Args:
+        request: Find request with repo URL, pattern or query, ref and filters
+
+    Returns:
+        Matching entries with sizes and SHAs, and the total match count
+
+    Raises:
+        HTTPException: If repository/path not found, path is a file, or other errors
+    """
+    owner, repo = github_client.parse_repo_url(request.repo_url)
+
+    try:
+        snapshot = await github_client.get_tree(owner, repo, request.ref, request.token)
+
+        path_type = snapshot.type_of(request.path)
+        if path_type is None:
+            raise HTTPException(status_code=404, detail="Directory not found")
+        if path_type != "dir":
+            raise HTTPException(
+                status_code=400, detail="Path is a file, not a directory"
+            )
+
+        await find.load_index(snapshot)
+        if request.pattern is not None:
+            found = [
+                (None, i)
+                for i in find.find_glob(
+                    snapshot, request.pattern, request.path, request.type
+                )
+            ]
+            total_count = len(found)
+        else:
+            found, total_count = find.find_fuzzy(
+                snapshot, request.query, request.path, request.type, request.limit
+            )
+
+        matches = [
+            FindMatch(**snapshot.entry(i), score=score)
+            for score, i in islice(found, request.limit)
+        ]
+
+        return FindResponse(
+            matches=matches,
+            total_count=total_count,
+            sha=snapshot.sha,
+            truncated=snapshot.truncated,
+        )
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e)) from None
+
+
+@router.post("/grep", response_model=GrepResponse)
+async def grep_files(request: GrepRequest):
+    """Search file contents of a repository snapshot.
+
+    The commit's archive is downloaded once into a local snapshot and text files
+    selected from the recursive tree are searched across a process pool. With
+    ``stream`` set, matches are written as NDJSON lines as workers finish,
+    followed by one summary line.
+
+    Args:
+        request: Grep request with repo URL, pattern, ref, filters and limits
+
+    Returns:
+        Matches with line numbers and context, or an NDJSON stream of matches
+
+    Raises:
+        HTTPException: If repository/path not found, repository too large, or
+            other errors
+    """
+    owner, repo = github_client.parse_repo_url(request.repo_url)
+
+    try:
+        snapshot = await github_client.get_tree(owner, repo, request.ref, request.token)
+
+        path_type = snapshot.type_of(request.path)
+        if path_type is None:
+            raise HTTPException(status_code=404, detail="Directory not found")
+        if path_type != "dir":
+            raise HTTPException(
+                status_code=400, detail="Path is a file, not a directory"
+            )
+
+        max_file_size = min(request.max_file_size, settings.snapshot_max_file_size)
+        paths, sizes = [], []
+        for i in tree.walk(
+            snapshot,
+            request.path,
+            include=request.include,
+            exclude=request.exclude,
+            max_size=max_file_size,
+        ):
+            if snapshot.types[i] == "file":
+                paths.append(snapshot.paths[i])
+                sizes.append(snapshot.sizes[i])
+
+        if sum(sizes) > settings.snapshot_max_bytes:
+            raise HTTPException(
+                status_code=413, detail="Repository too large to search"
+            )
+
+        timeout = deadline.timeout(request.timeout)
+        lease = await snapshot_store.acquire(
+            github_client, owner, repo, snapshot.sha, request.token
+        )
+
+        stats = grep.GrepStats()
+        matches = _leased(
+            grep.run_grep(
+                lease.path,
+                paths,
+                sizes,
+                request.pattern,
+                regex=request.regex,
+                case_sensitive=request.case_sensitive,
+                context=request.context,
+                max_results=request.max_results,
+                timeout=timeout,
+                stats=stats,
+            ),
+            lease,
+        )
+        # Also released if the stream is dropped before it starts
+        weakref.finalize(matches, lease.release)
+
+        if request.stream:
+            return StreamingResponse(
+                _ndjson_matches(matches, stats, snapshot.sha),
+                media_type="application/x-ndjson",
+                headers={"X-Tree-Sha": snapshot.sha},
+            )
+
+        results = [GrepMatch(**match) async for match in matches]
+        results.sort(key=lambda m: (m.path, m.line_number))
+
+        return GrepResponse(
+            matches=results,
+            total_count=len(results),
+            files_scanned=stats.files_scanned,
+            sha=snapshot.sha,
+            limit_reached=stats.limit_reached,
+            timed_out=stats.timed_out,
+        )
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e)) from None
+
+
+async def _leased(
+    matches: AsyncIterator[dict], lease: SnapshotLease
+) -> AsyncIterator[dict]:
+    """Yield ``matches``, releasing ``lease`` on their snapshot once done."""
+    try:
+        async for match in matches:
+            yield match
+    finally:
+        lease.release()
+
+
+async def _ndjson_matches(
+    matches: AsyncIterator[dict], stats: grep.GrepStats, sha: str
+) -> AsyncIterator[str]:
+    """Encode grep matches as NDJSON, ending with a summary line."""
+    async for match in matches:
+        yield json.dumps(match, separators=(",", ":")) + "\n"
+    summary = {
+        "summary": {
+            "total_count": stats.match_count,
+            "files_scanned": stats.files_scanned,
+            "sha": sha,
+            "limit_reached": stats.limit_reached,
+            "timed_out": stats.timed_out,
+        }
+    }
+    yield json.dumps(summary, separators=(",", ":")) + "\n"
+
+
+def _ndjson_entries(snapshot: tree.TreeSnapshot, indices: Iterator[int]):
+    """Encode snapshot entries as NDJSON, yielding a chunk per batch."""
+    batch = []
+    for i in indices:
+        batch.append(json.dumps(snapshot.entry(i), separators=(",", ":")))
+        if len(batch) >= TREE_STREAM_BATCH:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
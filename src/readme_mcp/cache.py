@@ -0,0 +1,159 @@
+"""In-process caching primitives for README-MCP."""
+
+import asyncio
+import contextvars
+import functools
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from typing import Any
+
+from . import deadline, metrics
+
+# Every named cache, for memory accounting
+_named: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+def named_caches() -> list["LRUCache"]:
+    """Return the live caches that were given a name."""
+    return list(_named)
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping.
+
+    Entries never expire here; they are simply evicted once the cache is full.
+    Most caches hold immutable data keyed by commit or blob SHA. Callers
+    caching data that can change, such as resolved refs, store an expiry time
+    with each value and check it themselves. With ``max_bytes`` set, ``weigh``
+    gives each value's size and the cache also evicts to stay within that many
+    bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        name: str | None = None,
+        max_bytes: int | None = None,
+        weigh: Callable[[Any], int] | None = None,
+    ):
+        self.max_entries = max_entries
+        # Cache layer name reported in hit/miss metrics; unnamed caches aren't counted
+        self.name = name
+        self.max_bytes = max_bytes
+        self._weigh = weigh
+        # Sum of the weights of cached values
+        self.total_bytes = 0
+        self._weights: dict[Hashable, int] = {}
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        if name:
+            _named.add(self)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            if self.name:
+                metrics.record_cache(self.name, False)
+            return None
+        if self.name:
+            metrics.record_cache(self.name, True)
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full.
+
+        A value weighing more than ``max_bytes`` on its own is not stored.
+        """
+        weight = self._weigh(value) if self._weigh else 0
+        if self.max_bytes is not None and weight > self.max_bytes:
+            return
+        self.total_bytes += weight - self._weights.pop(key, 0)
+        if weight:
+            self._weights[key] = weight
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            evicted, _ = self._data.popitem(last=False)
+            self.total_bytes -= self._weights.pop(evicted, 0)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._data.clear()
+        self._weights.clear()
+        self.total_bytes = 0
+
+    def values(self) -> Iterator[Any]:
+        """Iterate over cached values without updating recency."""
+        return iter(list(self._data.values()))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one upstream call.
+
+    The call runs in its own task, detached from the deadline of the request
+    that started it. Each caller waits for it only until its own deadline, and
+    the call is cancelled once no caller is left waiting for its result.
+    """
+
+    def __init__(self, name: str = "default"):
+        # Label for the coalesced-call metric
+        self.name = name
+        # Key to the running call's task and the number of callers awaiting it
+        self._inflight: dict[Hashable, list] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` once per ``key``; concurrent callers share its result.
+
+        Args:
+            key: Identity of the work being performed
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            Result of ``fn``, or the exception it raised re-raised to every waiter
+
+        Raises:
+            HTTPException: 504 if the caller's deadline passes before the result
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            context = contextvars.copy_context()
+            context.run(deadline.detach)
+            task = asyncio.create_task(fn(), context=context)
+            task.add_done_callback(functools.partial(self._finished, key))
+            flight = self._inflight[key] = [task, 0]
+        else:
+            metrics.SINGLEFLIGHT_COALESCED.labels(self.name).inc()
+
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except TimeoutError:
+            raise deadline.exceeded() from None
+        finally:
+            flight[1] -= 1
+            if not flight[1]:
+                task.cancel()
+                # Gone at once, so a caller arriving now starts a new call
+                # instead of joining this cancelled one
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        # The key may already belong to a newer call
+        flight = self._inflight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._inflight[key]
+        # Mark retrieved so waiter-less failures don't log warnings
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,182 @@
+"""Response compression for README-MCP.
+
+``CompressionMiddleware`` negotiates a content coding from ``Accept-Encoding``
+and records it in a context variable for the request. Cached responses use it
+to send a stored compressed variant, so each cached body is compressed once per
+coding rather than once per request. Every other response is compressed by the
+middleware itself. gzip is always available; brotli and zstd are used when
+the ``brotli`` and ``zstandard`` packages are installed.
+"""
+
+import contextvars
+import gzip
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import offload, timing
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+_accepted: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "readme_mcp_accepted_encoding", default=None
+)
+
+# Media types worth compressing; everything the API returns is text
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 makes the output depend on the data alone
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=5)
+
+
+def _zstd(data: bytes) -> bytes:
+    # A compressor per call; one shared instance is not safe across threads
+    return zstandard.compress(data, level=3)
+
+
+def _codecs() -> dict[str, Callable[[bytes], bytes]]:
+    # Module-level functions, so the process offload executor can pickle them
+    codecs = {"gzip": _gzip}
+    if brotli is not None:
+        codecs["br"] = _brotli
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    return codecs
+
+
+CODECS = _codecs()
+
+
+def available() -> list[str]:
+    """Return enabled, installed codings in server preference order."""
+    return [
+        name
+        for name in (n.strip() for n in settings.compression_encodings.split(","))
+        if name in CODECS
+    ]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick the content coding to use for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, br;q=0.9"``
+
+    Returns:
+        The acceptable coding with the highest q-value, ties broken by server
+        preference, or ``None`` to send the body unencoded
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for name in available():
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def accepted() -> str | None:
+    """Return the coding negotiated for the current request, if any."""
+    return _accepted.get()
+
+
+async def compress(encoding: str, data: bytes) -> bytes:
+    """Compress ``data``, leaving the event loop for large payloads."""
+    with timing.phase("compress"):
+        return await offload.run("compress", CODECS[encoding], data, size=len(data))
+
+
+def compressible(headers: Headers) -> bool:
+    """Whether a response with these headers may be compressed."""
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(
+        COMPRESSIBLE_TYPES
+    )
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies.
+
+    Streamed responses and bodies under ``settings.compression_min_size``
+    bytes are sent as they are, as are responses that already carry a
+    ``Content-Encoding``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        token = _accepted.set(encoding)
+        start: Message | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if compressible(Headers(raw=message["headers"])):
+                    # Hold headers until the body shows whether to compress
+                    start = message
+                    return
+            elif start is not None:
+                held, start = start, None
+                message = await self._encode(held, message, encoding, send)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _accepted.reset(token)
+
+    async def _encode(
+        self, start: Message, message: Message, encoding: str | None, send: Send
+    ) -> Message:
+        """Send ``start`` with updated headers; return the body message to send."""
+        body = message.get("body", b"")
+        streaming = message.get("more_body", False)
+        if streaming or len(body) < settings.compression_min_size:
+            await send(start)
+            return message
+
+        headers = MutableHeaders(raw=list(start["headers"]))
+        headers.add_vary_header("Accept-Encoding")
+        if encoding is not None:
+            body = await compress(encoding, body)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            message = {**message, "body": body}
+        await send({**start, "headers": headers.raw})
+        return message
@@ -0,0 +1,178 @@
+"""Adaptive per-token concurrency limits for GitHub calls in README-MCP.
+
+GitHub's secondary rate limits cap concurrent requests per token at a level it
+does not publish, so no fixed limit is right. Each token instead gets an AIMD
+limit: it grows by about one call per round trip while calls come back fast,
+and shrinks multiplicatively when latency climbs past
+``settings.upstream_latency_tolerance`` times the fastest recent call, or
+sharply when GitHub answers with a secondary rate limit. Calls beyond a
+token's current limit queue as in ``admission``, with the same deadline and
+priority lanes.
+
+Each token's primary hourly quota is shared between the lanes as well: once
+the remaining quota falls below a lane's reserve, that lane's calls are
+refused until the quota resets, leaving what is left to the lanes above.
+"""
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+
+import httpx
+from fastapi import HTTPException
+
+from . import metrics
+from .admission import AdmissionController
+from .config import settings
+
+# Limit multipliers after a secondary rate limit and after a slow call
+THROTTLED_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.9
+# Weight of slower samples when the latency baseline drifts up
+BASELINE_DRIFT = 0.01
+# Fraction of a token's hourly quota each lane leaves to the lanes above it
+QUOTA_RESERVE = {"interactive": 0.0, "batch": 0.2, "background": 0.5}
+
+
+def is_secondary_limit(response: httpx.Response) -> bool:
+    """Whether GitHub rejected a call for its secondary rate limits.
+
+    These come as 403 or 429 while the primary quota is not exhausted, usually
+    with a ``Retry-After`` header or a message naming the secondary limit.
+    """
+    if response.status_code not in (403, 429):
+        return False
+    if response.headers.get("x-ratelimit-remaining") == "0":
+        return False
+    if "retry-after" in response.headers:
+        return True
+    try:
+        return b"secondary rate limit" in response.content.lower()
+    except httpx.ResponseNotRead:
+        return False
+
+
+def token_id(token: str | None) -> str:
+    """Return a short, non-reversible identity for a GitHub token."""
+    if not token:
+        return "anonymous"
+    return "token-" + hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+class AdaptiveLimit(AdmissionController):
+    """Admission queue whose limit follows observed upstream behaviour.
+
+    Args:
+        name: Token identity used as the metric label
+    """
+
+    def __init__(self, name: str):
+        # At least one call, so the limit can grow; 0 would also disable it
+        self.min_limit = max(1, settings.upstream_limit_min)
+        super().__init__(
+            max_in_flight=max(self.min_limit, settings.upstream_limit_initial)
+        )
+        self.name = name
+        self.limit = float(self.max_in_flight)
+        # Fastest recent latency, drifting slowly up if calls get slower for good
+        self.baseline = 0.0
+        self._last_decrease = 0.0
+        # Primary quota as last reported by GitHub; reset is an epoch time
+        self.quota = 0
+        self.remaining = 0
+        self.reset = 0.0
+        metrics.UPSTREAM_CONCURRENCY_LIMIT.labels(name).set(self.max_in_flight)
+
+    def record(self, latency: float, throttled: bool = False) -> None:
+        """Adjust the limit after a call completes.
+
+        Args:
+            latency: Seconds the call took
+            throttled: Whether GitHub answered with a secondary rate limit
+        """
+        if throttled:
+            self._decrease(latency, THROTTLED_BACKOFF)
+        elif self.baseline and latency > self.baseline * (
+            settings.upstream_latency_tolerance
+        ):
+            self._decrease(latency, LATENCY_BACKOFF)
+        elif self.in_flight * 2 >= self.limit:
+            # Only grow while the limit is actually in use
+            self.limit = min(
+                float(settings.upstream_limit_max), self.limit + 1 / self.limit
+            )
+
+        if not throttled:
+            if not self.baseline or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += BASELINE_DRIFT * (latency - self.baseline)
+
+        self.max_in_flight = int(self.limit)
+        metrics.UPSTREAM_CONCURRENCY_LIMIT.labels(self.name).set(self.max_in_flight)
+        self._admit()
+
+    def track_quota(self, headers: httpx.Headers) -> None:
+        """Remember the token's primary quota from a response's headers."""
+        try:
+            self.quota = int(headers["x-ratelimit-limit"])
+            self.remaining = int(headers["x-ratelimit-remaining"])
+            self.reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            pass
+
+    async def _acquire(self, lane: str = "interactive") -> None:
+        reserve = self.quota * QUOTA_RESERVE[lane]
+        wait = self.reset - time.time()
+        if self.remaining < reserve and wait > 0:
+            metrics.ADMISSION_REJECTED.labels(lane, "quota").inc()
+            raise HTTPException(
+                status_code=503,
+                detail="GitHub quota reserved for higher priority requests",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+        await super()._acquire(lane)
+
+    def _decrease(self, latency: float, factor: float) -> None:
+        # Calls in flight together report the same congestion; back off once
+        now = time.monotonic()
+        if now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+
+
+class AdaptiveLimiter:
+    """Adaptive limits keyed by token identity.
+
+    Args:
+        max_tokens: Identities tracked; the least recently used idle one is
+            dropped beyond this, and starts afresh if seen again
+    """
+
+    def __init__(self, max_tokens: int = 1024):
+        self.max_tokens = max_tokens
+        self._limits: OrderedDict[str, AdaptiveLimit] = OrderedDict()
+
+    def get(self, token: str | None) -> AdaptiveLimit:
+        """Return the limit applying to calls made with ``token``."""
+        name = token_id(token)
+        limit = self._limits.get(name)
+        if limit is None:
+            limit = self._limits[name] = AdaptiveLimit(name)
+            self._evict()
+        self._limits.move_to_end(name)
+        return limit
+
+    def _evict(self) -> None:
+        # The newest identity is about to be used, so it is never dropped
+        for name, limit in list(self._limits.items())[:-1]:
+            if len(self._limits) <= self.max_tokens:
+                return
+            if not limit.in_flight and not limit.queued:
+                del self._limits[name]
+                metrics.UPSTREAM_CONCURRENCY_LIMIT.remove(name)
+
+    def __len__(self) -> int:
+        return len(self._limits)
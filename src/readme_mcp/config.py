@@ -0,0 +1,198 @@
+"""Runtime configuration for README-MCP.
+
+Settings are read once from ``README_MCP_*`` environment variables at import
+time. Code reads them through the module-level ``settings`` object at call
+time, so tests can override individual attributes.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name) or default
+
+
+@dataclass
+class Settings:
+    """Service settings with their environment variable overrides."""
+
+    # Directory holding extracted repository snapshots
+    snapshot_dir: str = field(
+        default_factory=lambda: _env_str(
+            "README_MCP_SNAPSHOT_DIR",
+            os.path.join(tempfile.gettempdir(), "readme-mcp-snapshots"),
+        )
+    )
+    # Total bytes of extracted snapshots kept on disk
+    snapshot_max_bytes: int = field(
+        default_factory=lambda: _env_int(
+            "README_MCP_SNAPSHOT_MAX_BYTES", 512 * 1024 * 1024
+        )
+    )
+    # Largest file extracted into a snapshot (and thus searchable)
+    snapshot_max_file_size: int = field(
+        default_factory=lambda: _env_int(
+            "README_MCP_SNAPSHOT_MAX_FILE_SIZE", 1024 * 1024
+        )
+    )
+    # Worker processes used by /grep
+    grep_workers: int = field(
+        default_factory=lambda: _env_int(
+            "README_MCP_GREP_WORKERS", min(4, os.cpu_count() or 1)
+        )
+    )
+    # Fraction of requests given Server-Timing headers and access-log lines
+    timing_sample_rate: float = field(
+        default_factory=lambda: _env_float("README_MCP_TIMING_SAMPLE_RATE", 1.0)
+    )
+    # Admin secret accepted in the X-Profile header; empty disables the header
+    profile_secret: str = field(
+        default_factory=lambda: _env_str("README_MCP_PROFILE_SECRET", "")
+    )
+    # Fraction of requests profiled without the header
+    profile_sample_rate: float = field(
+        default_factory=lambda: _env_float("README_MCP_PROFILE_SAMPLE_RATE", 0.0)
+    )
+    # Directory holding pstats profile artifacts
+    profile_dir: str = field(
+        default_factory=lambda: _env_str(
+            "README_MCP_PROFILE_DIR",
+            os.path.join(tempfile.gettempdir(), "readme-mcp-profiles"),
+        )
+    )
+    # Profile artifacts kept before the oldest are deleted
+    profile_max_files: int = field(
+        default_factory=lambda: _env_int("README_MCP_PROFILE_MAX_FILES", 50)
+    )
+    # Seconds between event-loop lag measurements
+    loop_monitor_interval: float = field(
+        default_factory=lambda: _env_float("README_MCP_LOOP_MONITOR_INTERVAL", 0.25)
+    )
+    # Loop lag, in seconds, counted as a blocking stall
+    loop_block_threshold: float = field(
+        default_factory=lambda: _env_float("README_MCP_LOOP_BLOCK_THRESHOLD", 0.1)
+    )
+    # Log the stack of code blocking the event loop past the threshold
+    loop_debug: bool = field(
+        default_factory=lambda: _env_bool("README_MCP_LOOP_DEBUG", False)
+    )
+    # Pool used for CPU-heavy decoding: "thread" or "process"
+    offload_executor: str = field(
+        default_factory=lambda: _env_str("README_MCP_OFFLOAD_EXECUTOR", "thread")
+    )
+    # Workers in the offload pool
+    offload_workers: int = field(
+        default_factory=lambda: _env_int(
+            "README_MCP_OFFLOAD_WORKERS", min(4, os.cpu_count() or 1)
+        )
+    )
+    # Payload size, in bytes, from which decoding leaves the event loop
+    offload_threshold: int = field(
+        default_factory=lambda: _env_int("README_MCP_OFFLOAD_THRESHOLD", 256 * 1024)
+    )
+    # Offloaded tasks submitted at once; further callers wait for a slot
+    offload_max_pending: int = field(
+        default_factory=lambda: _env_int("README_MCP_OFFLOAD_MAX_PENDING", 64)
+    )
+    # Total bytes of encoded response bodies kept in memory; 0 disables the cache
+    response_cache_bytes: int = field(
+        default_factory=lambda: _env_int(
+            "README_MCP_RESPONSE_CACHE_BYTES", 64 * 1024 * 1024
+        )
+    )
+    # Most response bodies kept in memory, whatever their size
+    response_cache_entries: int = field(
+        default_factory=lambda: _env_int("README_MCP_RESPONSE_CACHE_ENTRIES", 4096)
+    )
+    # Seconds a branch or tag resolved for a caller is reused; 0 resolves every
+    # request upstream
+    ref_cache_ttl: float = field(
+        default_factory=lambda: _env_float("README_MCP_REF_CACHE_TTL", 10.0)
+    )
+    # Content codings offered, in order of preference; empty disables compression
+    compression_encodings: str = field(
+        default_factory=lambda: _env_str(
+            "README_MCP_COMPRESSION_ENCODINGS", "br,zstd,gzip"
+        )
+    )
+    # Smallest response body, in bytes, that is compressed
+    compression_min_size: int = field(
+        default_factory=lambda: _env_int("README_MCP_COMPRESSION_MIN_SIZE", 1024)
+    )
+    # GitHub calls in progress at once; 0 disables admission control
+    admission_max_in_flight: int = field(
+        default_factory=lambda: _env_int("README_MCP_ADMISSION_MAX_IN_FLIGHT", 64)
+    )
+    # GitHub calls waiting for a slot at once; further calls get 503
+    admission_max_queue: int = field(
+        default_factory=lambda: _env_int("README_MCP_ADMISSION_MAX_QUEUE", 256)
+    )
+    # Seconds after arrival by which a request's calls must have left the queue
+    admission_queue_timeout: float = field(
+        default_factory=lambda: _env_float("README_MCP_ADMISSION_QUEUE_TIMEOUT", 5.0)
+    )
+    # Seconds a queued call waits before it goes ahead of higher priority lanes
+    priority_max_wait: float = field(
+        default_factory=lambda: _env_float("README_MCP_PRIORITY_MAX_WAIT", 1.0)
+    )
+    # Requests per second each caller may make; 0 disables rate limiting
+    rate_limit_rps: float = field(
+        default_factory=lambda: _env_float("README_MCP_RATE_LIMIT_RPS", 0.0)
+    )
+    # Requests a caller may make at once after being idle
+    rate_limit_burst: int = field(
+        default_factory=lambda: _env_int("README_MCP_RATE_LIMIT_BURST", 20)
+    )
+    # Identify callers by X-Forwarded-For; only safe behind a proxy setting it
+    rate_limit_trust_forwarded: bool = field(
+        default_factory=lambda: _env_bool(
+            "README_MCP_RATE_LIMIT_TRUST_FORWARDED", False
+        )
+    )
+    # Starting, lowest and highest adaptive limit on concurrent calls per token
+    upstream_limit_initial: int = field(
+        default_factory=lambda: _env_int("README_MCP_UPSTREAM_LIMIT_INITIAL", 8)
+    )
+    upstream_limit_min: int = field(
+        default_factory=lambda: _env_int("README_MCP_UPSTREAM_LIMIT_MIN", 1)
+    )
+    upstream_limit_max: int = field(
+        default_factory=lambda: _env_int("README_MCP_UPSTREAM_LIMIT_MAX", 32)
+    )
+    # Latency, as a multiple of the fastest recent call, that shrinks the limit
+    upstream_latency_tolerance: float = field(
+        default_factory=lambda: _env_float("README_MCP_UPSTREAM_LATENCY_TOLERANCE", 2.0)
+    )
+    # Worker processes serving requests; above one, they share the response cache
+    workers: int = field(default_factory=lambda: _env_int("README_MCP_WORKERS", 1))
+    # Base URLs of every replica, comma-separated, to route requests between
+    # them by repository; empty (with no peer_dns) disables peer routing
+    peers: str = field(default_factory=lambda: _env_str("README_MCP_PEERS", ""))
+    # host:port whose DNS addresses are the replicas, instead of a fixed list
+    peer_dns: str = field(default_factory=lambda: _env_str("README_MCP_PEER_DNS", ""))
+    # This replica's base URL as its peers reach it
+    peer_self: str = field(default_factory=lambda: _env_str("README_MCP_PEER_SELF", ""))
+    # Seconds between DNS lookups of the replicas
+    peer_refresh_interval: float = field(
+        default_factory=lambda: _env_float("README_MCP_PEER_REFRESH_INTERVAL", 30.0)
+    )
+
+
+settings = Settings()
@@ -0,0 +1,137 @@
+"""End-to-end request deadlines and cancellation for README-MCP.
+
+A caller may say how many seconds it will wait for a response with the
+``X-Request-Timeout`` header. The resulting deadline is kept in a context
+variable for the request: GitHub calls use the time left as their timeout, and
+calls queued for admission stop waiting at it. Once it has passed, no further
+upstream work is started and the request fails with 504.
+
+``DeadlineMiddleware`` also cancels the handler, and with it any upstream call
+in progress, as soon as the client disconnects. Work shared between requests
+through ``SingleFlight`` runs detached from any one request's deadline and is
+cancelled only when every request waiting on it has gone.
+"""
+
+import asyncio
+import contextvars
+import time
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import metrics
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "readme_mcp_deadline", default=None
+)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current request's deadline, if it has one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def limit(seconds: float | None) -> None:
+    """Bring the current request's deadline forward to ``seconds`` from now.
+
+    A later deadline than the one already set has no effect.
+    """
+    if seconds is None:
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is None or deadline < current:
+        _deadline.set(deadline)
+
+
+def detach() -> None:
+    """Clear the deadline in the current context, for work shared by requests."""
+    _deadline.set(None)
+
+
+def exceeded() -> HTTPException:
+    """Return the error for a request that ran out of time."""
+    metrics.DEADLINE_EXCEEDED.inc()
+    return HTTPException(status_code=504, detail="Request deadline exceeded")
+
+
+def timeout(default: float) -> float:
+    """Timeout for the next upstream call: ``default``, capped at the time left.
+
+    Raises:
+        HTTPException: 504 if the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise exceeded()
+    return min(default, left)
+
+
+def parse_timeout(value: str | None) -> float | None:
+    """Parse an ``X-Request-Timeout`` value; invalid values are ignored."""
+    try:
+        seconds = float(value) if value else None
+    except ValueError:
+        return None
+    return seconds if seconds is not None and 0 < seconds < float("inf") else None
+
+
+class DeadlineMiddleware:
+    """ASGI middleware setting request deadlines and cancelling abandoned work.
+
+    Once the request body has been read, the client's connection is watched
+    for a disconnect, which cancels the handler if no response is complete.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seconds = parse_timeout(Headers(scope=scope).get("x-request-timeout"))
+        token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+        body_read = asyncio.Event()
+        response_sent = False
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] != "http.request" or not message.get("more_body"):
+                body_read.set()
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_sent
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_sent = True
+            await send(message)
+
+        handler = asyncio.create_task(self.app(scope, receive_wrapper, send_wrapper))
+
+        async def watch() -> None:
+            await body_read.wait()
+            # Servers answer this with http.disconnect once the client has gone
+            # or the response is complete; only the former cancels the handler
+            message = await receive()
+            if message["type"] == "http.disconnect" and not response_sent:
+                metrics.REQUESTS_CANCELLED.inc()
+                handler.cancel()
+
+        watcher = asyncio.create_task(watch())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            # Cancelled for the client's disconnect; nobody is left to answer
+            if not handler.cancelled() or asyncio.current_task().cancelling():
+                raise
+        finally:
+            watcher.cancel()
+            _deadline.reset(token)
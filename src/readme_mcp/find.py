@@ -0,0 +1,251 @@
+"""Filename search over cached tree snapshots for README-MCP."""
+
+import asyncio
+import heapq
+import re
+import sys
+import weakref
+from array import array
+from collections import Counter
+from collections.abc import Iterator
+
+from . import metrics
+from .cache import SingleFlight
+from .tree import TreeSnapshot, compile_glob
+
+# Characters that make a glob segment non-literal
+GLOB_CHARS = re.compile(r"[*?\[]")
+
+# Most fuzzy candidates scored per query; those sharing the most trigrams win
+FUZZY_MAX_CANDIDATES = 5000
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the set of three-character substrings of ``text``."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class PathIndex:
+    """Basename trigram index over a tree snapshot.
+
+    Built once per commit and kept alive only as long as its snapshot. Postings
+    are stored as ``array("I")`` of snapshot indices to keep 100k+ entry trees
+    small.
+    """
+
+    # Must not reference the snapshot itself: it is the weak key indexes live under
+    __slots__ = ("names", "postings")
+
+    def __init__(self, snapshot: TreeSnapshot):
+        # Interned: common names (__init__.py, README.md) repeat across the tree
+        self.names: list[str] = [
+            sys.intern(path.rsplit("/", 1)[-1].lower()) for path in snapshot.paths
+        ]
+
+        postings: dict[str, array] = {}
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(i)
+        self.postings = postings
+
+    def candidates(self, grams: set[str]) -> Iterator[int] | None:
+        """Return indices whose basename contains every trigram in ``grams``.
+
+        Only the smallest posting list is returned; callers confirm each
+        candidate. Returns ``None`` when ``grams`` is empty (no pruning possible).
+        """
+        if not grams:
+            return None
+        smallest = min((self.postings.get(g, ()) for g in grams), key=len)
+        return iter(smallest)
+
+
+_indexes: "weakref.WeakKeyDictionary[TreeSnapshot, PathIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+_index_flight = SingleFlight("path_index")
+
+
+def get_index(snapshot: TreeSnapshot) -> PathIndex:
+    """Return the path index for ``snapshot``, building it inline on first use."""
+    index = _indexes.get(snapshot)
+    if index is None:
+        index = _indexes[snapshot] = PathIndex(snapshot)
+    return index
+
+
+async def load_index(snapshot: TreeSnapshot) -> PathIndex:
+    """Return the path index for ``snapshot``, building it off the event loop.
+
+    Indexing a 100k+ entry tree takes around a second, so it runs in a thread;
+    concurrent first requests for the same commit share one build.
+    """
+    index = _indexes.get(snapshot)
+    metrics.record_cache("path_index", index is not None)
+    if index is not None:
+        return index
+
+    async def build() -> PathIndex:
+        index = _indexes.get(snapshot)
+        if index is None:
+            index = await asyncio.to_thread(PathIndex, snapshot)
+            _indexes[snapshot] = index
+        return index
+
+    return await _index_flight.do(snapshot, build)
+
+
+def _literal_grams(segment: str) -> set[str]:
+    """Trigrams every basename matching glob ``segment`` must contain."""
+    grams = set()
+    for run in GLOB_CHARS.split(re.sub(r"\[[^\]]*\]", "*", segment)):
+        grams |= trigrams(run.lower())
+    return grams
+
+
+def _is_within(path: str, directory: str) -> bool:
+    """Return whether ``path`` is ``directory`` or lies below it."""
+    return not directory or path == directory or path.startswith(directory + "/")
+
+
+def find_glob(
+    snapshot: TreeSnapshot,
+    pattern: str,
+    path: str = "",
+    type: str | None = None,
+) -> Iterator[int]:
+    """Yield indices of entries matching glob ``pattern``, in path order.
+
+    Patterns without a ``/`` match basenames; patterns containing a ``/`` match
+    full repository paths. Literal leading directories narrow the search to a
+    subtree, and literal runs in the final segment prune candidates through the
+    basename trigram index.
+
+    Args:
+        snapshot: Tree snapshot to search
+        pattern: Glob pattern (``*``, ``**``, ``?``, ``[...]``)
+        path: Directory to restrict the search to (empty for repository root)
+        type: Only return entries of this type (``"file"`` or ``"dir"``)
+
+    Yields:
+        Snapshot indices of matching entries
+    """
+    full_path = "/" in pattern
+    segments = pattern.split("/")
+
+    scope = path
+    if full_path:
+        literal = []
+        for segment in segments[:-1]:
+            if GLOB_CHARS.search(segment):
+                break
+            literal.append(segment)
+        prefix = "/".join(literal)
+        if _is_within(prefix, path):
+            scope = prefix
+        elif not _is_within(path, prefix):
+            return
+    window = snapshot.subtree_range(scope)
+
+    last = segments[-1]
+    index = get_index(snapshot)
+    # "**" inside the last segment can span directories, so it can't be pruned
+    candidates = None if "**" in last else index.candidates(_literal_grams(last))
+    if candidates is None:
+        candidates = iter(window)
+    else:
+        candidates = sorted(i for i in candidates if i in window)
+
+    regex = compile_glob(pattern)
+    paths, types = snapshot.paths, snapshot.types
+    for i in candidates:
+        if type is not None and types[i] != type:
+            continue
+        subject = paths[i] if full_path else paths[i].rsplit("/", 1)[-1]
+        if regex.match(subject):
+            yield i
+
+
+def find_fuzzy(
+    snapshot: TreeSnapshot,
+    query: str,
+    path: str = "",
+    type: str | None = None,
+    limit: int = 100,
+) -> tuple[list[tuple[float, int]], int]:
+    """Rank entries whose basename approximately matches ``query``.
+
+    Candidates share at least half of the query's trigrams with the basename;
+    queries shorter than three characters fall back to a substring scan. At
+    most ``FUZZY_MAX_CANDIDATES`` candidates are scored, preferring those
+    sharing the most trigrams, and only the best ``limit`` are ranked.
+
+    Args:
+        snapshot: Tree snapshot to search
+        query: Case-insensitive filename query
+        path: Directory to restrict the search to (empty for repository root)
+        type: Only return entries of this type (``"file"`` or ``"dir"``)
+        limit: Number of matches to return
+
+    Returns:
+        Up to ``limit`` ``(score, index)`` pairs, best match first, and the
+        number of candidates matched
+    """
+    query = query.lower()
+    index = get_index(snapshot)
+    names, types = index.names, snapshot.types
+    window = snapshot.subtree_range(path)
+    query_grams = trigrams(query)
+
+    if query_grams:
+        shared: Counter[int] = Counter()
+        for gram in query_grams:
+            shared.update(index.postings.get(gram, ()))
+        threshold = (len(query_grams) + 1) // 2
+        matched = [
+            (n, i)
+            for i, n in shared.items()
+            if n >= threshold and i in window and (type is None or types[i] == type)
+        ]
+        total = len(matched)
+        if total > FUZZY_MAX_CANDIDATES:
+            # Most shared trigrams first; ties go to the earlier path, since
+            # snapshot entries are in path order
+            matched = heapq.nlargest(
+                FUZZY_MAX_CANDIDATES, matched, key=lambda m: (m[0], -m[1])
+            )
+        candidates = [i for _, i in matched]
+    else:
+        candidates = [
+            i
+            for i in window
+            if query in names[i] and (type is None or types[i] == type)
+        ]
+        total = len(candidates)
+        del candidates[FUZZY_MAX_CANDIDATES:]
+
+    results = []
+    for i in candidates:
+        name = names[i]
+        if name == query:
+            score = 2.0
+        else:
+            name_grams = trigrams(name)
+            union = len(query_grams | name_grams) or 1
+            score = len(query_grams & name_grams) / union
+            if name.startswith(query):
+                score += 0.6
+            elif query in name:
+                score += 0.5
+        results.append((round(score, 4), i))
+
+    paths = snapshot.paths
+    best = heapq.nsmallest(
+        limit, results, key=lambda r: (-r[0], len(paths[r[1]]), paths[r[1]])
+    )
+    return best, total
@@ -1,18 +1,133 @@
 """GitHub API client for README-MCP."""
 
+import asyncio
+import math
+import sys
+import time
+
 import httpx
 from fastapi import HTTPException
 
+from . import deadline, metrics, offload, timing
+from .admission import AdmissionController
+from .cache import LRUCache, SingleFlight
+from .concurrency import AdaptiveLimiter, is_secondary_limit, token_id
+from .config import settings
+from .records import DirectoryRecord, FileRecord
+from .tree import TreeSnapshot, parse_tree
+
+# Seconds an upstream call may take, unless its request's deadline is sooner
+UPSTREAM_TIMEOUT = 5.0
+
 
 class GitHubClient:
     """Client for interacting with GitHub API."""
 
-    def __init__(self):
-        self.base_url = "https://api.github.com"
+    def __init__(
+        self,
+        base_url: str = "https://api.github.com",
+        transport: httpx.AsyncBaseTransport | None = None,
+        tree_cache_size: int = 32,
+        ref_cache_size: int = 4096,
+        fanout_limit: int = 8,
+        admission: AdmissionController | None = None,
+    ):
+        self.base_url = base_url
+        # Optional transport override, used to point the client at a fake GitHub
+        self.transport = transport
+        # Recursive trees keyed by (owner, repo, commit SHA); immutable per commit
+        self.tree_cache = LRUCache(tree_cache_size, name="tree")
+        self._tree_flight = SingleFlight("tree")
+        # Resolved commit SHA and expiry time, keyed by (owner, repo, ref, token
+        # identity); resolved per caller so access is checked with their token
+        self.ref_cache = LRUCache(ref_cache_size)
+        # Shared cap on concurrent upstream calls made by one request's fan-out
+        self.fanout = asyncio.Semaphore(fanout_limit)
+        # Pod-wide cap and wait queue for every upstream call
+        self.admission = admission or AdmissionController()
+        # Per-token limits adapting to GitHub's secondary rate limits
+        self.limits = AdaptiveLimiter()
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self.transport)
+
+    async def _get(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        url: str,
+        token: str | None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Perform an upstream GET, recording latency, status and rate limit.
+
+        The call first waits for the token's adaptive limit, then for the
+        pod-wide admission slot, and feeds its outcome back into the limit.
+        Its timeout is capped at the time left before the request's deadline.
+
+        Args:
+            client: HTTP client to send the request with
+            endpoint: Short GitHub endpoint name used as the metric label
+            url: Request URL
+            token: GitHub token the request is authenticated with
+            **kwargs: Passed through to ``httpx.AsyncClient.get``
+
+        Returns:
+            The upstream response
+
+        Raises:
+            HTTPException: 503 if the call is not admitted in time, 504 if the
+                request's deadline passes first
+        """
+        limit = self.limits.get(token)
+        async with limit.slot(), self.admission.slot():
+            kwargs.setdefault("timeout", deadline.timeout(UPSTREAM_TIMEOUT))
+            metrics.UPSTREAM_IN_FLIGHT.inc()
+            start = time.perf_counter()
+            status = "error"
+            try:
+                with timing.phase("upstream"):
+                    try:
+                        response = await client.get(url, **kwargs)
+                    except httpx.TimeoutException:
+                        raise self._timed_out() from None
+                status = str(response.status_code)
+                self._record_rate_limit(response)
+                limit.track_quota(response.headers)
+                limit.record(time.perf_counter() - start, is_secondary_limit(response))
+                return response
+            finally:
+                metrics.UPSTREAM_IN_FLIGHT.dec()
+                metrics.UPSTREAM_DURATION.labels(endpoint).observe(
+                    time.perf_counter() - start
+                )
+                metrics.UPSTREAM_REQUESTS.labels(endpoint, status).inc()
+
+    @staticmethod
+    def _timed_out() -> HTTPException:
+        """Map an upstream timeout to 504, counting it if the deadline caused it."""
+        left = deadline.remaining()
+        if left is not None and left <= 0:
+            return deadline.exceeded()
+        return HTTPException(status_code=504, detail="GitHub API timed out")
+
+    def _record_rate_limit(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            resource = response.headers.get("x-ratelimit-resource", "core")
+            metrics.RATE_LIMIT_REMAINING.labels(resource).set(float(remaining))
+
+    def _headers(
+        self, token: str | None, accept: str = "application/vnd.github.v3+json"
+    ) -> dict:
+        headers = {"Accept": accept}
+        if token:
+            headers["Authorization"] = f"token {token}"
+        return headers
 
     async def get_readme(
         self, owner: str, repo: str, ref: str = "main", token: str | None = None
-    ) -> dict:
+    ) -> FileRecord:
         """Fetch README file from GitHub repository.
 
         Args:
@@ -22,20 +137,20 @@ class GitHubClient:
             token: GitHub authentication token
 
         Returns:
-            Dictionary containing README file data from GitHub API
+            README file record
 
         Raises:
             HTTPException: If README not found or API error occurs
         """
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
+        headers = self._headers(token)
 
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             url = f"{self.base_url}/repos/{owner}/{repo}/readme"
             params = {"ref": ref}
 
-            response = await client.get(url, headers=headers, params=params)
+            response = await self._get(
+                client, "readme", url, token, headers=headers, params=params
+            )
 
             if response.status_code == 404:
                 raise HTTPException(status_code=404, detail="README not found")
@@ -44,7 +159,8 @@ class GitHubClient:
                     status_code=response.status_code, detail="GitHub API error"
                 )
 
-            return response.json()
+            with timing.phase("decode"):
+                return FileRecord.from_github(response.json())
 
     async def get_file(
         self,
@@ -53,7 +169,7 @@ class GitHubClient:
         path: str,
         ref: str = "main",
         token: str | None = None,
-    ) -> dict:
+    ) -> FileRecord:
         """Fetch file from GitHub repository.
 
         Args:
@@ -64,20 +180,20 @@ class GitHubClient:
             token: GitHub authentication token
 
         Returns:
-            Dictionary containing file data from GitHub API
+            File record
 
         Raises:
             HTTPException: If file not found, is directory, too large, or API error occurs
         """
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
+        headers = self._headers(token)
 
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
             params = {"ref": ref}
 
-            response = await client.get(url, headers=headers, params=params)
+            response = await self._get(
+                client, "contents", url, token, headers=headers, params=params
+            )
 
             if response.status_code == 404:
                 raise HTTPException(status_code=404, detail="File not found")
@@ -86,7 +202,8 @@ class GitHubClient:
                     status_code=response.status_code, detail="GitHub API error"
                 )
 
-            file_data = response.json()
+            with timing.phase("decode"):
+                file_data = response.json()
 
             # Check if response is a list (directory) or dict (file)
             if isinstance(file_data, list):
@@ -104,7 +221,7 @@ class GitHubClient:
                     status_code=413, detail="File too large (max 100kB)"
                 )
 
-            return file_data
+            return FileRecord.from_github(file_data)
 
     async def list_directory(
         self,
@@ -113,7 +230,7 @@ class GitHubClient:
         path: str = "",
         ref: str = "main",
         token: str | None = None,
-    ) -> list[dict]:
+    ) -> list[DirectoryRecord]:
         """List contents of a directory in GitHub repository.
 
         Args:
@@ -124,16 +241,14 @@ class GitHubClient:
             token: GitHub authentication token
 
         Returns:
-            List of directory entries from GitHub API
+            Directory entry records
 
         Raises:
             HTTPException: If directory not found, path is file, or API error occurs
         """
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
+        headers = self._headers(token)
 
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             # Use contents API for directory listing
             if path:
                 url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
@@ -142,7 +257,9 @@ class GitHubClient:
 
             params = {"ref": ref}
 
-            response = await client.get(url, headers=headers, params=params)
+            response = await self._get(
+                client, "contents", url, token, headers=headers, params=params
+            )
 
             if response.status_code == 404:
                 raise HTTPException(status_code=404, detail="Directory not found")
@@ -159,13 +276,221 @@ class GitHubClient:
                     status_code=400, detail="Path is a file, not a directory"
                 )
 
-            # Enforce 1,000 entry limit per CLAUDE.md requirements
-            if len(directory_data) > 1000:
+            return [DirectoryRecord.from_github(item) for item in directory_data]
+
+    async def resolve_ref(
+        self,
+        owner: str,
+        repo: str,
+        ref: str | None = "main",
+        token: str | None = None,
+    ) -> str:
+        """Resolve a git reference to its commit SHA.
+
+        A resolution is reused for ``settings.ref_cache_ttl`` seconds by the
+        same caller (token identity), so repeat requests need no upstream call;
+        a full commit SHA resolves to itself and is reused until evicted.
+        Failures are not cached.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            ref: Git reference (branch, tag, commit SHA); the default branch if
+                empty or ``None``
+            token: GitHub authentication token
+
+        Returns:
+            Full 40-character commit SHA
+
+        Raises:
+            HTTPException: If repository or reference not found, or API error occurs
+        """
+        # As with ``?ref=`` on the contents API, no ref means the default branch
+        ref = ref or "HEAD"
+        key = (owner.lower(), repo.lower(), ref, token_id(token))
+        ttl = settings.ref_cache_ttl
+        cached = self.ref_cache.get(key) if ttl > 0 else None
+        hit = cached is not None and cached[1] > time.monotonic()
+        metrics.record_cache("ref", hit)
+        if hit:
+            return cached[0]
+
+        headers = self._headers(token, accept="application/vnd.github.sha")
+
+        async with self._client() as client:
+            url = f"{self.base_url}/repos/{owner}/{repo}/commits/{ref}"
+
+            response = await self._get(client, "commits", url, token, headers=headers)
+
+            if response.status_code in (404, 422):
                 raise HTTPException(
-                    status_code=413, detail="Directory too large (max 1,000 entries)"
+                    status_code=404, detail="Repository or reference not found"
                 )
+            elif response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code, detail="GitHub API error"
+                )
+
+            sha = response.text.strip()
+
+        if ttl > 0:
+            # A commit SHA never moves
+            expires = math.inf if sha == ref else time.monotonic() + ttl
+            self.ref_cache.set(key, (sha, expires))
+        return sha
 
-            return directory_data
+    async def get_tree(
+        self,
+        owner: str,
+        repo: str,
+        ref: str | None = "main",
+        token: str | None = None,
+    ) -> TreeSnapshot:
+        """Fetch the full recursive tree of a commit.
+
+        The reference is resolved with the caller's credentials (see
+        ``resolve_ref``), but the tree itself is fetched at most once per commit
+        and shared between callers.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            ref: Git reference (branch, tag, commit SHA); the default branch if
+                empty or ``None``
+            token: GitHub authentication token
+
+        Returns:
+            Path-sorted snapshot of every entry in the commit
+
+        Raises:
+            HTTPException: If repository or reference not found, or API error occurs
+        """
+        sha = await self.resolve_ref(owner, repo, ref, token)
+        return await self.get_tree_at(owner, repo, sha, token)
+
+    async def get_tree_at(
+        self, owner: str, repo: str, sha: str, token: str | None = None
+    ) -> TreeSnapshot:
+        """Fetch the recursive tree of a commit already resolved by the caller.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            sha: Full commit SHA, as returned by ``resolve_ref``
+            token: GitHub authentication token
+
+        Returns:
+            Path-sorted snapshot of every entry in the commit
+
+        Raises:
+            HTTPException: If the tree is not found or API error occurs
+        """
+        key = (owner.lower(), repo.lower(), sha)
+
+        snapshot = self.tree_cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        async def fetch() -> TreeSnapshot:
+            headers = self._headers(token)
+
+            async with self._client() as client:
+                url = f"{self.base_url}/repos/{owner}/{repo}/git/trees/{sha}"
+                params = {"recursive": "1"}
+
+                response = await self._get(
+                    client, "trees", url, token, headers=headers, params=params
+                )
+
+                if response.status_code == 404:
+                    raise HTTPException(status_code=404, detail="Tree not found")
+                elif response.status_code != 200:
+                    raise HTTPException(
+                        status_code=response.status_code, detail="GitHub API error"
+                    )
+
+                body = response.content
+
+            # Parsing and sorting a large tree is CPU-bound
+            with timing.phase("decode"):
+                snapshot = await offload.run(
+                    "tree", parse_tree, sha, body, size=len(body)
+                )
+            self.tree_cache.set(key, snapshot)
+            return snapshot
+
+        return await self._tree_flight.do(key, fetch)
+
+    async def download_archive(
+        self,
+        owner: str,
+        repo: str,
+        sha: str,
+        dest: str,
+        token: str | None = None,
+    ) -> None:
+        """Stream a commit's gzipped tarball to a local file.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            sha: Commit SHA to download
+            dest: Local file path the archive is written to
+            token: GitHub authentication token
+
+        Raises:
+            HTTPException: If repository or commit not found, or API error occurs
+        """
+        headers = self._headers(token)
+
+        async with self._client() as client:
+            url = f"{self.base_url}/repos/{owner}/{repo}/tarball/{sha}"
+
+            # Held for the whole download, which is upstream work too
+            limit = self.limits.get(token)
+            async with limit.slot(), self.admission.slot():
+                timeout = deadline.timeout(UPSTREAM_TIMEOUT)
+                metrics.UPSTREAM_IN_FLIGHT.inc()
+                start = time.perf_counter()
+                status = "error"
+                try:
+                    with timing.phase("upstream"):
+                        async with client.stream(
+                            "GET",
+                            url,
+                            headers=headers,
+                            follow_redirects=True,
+                            timeout=timeout,
+                        ) as response:
+                            status = str(response.status_code)
+                            self._record_rate_limit(response)
+                            limit.track_quota(response.headers)
+                            # Time to first byte; the body's length varies
+                            limit.record(
+                                time.perf_counter() - start,
+                                is_secondary_limit(response),
+                            )
+                            if response.status_code == 404:
+                                raise HTTPException(
+                                    status_code=404, detail="Archive not found"
+                                )
+                            elif response.status_code != 200:
+                                raise HTTPException(
+                                    status_code=response.status_code,
+                                    detail="GitHub API error",
+                                )
+
+                            with open(dest, "wb") as f:
+                                async for chunk in response.aiter_bytes():
+                                    f.write(chunk)
+                except httpx.TimeoutException:
+                    raise self._timed_out() from None
+                finally:
+                    metrics.UPSTREAM_IN_FLIGHT.dec()
+                    metrics.UPSTREAM_DURATION.labels("tarball").observe(
+                        time.perf_counter() - start
+                    )
+                    metrics.UPSTREAM_REQUESTS.labels("tarball", status).inc()
 
     def parse_repo_url(self, repo_url: str) -> tuple[str, str]:
         """Parse GitHub repository URL into owner and repo name.
@@ -183,4 +508,5 @@ class GitHubClient:
         if len(repo_parts) != 2:
             raise HTTPException(status_code=400, detail="Invalid repository URL")
 
-        return repo_parts[0], repo_parts[1]
+        # Interned: the pair keys several caches and is repeated per request
+        return sys.intern(repo_parts[0]), sys.intern(repo_parts[1])
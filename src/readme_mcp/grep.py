@@ -0,0 +1,278 @@
+"""Content search over repository snapshots for README-MCP."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.process import BaseProcess
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected for NUL characters when deciding a file is binary
+BINARY_SNIFF_BYTES = 8192
+# Longest line returned in a match; longer lines are cut
+MAX_LINE_LENGTH = 500
+# Files and bytes handed to a worker per task
+CHUNK_FILES = 64
+CHUNK_BYTES = 4 * 1024 * 1024
+# Seconds a replaced pool's workers get to finish before they are killed
+KILL_GRACE = 1.0
+
+_executor: ProcessPoolExecutor | None = None
+# Worker processes of pools replaced because of stuck tasks, until killed
+_retired: list[list[BaseProcess]] = []
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared grep process pool, starting it on first use."""
+    global _executor
+    if _executor is None:
+        # "spawn" avoids forking a process that already runs an event loop
+        _executor = ProcessPoolExecutor(
+            max_workers=max(1, settings.grep_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the grep process pool, if started, and kill any stuck workers."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    while _retired:
+        _kill(_retired.pop())
+
+
+def _kill(processes: list[BaseProcess], futures: list[Future] | None = None) -> None:
+    """Kill a retired pool's workers, unless all of ``futures`` have finished."""
+    if processes in _retired:
+        _retired.remove(processes)
+    if futures is not None and all(f.done() for f in futures):
+        return
+    logger.warning("Killing grep workers stuck past their deadline")
+    for process in processes:
+        process.kill()
+
+
+def _reap(executor: ProcessPoolExecutor, futures: list[Future]) -> None:
+    """Replace the pool if tasks still run past their deadline.
+
+    Workers check the deadline only between files, so a catastrophic regex
+    on a single file would otherwise hold a worker indefinitely. New searches
+    go to a fresh pool at once, and the stuck workers are killed after
+    ``KILL_GRACE`` seconds. Searches still using the old pool then stop early.
+    """
+    global _executor
+    if all(f.done() for f in futures):
+        return
+    if _executor is executor:
+        _executor = None
+    # Private, but the only handle on the workers before Python 3.14; shutting
+    # down drops it
+    processes = list((executor._processes or {}).values())
+    _retired.append(processes)
+    executor.shutdown(wait=False)
+    asyncio.get_running_loop().call_later(KILL_GRACE, _kill, processes, futures)
+
+
+def compile_pattern(pattern: str, regex: bool, case_sensitive: bool) -> re.Pattern:
+    """Compile a search pattern, escaping it unless ``regex`` is set."""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(pattern if regex else re.escape(pattern), flags)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_LENGTH else line[:MAX_LINE_LENGTH]
+
+
+def search_files(
+    root: str,
+    paths: list[str],
+    pattern: str,
+    regex: bool,
+    case_sensitive: bool,
+    context: int,
+    max_results: int,
+    deadline: float,
+) -> tuple[list[dict], int]:
+    """Search files below ``root``; runs inside a grep worker process.
+
+    Args:
+        root: Snapshot directory
+        paths: Repository paths to search, relative to ``root``
+        pattern: Search pattern
+        regex: Treat ``pattern`` as a regular expression
+        case_sensitive: Match case exactly
+        context: Lines of context before and after each match
+        max_results: Stop after this many matches
+        deadline: Wall-clock time (``time.time()``) after which to stop
+
+    Returns:
+        Tuple of (matches, number of files scanned)
+    """
+    compiled = compile_pattern(pattern, regex, case_sensitive)
+    matches: list[dict] = []
+    scanned = 0
+
+    for path in paths:
+        if len(matches) >= max_results or time.time() > deadline:
+            break
+        try:
+            with open(os.path.join(root, path), "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        if b"\0" in data[:BINARY_SNIFF_BYTES]:
+            continue
+        scanned += 1
+
+        text = data.decode("utf-8", errors="replace")
+        if not compiled.search(text):
+            continue
+
+        lines = text.splitlines()
+        for number, line in enumerate(lines, start=1):
+            if not compiled.search(line):
+                continue
+            match = {"path": path, "line_number": number, "line": _clip(line)}
+            if context:
+                start = max(0, number - 1 - context)
+                match["before"] = [_clip(x) for x in lines[start : number - 1]]
+                match["after"] = [_clip(x) for x in lines[number : number + context]]
+            matches.append(match)
+            if len(matches) >= max_results:
+                break
+
+    return matches, scanned
+
+
+def chunk_paths(paths: list[str], sizes: list[int]) -> list[list[str]]:
+    """Group paths into worker tasks bounded by file count and total bytes."""
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 0
+    for path, size in zip(paths, sizes, strict=True):
+        if current and (
+            len(current) >= CHUNK_FILES or current_bytes + size > CHUNK_BYTES
+        ):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class GrepStats:
+    """Summary of a finished search."""
+
+    __slots__ = ("files_scanned", "match_count", "limit_reached", "timed_out")
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.match_count = 0
+        self.limit_reached = False
+        self.timed_out = False
+
+
+async def run_grep(
+    root: str,
+    paths: list[str],
+    sizes: list[int],
+    pattern: str,
+    regex: bool = False,
+    case_sensitive: bool = True,
+    context: int = 0,
+    max_results: int = 500,
+    timeout: float = 10.0,
+    stats: GrepStats | None = None,
+) -> AsyncIterator[dict]:
+    """Search ``paths`` in a snapshot across the worker pool.
+
+    Matches are yielded chunk by chunk as workers finish. Once ``max_results``
+    matches are yielded or ``timeout`` seconds pass, queued tasks are cancelled
+    and running workers stop at their next file. Workers still busy past the
+    time budget are killed, and the pool is replaced.
+
+    Args:
+        root: Snapshot directory
+        paths: Repository paths to search
+        sizes: File sizes matching ``paths``, used to balance worker tasks
+        pattern: Search pattern
+        regex: Treat ``pattern`` as a regular expression
+        case_sensitive: Match case exactly
+        context: Lines of context before and after each match
+        max_results: Maximum number of matches to yield
+        timeout: Time budget in seconds
+        stats: Optional object filled in with the search summary
+
+    Yields:
+        Match dictionaries with path, line number, line and optional context
+    """
+    stats = stats if stats is not None else GrepStats()
+    deadline = time.time() + timeout
+    executor = get_executor()
+    loop = asyncio.get_running_loop()
+
+    futures: list[Future] = [
+        executor.submit(
+            search_files,
+            root,
+            chunk,
+            pattern,
+            regex,
+            case_sensitive,
+            context,
+            max_results,
+            deadline,
+        )
+        for chunk in chunk_paths(paths, sizes)
+    ]
+    pending = {asyncio.wrap_future(f, loop=loop) for f in futures}
+
+    try:
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                stats.timed_out = True
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                try:
+                    matches, scanned = task.result()
+                except BrokenProcessPool:
+                    # Killed while reaping another search's stuck workers
+                    stats.timed_out = True
+                    continue
+                stats.files_scanned += scanned
+                for match in matches:
+                    stats.match_count += 1
+                    yield match
+                    if stats.match_count >= max_results:
+                        stats.limit_reached = True
+                        return
+        if time.time() > deadline:
+            stats.timed_out = True
+    finally:
+        running = [f for f in futures if not f.cancel() and not f.done()]
+        for task in pending:
+            task.cancel()
+        if running:
+            delay = deadline - time.time()
+            if delay > 0:
+                loop.call_later(delay, _reap, executor, running)
+            else:
+                # Now, before another search is queued behind them
+                _reap(executor, running)
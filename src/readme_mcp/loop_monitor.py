@@ -0,0 +1,97 @@
+"""Event-loop lag monitoring for README-MCP.
+
+A background task sleeps for a fixed interval and measures how late it wakes
+up; the excess is time the loop spent running other callbacks without
+yielding. Lag is exported as a histogram, and wake-ups later than
+``settings.loop_block_threshold`` are counted as blocking stalls.
+
+In debug mode a watchdog thread also watches the task's heartbeat. When the
+loop stalls past the threshold it logs the loop thread's current stack, which
+points at the blocking code while it is still running.
+"""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Measures event-loop lag and optionally reports blocking call stacks."""
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        threshold: float | None = None,
+        debug: bool | None = None,
+    ):
+        self.interval = interval or settings.loop_monitor_interval
+        self.threshold = threshold or settings.loop_block_threshold
+        self.debug = settings.loop_debug if debug is None else debug
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        # Monotonic time of the last on-time wake-up, read by the watchdog
+        self._heartbeat = time.monotonic()
+        self._loop_thread = 0
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        if self.debug:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the monitor task and watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._heartbeat = time.monotonic()
+            metrics.LOOP_LAG.observe(lag)
+            if lag > self.threshold:
+                metrics.LOOP_BLOCKED.inc()
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled <= self.threshold or heartbeat == reported:
+                continue
+            # Report each stall once, with the stack of the blocking code
+            reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            logger.warning(
+                "Event loop blocked for %.3fs, loop thread stack:\n%s",
+                stalled,
+                "".join(traceback.format_stack(frame)),
+            )
@@ -1,18 +1,79 @@
 """Main FastAPI application for README-MCP."""
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from . import (
+    admission,
+    api,
+    compression,
+    deadline,
+    grep,
+    loop_monitor,
+    memory,
+    metrics,
+    offload,
+    peers,
+    profiling,
+    ratelimit,
+    timing,
+)
 from .api import router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Monitor the event loop and peers while serving; release pools on shutdown."""
+    monitor = loop_monitor.LoopMonitor()
+    monitor.start()
+    peers.peer_router.start()
+    yield
+    await peers.peer_router.stop()
+    await monitor.stop()
+    grep.shutdown_executor()
+    offload.shutdown_executor()
+
+
 app = FastAPI(
     title="README-MCP",
     description="GitHub repository documentation service",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Include API routes
 app.include_router(router)
 
+# Innermost, so metrics and timing see compressed responses
+app.add_middleware(compression.CompressionMiddleware)
+
+# Outside compression, so forwarded bodies keep the owner's encoding; inside
+# rate limiting, so callers are limited where they arrive
+app.add_middleware(peers.PeerRoutingMiddleware)
+
+# Inside metrics, so refused requests are counted too
+app.add_middleware(ratelimit.RateLimitMiddleware)
+
+# Record per-route latency and in-flight requests
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Outside metrics, so requests cancelled on disconnect are recorded as 499
+app.add_middleware(deadline.DeadlineMiddleware)
+
+# Start each request's admission deadline before any other work
+app.add_middleware(admission.AdmissionMiddleware)
+
+# Profile selected requests; not installed at all unless configured
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# Outermost, so the timed span covers every other middleware
+app.add_middleware(timing.TimingMiddleware)
+timing.configure_access_log()
+
 
 @app.get("/")
 async def root():
@@ -25,6 +86,11 @@ async def root():
             "/readme": "Get README file from GitHub repository",
             "/file": "Get specific file from GitHub repository",
             "/ls": "List directory contents from GitHub repository",
+            "/ls/batch": "List several directories from GitHub repository at once",
+            "/tree": "Recursively list a directory subtree from GitHub repository",
+            "/find": "Search file and directory names in GitHub repository",
+            "/grep": "Search file contents in GitHub repository",
+            "/metrics": "Prometheus metrics",
         },
     }
 
@@ -35,4 +101,37 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus metrics in the text exposition format."""
+    return PlainTextResponse(
+        metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/debug/profile/{profile_id}")
+async def get_profile(profile_id: str, x_profile: str | None = Header(None)):
+    """Download a stored pstats profile; requires the profiling admin secret."""
+    path = profiling.profile_path(profile_id)
+    if not profiling.authorized(x_profile) or path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.pstats"
+    )
+
+
+@app.get("/debug/memory")
+async def get_memory(top: int = 10, x_profile: str | None = Header(None)):
+    """Memory accounting per cache layer; requires the profiling admin secret."""
+    if not profiling.authorized(x_profile):
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Walking large caches takes seconds; only copying them holds the loop
+    result = await asyncio.to_thread(memory.report, top, memory.cache_layers())
+    result["snapshots_on_disk"] = {
+        "entries": len(api.snapshot_store),
+        "bytes": api.snapshot_store.total_bytes,
+    }
+    return result
+
+
 # For direct execution, use scripts/dev.py instead
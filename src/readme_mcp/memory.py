@@ -0,0 +1,191 @@
+"""Memory accounting for README-MCP.
+
+Reports process RSS, per-cache-layer deep sizes, and, when ``tracemalloc`` is
+tracing (e.g. started with ``PYTHONTRACEMALLOC=1``), the top allocation sites.
+Deep sizes walk live objects and count each object once per layer, so strings
+shared between entries of one layer are not double counted. Walking large
+caches takes a while; this is a debugging aid, not something to scrape.
+Caches held in memory shared between workers store packed bytes, so they are
+reported by the bytes of their live values instead.
+"""
+
+import os
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Iterable
+from types import FunctionType, ModuleType
+
+from . import find
+from .cache import named_caches
+from .shared_cache import shared_caches
+
+# Objects whose size does not depend on anything they reference
+_LEAF_TYPES = (str, bytes, bytearray, int, float, bool, type(None), array)
+# Shared program objects never owned by a cache entry
+_SKIP_TYPES = (type, ModuleType, FunctionType)
+
+# Layer name to its entries and entry bound, or to its usage if already known
+Layers = dict[str, tuple[list, int | None] | dict]
+
+
+def deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Return the bytes used by ``obj`` and everything it references.
+
+    Args:
+        obj: Root object to measure
+        seen: Ids of objects already counted; shared across calls to count
+            each object once
+
+    Returns:
+        Total ``sys.getsizeof`` of all reachable, not yet counted objects
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIP_TYPES):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, _LEAF_TYPES):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, list | tuple | set | frozenset):
+            stack.extend(o)
+        else:
+            for cls in type(o).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot != "__weakref__" and hasattr(o, slot):
+                        stack.append(getattr(o, slot))
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+    return total
+
+
+def layer_usage(entries: Iterable[object]) -> dict:
+    """Return entry count, total bytes and bytes per entry of a cache layer."""
+    seen: set[int] = set()
+    count = 0
+    total = 0
+    for entry in entries:
+        count += 1
+        total += deep_sizeof(entry, seen)
+    return {
+        "entries": count,
+        "bytes": total,
+        "bytes_per_entry": total // count if count else 0,
+    }
+
+
+def cache_layers() -> Layers:
+    """Return every cache layer's entries and entry bound.
+
+    The entries are copied, so they can be measured off the event loop while
+    the caches keep changing. Shared caches are measured here instead, since
+    their record locks don't keep other threads of this process out.
+    """
+    layers: dict[str, list] = {}
+    for cache in named_caches():
+        layers.setdefault(cache.name, []).append(cache)
+    # Caches sharing a name (e.g. several clients) are one layer
+    result: Layers = {
+        name: (
+            [value for cache in caches for value in cache.values()],
+            sum(cache.max_entries for cache in caches),
+        )
+        for name, caches in sorted(layers.items())
+    }
+    result["path_index"] = (list(find._indexes.values()), None)
+    shared: dict[str, list] = {}
+    for cache in shared_caches():
+        shared.setdefault(cache.name, []).append(cache)
+    for name, caches in sorted(shared.items()):
+        count = sum(len(cache) for cache in caches)
+        total = sum(cache.total_bytes for cache in caches)
+        result[name] = {
+            "entries": count,
+            "bytes": total,
+            "bytes_per_entry": total // count if count else 0,
+            "max_entries": sum(cache.slots for cache in caches),
+            "max_bytes": sum(cache.max_bytes for cache in caches),
+        }
+    return result
+
+
+def cache_usage(layers: Layers | None = None) -> dict:
+    """Return memory usage of every in-process cache layer.
+
+    Args:
+        layers: Layers from ``cache_layers``; taken now if not given
+    """
+    if layers is None:
+        layers = cache_layers()
+    usage = {}
+    for name, layer in layers.items():
+        if isinstance(layer, dict):
+            usage[name] = layer
+            continue
+        entries, max_entries = layer
+        usage[name] = layer_usage(entries)
+        if max_entries is not None:
+            usage[name]["max_entries"] = max_entries
+    return usage
+
+
+def process_memory() -> dict:
+    """Return current and peak resident set size in bytes, where available."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    peak = None
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        peak = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+def top_allocations(limit: int = 10) -> list[dict] | None:
+    """Return the largest allocation sites, or ``None`` if not tracing."""
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def report(top: int = 10, layers: Layers | None = None) -> dict:
+    """Return the full memory report.
+
+    Args:
+        top: Number of allocation sites to list
+        layers: Cache layers from ``cache_layers``; taken now if not given
+    """
+    return {
+        "process": process_memory(),
+        "caches": cache_usage(layers),
+        "tracemalloc_top": top_allocations(top),
+    }
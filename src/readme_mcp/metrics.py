@@ -0,0 +1,420 @@
+"""In-process Prometheus metrics for README-MCP.
+
+A deliberately small implementation of counters, gauges and histograms that
+renders the Prometheus text exposition format. Recording a sample is a dict
+lookup plus an attribute update (histograms add one ``bisect``), which keeps
+instrumentation cheap enough for every request and every upstream call.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, covering cache hits through slow upstream calls
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    """Base class for a metric family with optional labels."""
+
+    type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "Registry | None" = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child metric for the given label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        """Stop exporting the child metric for the given label values."""
+        self._children.pop(values, None)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        label_text = _labels(self.labelnames, values)
+        return [f"{self.name}{label_text} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or is computed at scrape time."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "Registry | None" = None,
+        function: Callable[[], float] | None = None,
+    ):
+        self.function = function
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def render(self) -> list[str]:
+        if self.function is not None:
+            self._children[()].set(self.function())
+        return super().render()
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "sum", "bounds")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> "_Timer":
+        """Context manager observing the duration of its block."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: _HistogramValue):
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "Registry | None" = None,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def time(self) -> _Timer:
+        return self._children[()].time()
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(
+            (*child.bounds, float("inf")), child.counts, strict=True
+        ):
+            cumulative += count
+            label_text = _labels(
+                self.labelnames, values, f'le="{_format_value(bound)}"'
+            )
+            lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+        label_text = _labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{label_text} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Service metrics shared across modules
+REQUEST_DURATION = Histogram(
+    "readme_mcp_request_duration_seconds",
+    "Time spent handling HTTP requests, by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "readme_mcp_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+UPSTREAM_REQUESTS = Counter(
+    "readme_mcp_upstream_requests_total",
+    "GitHub API calls, by endpoint and response status.",
+    ["endpoint", "status"],
+)
+UPSTREAM_DURATION = Histogram(
+    "readme_mcp_upstream_duration_seconds",
+    "Latency of GitHub API calls, by endpoint.",
+    ["endpoint"],
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "readme_mcp_upstream_requests_in_flight",
+    "GitHub API calls currently in progress.",
+)
+RATE_LIMIT_REMAINING = Gauge(
+    "readme_mcp_github_rate_limit_remaining",
+    "Last X-RateLimit-Remaining value reported by GitHub, by resource.",
+    ["resource"],
+)
+CACHE_REQUESTS = Counter(
+    "readme_mcp_cache_requests_total",
+    "Cache lookups, by cache layer and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "readme_mcp_cache_hit_ratio",
+    "Fraction of lookups served from cache since start, by cache layer.",
+    ["cache"],
+)
+SINGLEFLIGHT_COALESCED = Counter(
+    "readme_mcp_singleflight_coalesced_total",
+    "Calls that joined an in-flight upstream call instead of starting one.",
+    ["flight"],
+)
+LOOP_LAG = Histogram(
+    "readme_mcp_event_loop_lag_seconds",
+    "Delay of the event-loop monitor's wake-ups past their scheduled time.",
+)
+LOOP_BLOCKED = Counter(
+    "readme_mcp_event_loop_blocked_total",
+    "Event-loop monitor wake-ups delayed past the blocking threshold.",
+)
+OFFLOAD_PENDING = Gauge(
+    "readme_mcp_offload_pending",
+    "Offloaded tasks submitted and not yet finished, including queued ones.",
+)
+OFFLOAD_WAIT = Histogram(
+    "readme_mcp_offload_wait_seconds",
+    "Time offloaded tasks waited before a worker started them, by task.",
+    ["task"],
+)
+OFFLOAD_DURATION = Histogram(
+    "readme_mcp_offload_duration_seconds",
+    "Time offloaded tasks ran in a worker, by task.",
+    ["task"],
+)
+
+RATE_LIMITED = Counter(
+    "readme_mcp_rate_limited_total",
+    "Requests refused with 429, by how the caller was identified.",
+    ["caller"],
+)
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "readme_mcp_upstream_concurrency_limit",
+    "Adaptive limit on concurrent GitHub calls, by token identity.",
+    ["token"],
+)
+ADMISSION_QUEUED = Gauge(
+    "readme_mcp_admission_queued",
+    "GitHub calls waiting for an admission slot.",
+)
+ADMISSION_WAIT = Histogram(
+    "readme_mcp_admission_wait_seconds",
+    "Time admitted GitHub calls waited in the admission queue, by priority.",
+    ["priority"],
+)
+ADMISSION_REJECTED = Counter(
+    "readme_mcp_admission_rejected_total",
+    "GitHub calls shed with 503, by priority and reason.",
+    ["priority", "reason"],
+)
+DEADLINE_EXCEEDED = Counter(
+    "readme_mcp_deadline_exceeded_total",
+    "Requests failed with 504 because their deadline passed.",
+)
+REQUESTS_CANCELLED = Counter(
+    "readme_mcp_requests_cancelled_total",
+    "Requests whose work was cancelled because the client disconnected.",
+)
+PEERS = Gauge(
+    "readme_mcp_peers",
+    "Replicas on the peer routing ring, this one included.",
+)
+PEER_REQUESTS = Counter(
+    "readme_mcp_peer_requests_total",
+    "Requests for repositories owned by a peer, by result "
+    "(forwarded, fallback, timeout).",
+    ["result"],
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup and refresh the layer's hit ratio."""
+    hits = CACHE_REQUESTS.labels(cache, "hit")
+    misses = CACHE_REQUESTS.labels(cache, "miss")
+    (hits if hit else misses).inc()
+    CACHE_HIT_RATIO.labels(cache).set(hits.value / (hits.value + misses.value))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and in-flight requests.
+
+    Latency is labelled with the matched route template rather than the raw
+    path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except asyncio.CancelledError:
+            # Client went away; recorded with nginx's "client closed request"
+            status = 499
+            raise
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status),
+            ).observe(time.perf_counter() - start)
@@ -1,8 +1,19 @@
 """Request and response models for README-MCP."""
 
 import re
+from typing import Literal
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from .tree import compile_glob
+
+
+def _check_glob(pattern: str) -> None:
+    """Reject glob patterns that can't be compiled, such as ``[z-a]``."""
+    try:
+        compile_glob(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid glob pattern {pattern!r}: {e}") from None
 
 
 class ReadmeRequest(BaseModel):
@@ -11,6 +22,8 @@ class ReadmeRequest(BaseModel):
     repo_url: str
     ref: str | None = "main"
     token: str | None = None
+    # ETag of a copy the caller holds; answered with 304 if still current
+    if_none_match: str | None = Field(default=None, max_length=1000)
 
     @field_validator("repo_url")
     @classmethod
@@ -29,6 +42,8 @@ class FileRequest(BaseModel):
     path: str
     ref: str | None = "main"
     token: str | None = None
+    # ETag of a copy the caller holds; answered with 304 if still current
+    if_none_match: str | None = Field(default=None, max_length=1000)
 
     @field_validator("repo_url")
     @classmethod
@@ -76,6 +91,13 @@ class DirectoryRequest(BaseModel):
     dir: str = ""
     ref: str | None = "main"
     token: str | None = None
+    limit: int = Field(default=1000, ge=1, le=1000)
+    cursor: str | None = Field(default=None, max_length=2000)
+    sort: Literal["name", "size", "type"] = "name"
+    order: Literal["asc", "desc"] = "asc"
+    type: Literal["file", "dir"] | None = None
+    # ETag of a copy the caller holds; answered with 304 if still current
+    if_none_match: str | None = Field(default=None, max_length=1000)
 
     @field_validator("repo_url")
     @classmethod
@@ -108,6 +130,49 @@ class DirectoryRequest(BaseModel):
         return v
 
 
+class BatchDirectoryRequest(BaseModel):
+    """Request model for batch directory listing endpoint."""
+
+    repo_url: str
+    dirs: list[str] = Field(min_length=1, max_length=50)
+    ref: str | None = "main"
+    token: str | None = None
+    limit: int = Field(default=1000, ge=1, le=1000)
+    sort: Literal["name", "size", "type"] = "name"
+    order: Literal["asc", "desc"] = "asc"
+    type: Literal["file", "dir"] | None = None
+
+    @field_validator("repo_url")
+    @classmethod
+    def validate_repo_url(cls, v):
+        """Validate GitHub repository URL format."""
+        pattern = r"^https://github\.com/[\w\-\.]+/[\w\-\.]+$"
+        if not re.match(pattern, v):
+            raise ValueError("Invalid GitHub repository URL format")
+        return v
+
+    @field_validator("dirs")
+    @classmethod
+    def validate_dirs(cls, v):
+        """Validate directory paths and drop duplicates, keeping order."""
+        dirs = []
+        for d in v:
+            # Strip leading/trailing slashes and normalize
+            d = d.strip("/")
+
+            # Check for path traversal attempts
+            if ".." in d:
+                raise ValueError("Invalid directory path: path traversal not allowed")
+
+            # Basic path validation
+            if len(d) > 1000:
+                raise ValueError("Directory path must be less than 1000 characters")
+
+            if d not in dirs:
+                dirs.append(d)
+        return dirs
+
+
 class DirectoryEntry(BaseModel):
     """Model for a single directory entry."""
 
@@ -115,7 +180,7 @@ class DirectoryEntry(BaseModel):
     path: str
     sha: str
     size: int | None
-    type: str  # "file" or "dir"
+    type: str  # "file", "dir" or "submodule"
     download_url: str | None
 
 
@@ -123,8 +188,269 @@ class DirectoryResponse(BaseModel):
     """Response model for directory listing."""
 
     entries: list[DirectoryEntry]
+    total_count: int  # Entries across all pages
+    path: str
+    next_cursor: str | None = None  # Pass back as "cursor" for the next page
+
+
+class DirectoryError(BaseModel):
+    """Model for a failed listing within a batch."""
+
+    status_code: int
+    detail: str
+
+
+class BatchDirectoryResponse(BaseModel):
+    """Response model for batch directory listing."""
+
+    sha: str  # Commit SHA every listing was read from
+    results: dict[str, DirectoryResponse]  # Keyed by directory path
+    errors: dict[str, DirectoryError]  # Keyed by directory path
+
+
+class TreeRequest(BaseModel):
+    """Request model for recursive tree endpoint."""
+
+    repo_url: str
+    path: str = ""
+    ref: str | None = "main"
+    token: str | None = None
+    depth: int | None = Field(default=None, ge=1)
+    include: list[str] = []
+    exclude: list[str] = []
+    min_size: int | None = Field(default=None, ge=0)
+    max_size: int | None = Field(default=None, ge=0)
+    stream: bool = False
+
+    @field_validator("repo_url")
+    @classmethod
+    def validate_repo_url(cls, v):
+        """Validate GitHub repository URL format."""
+        pattern = r"^https://github\.com/[\w\-\.]+/[\w\-\.]+$"
+        if not re.match(pattern, v):
+            raise ValueError("Invalid GitHub repository URL format")
+        return v
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, v):
+        """Validate directory path to prevent traversal attacks."""
+        # Strip leading/trailing slashes and normalize
+        v = v.strip("/")
+
+        # Empty string is valid (root directory)
+        if not v:
+            return v
+
+        # Check for path traversal attempts
+        if ".." in v or v.startswith("/"):
+            raise ValueError("Invalid directory path: path traversal not allowed")
+
+        # Basic path validation
+        if len(v) > 1000:
+            raise ValueError("Directory path must be less than 1000 characters")
+
+        return v
+
+    @field_validator("include", "exclude")
+    @classmethod
+    def validate_patterns(cls, v):
+        """Limit the number and length of glob patterns, and check they compile."""
+        if len(v) > 50:
+            raise ValueError("At most 50 glob patterns are allowed")
+        if any(not p or len(p) > 200 for p in v):
+            raise ValueError("Glob patterns must be between 1 and 200 characters")
+        for p in v:
+            _check_glob(p)
+        return v
+
+
+class TreeEntry(BaseModel):
+    """Model for a single recursive tree entry."""
+
+    path: str
+    type: str  # "file", "dir" or "submodule"
+    sha: str
+    size: int | None
+
+
+class TreeResponse(BaseModel):
+    """Response model for recursive tree listing."""
+
+    entries: list[TreeEntry]
     total_count: int
     path: str
+    sha: str  # Commit SHA the tree was read from
+    truncated: bool  # GitHub truncated the recursive tree
+
+
+class FindRequest(BaseModel):
+    """Request model for filename search endpoint."""
+
+    repo_url: str
+    pattern: str | None = Field(default=None, min_length=1, max_length=200)
+    query: str | None = Field(default=None, min_length=1, max_length=200)
+    path: str = ""
+    type: Literal["file", "dir"] | None = None
+    ref: str | None = "main"
+    token: str | None = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+    @field_validator("repo_url")
+    @classmethod
+    def validate_repo_url(cls, v):
+        """Validate GitHub repository URL format."""
+        pattern = r"^https://github\.com/[\w\-\.]+/[\w\-\.]+$"
+        if not re.match(pattern, v):
+            raise ValueError("Invalid GitHub repository URL format")
+        return v
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, v):
+        """Validate directory path to prevent traversal attacks."""
+        # Strip leading/trailing slashes and normalize
+        v = v.strip("/")
+
+        # Empty string is valid (root directory)
+        if not v:
+            return v
+
+        # Check for path traversal attempts
+        if ".." in v or v.startswith("/"):
+            raise ValueError("Invalid directory path: path traversal not allowed")
+
+        # Basic path validation
+        if len(v) > 1000:
+            raise ValueError("Directory path must be less than 1000 characters")
+
+        return v
+
+    @field_validator("pattern")
+    @classmethod
+    def validate_pattern(cls, v):
+        """Check the glob pattern compiles."""
+        if v is not None:
+            _check_glob(v)
+        return v
+
+    @model_validator(mode="after")
+    def validate_search(self):
+        """Require exactly one of a glob pattern or a fuzzy query."""
+        if (self.pattern is None) == (self.query is None):
+            raise ValueError("Exactly one of 'pattern' or 'query' is required")
+        return self
+
+
+class FindMatch(BaseModel):
+    """Model for a single filename search match."""
+
+    path: str
+    type: str  # "file", "dir" or "submodule"
+    sha: str
+    size: int | None
+    score: float | None = None  # Relevance for fuzzy queries
+
+
+class FindResponse(BaseModel):
+    """Response model for filename search."""
+
+    matches: list[FindMatch]
+    total_count: int  # Matches found before applying the limit
+    sha: str  # Commit SHA the tree was read from
+    truncated: bool  # GitHub truncated the recursive tree
+
+
+class GrepRequest(BaseModel):
+    """Request model for content search endpoint."""
+
+    repo_url: str
+    pattern: str = Field(min_length=1, max_length=1000)
+    regex: bool = False
+    case_sensitive: bool = True
+    path: str = ""
+    include: list[str] = []
+    exclude: list[str] = []
+    ref: str | None = "main"
+    token: str | None = None
+    context: int = Field(default=0, ge=0, le=10)
+    max_results: int = Field(default=500, ge=1, le=10000)
+    max_file_size: int = Field(default=1024 * 1024, ge=1)
+    timeout: float = Field(default=10.0, gt=0, le=60)
+    stream: bool = False
+
+    @field_validator("repo_url")
+    @classmethod
+    def validate_repo_url(cls, v):
+        """Validate GitHub repository URL format."""
+        pattern = r"^https://github\.com/[\w\-\.]+/[\w\-\.]+$"
+        if not re.match(pattern, v):
+            raise ValueError("Invalid GitHub repository URL format")
+        return v
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, v):
+        """Validate directory path to prevent traversal attacks."""
+        # Strip leading/trailing slashes and normalize
+        v = v.strip("/")
+
+        # Empty string is valid (root directory)
+        if not v:
+            return v
+
+        # Check for path traversal attempts
+        if ".." in v or v.startswith("/"):
+            raise ValueError("Invalid directory path: path traversal not allowed")
+
+        # Basic path validation
+        if len(v) > 1000:
+            raise ValueError("Directory path must be less than 1000 characters")
+
+        return v
+
+    @field_validator("include", "exclude")
+    @classmethod
+    def validate_patterns(cls, v):
+        """Limit the number and length of glob patterns, and check they compile."""
+        if len(v) > 50:
+            raise ValueError("At most 50 glob patterns are allowed")
+        if any(not p or len(p) > 200 for p in v):
+            raise ValueError("Glob patterns must be between 1 and 200 characters")
+        for p in v:
+            _check_glob(p)
+        return v
+
+    @model_validator(mode="after")
+    def validate_regex(self):
+        """Reject regular expressions that do not compile."""
+        if self.regex:
+            try:
+                re.compile(self.pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression: {e}") from None
+        return self
+
+
+class GrepMatch(BaseModel):
+    """Model for a single content search match."""
+
+    path: str
+    line_number: int
+    line: str
+    before: list[str] = []
+    after: list[str] = []
+
+
+class GrepResponse(BaseModel):
+    """Response model for content search."""
+
+    matches: list[GrepMatch]
+    total_count: int
+    files_scanned: int
+    sha: str  # Commit SHA the snapshot was read from
+    limit_reached: bool  # Search stopped at max_results
+    timed_out: bool  # Search stopped at the time budget
 
 
 class ReadmeResponse(BaseModel):
@@ -0,0 +1,96 @@
+"""Offloading of CPU-heavy work from the event loop for README-MCP.
+
+Payload decoding and parsing are cheap for typical files, so small inputs keep
+running inline. Inputs of at least ``settings.offload_threshold`` bytes run on
+a shared thread or process pool instead (``settings.offload_executor``), so a
+single large file no longer stalls every other request on the worker. The
+number of submitted tasks is capped; callers beyond the cap wait on the event
+loop rather than piling work into the pool.
+"""
+
+import asyncio
+import base64
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from . import metrics
+from .config import settings
+
+_executor: Executor | None = None
+_slots: asyncio.Semaphore | None = None
+
+
+def get_executor() -> Executor:
+    """Return the shared offload pool, starting it on first use."""
+    global _executor
+    if _executor is None:
+        workers = max(1, settings.offload_workers)
+        if settings.offload_executor == "process":
+            # "spawn" avoids forking a process that already runs an event loop
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="offload"
+            )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the offload pool, if started."""
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    _slots = None
+
+
+def _timed_call(fn: Callable, *args) -> tuple[float, float, Any]:
+    """Run ``fn`` in a worker, returning its start and end times with the result."""
+    start = time.monotonic()
+    result = fn(*args)
+    return start, time.monotonic(), result
+
+
+async def run(task: str, fn: Callable, *args, size: int) -> Any:
+    """Run ``fn(*args)``, off the event loop if the input is large.
+
+    Args:
+        task: Short task name used as the metric label
+        fn: Picklable module-level function doing the work
+        *args: Arguments passed to ``fn``
+        size: Input size in bytes, compared against the offload threshold
+
+    Returns:
+        Result of ``fn``
+    """
+    if size < settings.offload_threshold:
+        return fn(*args)
+
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, settings.offload_max_pending))
+
+    metrics.OFFLOAD_PENDING.inc()
+    submitted = time.monotonic()
+    try:
+        async with _slots:
+            loop = asyncio.get_running_loop()
+            start, end, result = await loop.run_in_executor(
+                get_executor(), _timed_call, fn, *args
+            )
+    finally:
+        metrics.OFFLOAD_PENDING.dec()
+    metrics.OFFLOAD_WAIT.labels(task).observe(start - submitted)
+    metrics.OFFLOAD_DURATION.labels(task).observe(end - start)
+    return result
+
+
+def decode_base64_text(content: str) -> str:
+    """Decode base64 content (as served by the GitHub contents API) to text."""
+    return base64.b64decode(content).decode("utf-8")
@@ -0,0 +1,426 @@
+"""Consistent-hash request routing across README-MCP replicas.
+
+Every replica caches the repositories it is asked about, so without routing
+each one ends up caching the same popular repositories. With peer routing on,
+each (owner, repo) belongs to one replica, picked on a consistent-hash ring of
+all replicas, and the others forward requests for it there. Caches then split
+the repositories between them, and total cache capacity grows with the number
+of replicas. Adding or removing a replica moves only its share of the
+repositories.
+
+Replicas are listed in ``settings.peers``, or found by resolving
+``settings.peer_dns`` (for example a Kubernetes headless service), which is
+looked up again every ``settings.peer_refresh_interval`` seconds.
+``settings.peer_self`` names this replica in that set. Forwarded requests go
+over one pooled HTTP client. They carry the request's remaining deadline, and
+are marked so the receiving replica serves them itself instead of forwarding
+them on. If the owner cannot be connected to, the request is served locally,
+and the owner is skipped for ``PEER_RETRY_AFTER`` seconds. An owner that
+accepts the request but does not answer in time is not served around: the
+request gets 504, since the owner may still be doing its work.
+
+Forwarded requests also carry the caller identity the sending replica rate
+limited them under. The owner trusts it, and does not rate limit them again,
+only if the sender named in ``PEER_HEADER`` is on the ring and the request
+comes from that replica's address.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import ipaddress
+import logging
+import re
+import socket
+import time
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import admission, deadline, metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Points each replica gets on the ring; more spread keys more evenly
+VNODES = 160
+
+# Header marking a request forwarded by a peer; its value is the sender's URL
+PEER_HEADER = "x-readme-mcp-peer"
+
+# Header carrying the identity the sending peer rate limited a request under
+CALLER_HEADER = "x-readme-mcp-caller"
+
+# Seconds to connect to a peer, and to wait for it otherwise; longer than the
+# longest /grep budget (60 s) plus fetching the snapshot it searches
+PEER_CONNECT_TIMEOUT = 0.5
+PEER_TIMEOUT = 120.0
+
+# Seconds an unreachable peer is skipped before being tried again
+PEER_RETRY_AFTER = 5.0
+
+# Headers not passed on when forwarding, in either direction
+HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "date",
+        "server",
+        "x-forwarded-for",
+        "x-request-timeout",
+        CALLER_HEADER,
+    }
+)
+
+_REPO_URL = re.compile(r"^https://github\.com/([\w\-\.]+)/([\w\-\.]+)$")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
+
+
+def _address(node: str) -> str | None:
+    """Return the IP address a node URL names, normalized, if it names one."""
+    with contextlib.suppress(ValueError):
+        return str(ipaddress.ip_address(urlsplit(node).hostname or ""))
+    return None
+
+
+def repo_key(body: bytes) -> str | None:
+    """Return the ``owner/repo`` a request body is about, lowercased, if any."""
+    # Cheap substring test first, as for tokens in ``ratelimit``
+    if b'"repo_url"' not in body:
+        return None
+    try:
+        repo_url = orjson.loads(body).get("repo_url")
+    except (orjson.JSONDecodeError, AttributeError):
+        return None
+    match = _REPO_URL.match(repo_url) if isinstance(repo_url, str) else None
+    return f"{match[1]}/{match[2]}".lower() if match else None
+
+
+class HashRing:
+    """Consistent-hash ring placing string keys on a set of nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = VNODES):
+        self.nodes = frozenset(nodes)
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str | None:
+        """Return the node ``key`` belongs to, or ``None`` if there are none."""
+        if not self._hashes:
+            return None
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[i]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class PeerRouter:
+    """The replica set, who owns which repository, and forwarding to owners.
+
+    Args:
+        peers: Base URLs of the replicas; from settings by default
+        self_url: This replica's base URL as its peers reach it
+        dns: ``host:port`` whose addresses are the replicas, looked up
+            periodically once started
+        transport: Optional transport override for the peer client
+    """
+
+    def __init__(
+        self,
+        peers: Iterable[str] | None = None,
+        self_url: str | None = None,
+        dns: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.self_url = (settings.peer_self if self_url is None else self_url).rstrip(
+            "/"
+        )
+        self.dns = settings.peer_dns if dns is None else dns
+        self.transport = transport
+        self.ring = HashRing()
+        # Peer URL to the addresses its requests may come from
+        self._addresses: dict[str, frozenset[str]] = {}
+        if peers is None:
+            peers = (peer for peer in settings.peers.split(",") if peer.strip())
+        self.set_peers(peers)
+        # Peer URL to the monotonic time until which it is skipped
+        self._down: dict[str, float] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.self_url) and len(self.ring) > 1
+
+    def set_peers(self, peers: Iterable[str]) -> None:
+        """Place ``peers``, and this replica, on the ring."""
+        nodes = {peer.strip().rstrip("/") for peer in peers}
+        if self.self_url:
+            nodes.add(self.self_url)
+        if nodes == self.ring.nodes:
+            return
+        self.ring = HashRing(nodes)
+        addresses = {}
+        for node in nodes - {self.self_url}:
+            address = _address(node)
+            # Host names keep their last lookup until the next refresh
+            addresses[node] = (
+                self._addresses.get(node, frozenset())
+                if address is None
+                else frozenset({address})
+            )
+        self._addresses = addresses
+        metrics.PEERS.set(len(nodes))
+        logger.info("Peer ring now has %d replicas", len(nodes))
+
+    def owner(self, key: str) -> str | None:
+        """Return the peer to forward ``key``'s requests to, or ``None`` to serve
+        them here: when this replica owns the key or the owner is unreachable.
+        """
+        if not self.enabled:
+            return None
+        node = self.ring.owner(key)
+        if node == self.self_url or self._down.get(node, 0.0) > time.monotonic():
+            return None
+        return node
+
+    def is_peer(self, scope: Scope) -> bool:
+        """Whether a request was forwarded by another replica on the ring.
+
+        The sender named in ``PEER_HEADER`` must be on the ring, and the
+        request must come from that replica's address, so a client can't pass
+        for one by sending the header.
+        """
+        sender = Headers(scope=scope).get(PEER_HEADER)
+        client = scope.get("client")
+        if not (self.enabled and sender and client):
+            return False
+        with contextlib.suppress(ValueError):
+            address = str(ipaddress.ip_address(client[0]))
+            return address in self._addresses.get(sender.rstrip("/"), ())
+        return False
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # One client for every peer, keeping connections alive between calls
+            self._client = httpx.AsyncClient(transport=self.transport)
+        return self._client
+
+    async def forward(self, node: str, scope: Scope, body: bytes) -> httpx.Response:
+        """Send a request on to ``node`` and return its response, unread.
+
+        Raises:
+            httpx.ConnectError: If ``node`` can't be connected to; it is then
+                skipped for ``PEER_RETRY_AFTER`` seconds
+            httpx.TransportError: If the connection fails after that
+            HTTPException: 504 if the request's deadline has passed, or
+                ``node`` does not answer in time
+        """
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name.decode("latin-1").lower() not in HOP_BY_HOP
+        ]
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        client = scope.get("client")
+        if client:
+            forwarded = f"{forwarded}, {client[0]}" if forwarded else client[0]
+        if forwarded:
+            headers.append((b"x-forwarded-for", forwarded.encode("latin-1")))
+        headers.append((PEER_HEADER.encode(), self.self_url.encode()))
+        identity = admission.current_caller()
+        if identity:
+            headers.append((CALLER_HEADER.encode(), identity.encode("latin-1")))
+        timeout = deadline.timeout(PEER_TIMEOUT)
+        if deadline.remaining() is not None:
+            headers.append((b"x-request-timeout", str(timeout).encode()))
+
+        url = node + scope["path"]
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+        http = self._http()
+        request = http.build_request(
+            scope["method"],
+            url,
+            headers=headers,
+            content=body,
+            timeout=httpx.Timeout(timeout, connect=PEER_CONNECT_TIMEOUT),
+        )
+        try:
+            return await http.send(request, stream=True)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            self._down[node] = time.monotonic() + PEER_RETRY_AFTER
+            raise
+        except httpx.TimeoutException:
+            # Reached and maybe still working on it; don't repeat the work here
+            metrics.PEER_REQUESTS.labels("timeout").inc()
+            raise HTTPException(
+                status_code=504, detail="Peer did not respond in time"
+            ) from None
+
+    async def refresh(self) -> None:
+        """Look the replicas up in DNS, if found there, and update the ring;
+        then look up the addresses of replicas named by host name.
+        """
+        if self.dns:
+            await self._lookup_peers()
+        loop = asyncio.get_running_loop()
+        for node in [node for node in self._addresses if _address(node) is None]:
+            url = urlsplit(node)
+            try:
+                found = await loop.getaddrinfo(
+                    url.hostname, url.port or 80, type=socket.SOCK_STREAM
+                )
+            except OSError as e:
+                logger.warning("Could not resolve peer %s: %s", node, e)
+                continue
+            if node in self._addresses:
+                self._addresses[node] = frozenset(
+                    str(ipaddress.ip_address(address[4][0])) for address in found
+                )
+
+    async def _lookup_peers(self) -> None:
+        host, _, port = self.dns.rpartition(":")
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                host, int(port), type=socket.SOCK_STREAM
+            )
+        except OSError as e:
+            logger.warning("Could not resolve peers at %s: %s", self.dns, e)
+            return
+        ips = {address[4][0] for address in addresses}
+        self.set_peers(
+            f"http://[{ip}]:{port}" if ":" in ip else f"http://{ip}:{port}"
+            for ip in ips
+        )
+
+    def start(self) -> None:
+        """Start looking up the replicas periodically, if found by DNS, and the
+        addresses of replicas named by host name.
+        """
+        named = any(_address(node) is None for node in self._addresses)
+        if self.self_url and (self.dns or named):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the lookups and close connections to peers."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.peer_refresh_interval)
+
+
+peer_router = PeerRouter()
+
+
+class PeerRoutingMiddleware:
+    """ASGI middleware forwarding requests for repositories other replicas own.
+
+    Only ``POST`` requests naming a ``repo_url`` are routed, and requests a
+    peer forwarded (see ``PeerRouter.is_peer``) are served here. The owner's
+    response, including its status, headers and content coding, is streamed
+    back as is.
+
+    Args:
+        app: ASGI app serving requests locally
+        router: Router to use; ``peer_router`` by default
+    """
+
+    def __init__(self, app: ASGIApp, router: PeerRouter | None = None):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        router = self.router or peer_router
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not router.enabled
+            # Forwarded once already; a client claiming to be a peer isn't one
+            or router.is_peer(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body to find the repository in it, then replay it
+        messages: list[Message] = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        async def replay() -> Message:
+            return messages.pop(0) if messages else await receive()
+
+        key = repo_key(body)
+        node = router.owner(key) if key else None
+        if node is None:
+            await self.app(scope, replay, send)
+            return
+
+        try:
+            response = await router.forward(node, scope, body)
+        except HTTPException as e:
+            # Raised outside the app, where no exception handler would catch it
+            error = JSONResponse(
+                {"detail": e.detail}, status_code=e.status_code, headers=e.headers
+            )
+            await error(scope, replay, send)
+            return
+        except httpx.TransportError as e:
+            logger.warning("Peer %s unreachable, serving locally: %r", node, e)
+            metrics.PEER_REQUESTS.labels("fallback").inc()
+            await self.app(scope, replay, send)
+            return
+
+        metrics.PEER_REQUESTS.labels("forwarded").inc()
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": response.status_code,
+                    "headers": [
+                        (name, value)
+                        for name, value in response.headers.raw
+                        if name.decode("latin-1").lower() not in HOP_BY_HOP
+                    ],
+                }
+            )
+            async for chunk in response.aiter_raw():
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
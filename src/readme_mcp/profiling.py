@@ -0,0 +1,115 @@
+"""On-demand request profiling for README-MCP.
+
+A request is profiled when it carries an ``X-Profile`` header matching
+``settings.profile_secret``, or when it is picked by
+``settings.profile_sample_rate``. The whole request, including every await in
+the API handlers and the GitHub client, runs under ``cProfile`` and the result
+is written as a pstats file (readable with ``pstats`` or snakeviz) under
+``settings.profile_dir``.
+
+The middleware is only installed when profiling is configured at startup, so
+a service without a secret or sample rate pays nothing for it.
+"""
+
+import contextlib
+import cProfile
+import hmac
+import os
+import random
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+PROFILE_HEADER = b"x-profile"
+
+
+def enabled() -> bool:
+    """Return whether profiling is configured and the middleware is needed."""
+    return bool(settings.profile_secret) or settings.profile_sample_rate > 0
+
+
+def authorized(secret: str | None) -> bool:
+    """Check a caller-supplied secret against the configured admin secret."""
+    expected = settings.profile_secret
+    return (
+        bool(expected)
+        and secret is not None
+        and hmac.compare_digest(secret.encode(), expected.encode())
+    )
+
+
+def profile_path(profile_id: str) -> str | None:
+    """Return the artifact path for ``profile_id``, or ``None`` if unknown."""
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(settings.profile_dir, f"{profile_id}.pstats")
+    return path if os.path.isfile(path) else None
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Delete the oldest artifacts so at most ``keep`` remain."""
+    paths = [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".pstats")
+    ]
+    paths.sort(key=os.path.getmtime)
+    for path in paths[: max(0, len(paths) - keep)]:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running selected requests under ``cProfile``.
+
+    Only one profile runs at a time; ``cProfile`` observes the whole event-loop
+    thread, so other requests served concurrently appear in the profile too.
+    Responses of profiled requests carry an ``X-Profile-Id`` header naming
+    the stored artifact.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return authorized(value.decode("latin-1"))
+        rate = settings.profile_sample_rate
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a coverage tool) already owns the hooks
+            await self.app(scope, receive, send)
+            return
+        self._active = True
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._active = False
+            os.makedirs(settings.profile_dir, exist_ok=True)
+            profiler.dump_stats(
+                os.path.join(settings.profile_dir, f"{profile_id}.pstats")
+            )
+            _prune(settings.profile_dir, settings.profile_max_files)
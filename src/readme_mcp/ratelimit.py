@@ -0,0 +1,181 @@
+"""Per-caller inbound rate limiting for README-MCP.
+
+Each API request is attributed to a caller: the ``X-API-Key`` header if sent,
+else the GitHub token in the request body, else the client address. Callers
+get a token bucket of ``settings.rate_limit_burst`` requests refilled at
+``settings.rate_limit_rps`` per second. Keys and tokens are not validated, so
+every request also takes a token from its client address's bucket; sending a
+new key or token each time does not get a client a fresh bucket. Requests
+finding either bucket empty get 429 with the exact time until both have a
+token in ``Retry-After``.
+
+Requests forwarded by another replica (see ``peers``) were limited by the
+replica the caller reached. They are not limited again, and keep the caller
+identity that replica sent along.
+
+Buckets are kept in generic cell rate algorithm form: one float per caller,
+the time at which its bucket will be full again. A full bucket carries no
+information, so those entries are swept out as the table grows, and memory
+follows the number of recently active callers only.
+"""
+
+import hashlib
+import math
+import time
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import admission, metrics, peers
+from .concurrency import token_id
+from .config import settings
+
+# Table size from which buckets that have refilled are swept out
+SWEEP_SIZE = 4096
+
+
+def caller_id(scope: Scope, body: bytes = b"") -> str:
+    """Identify the caller a request is made for.
+
+    Args:
+        scope: ASGI connection scope
+        body: Request body, searched for a GitHub ``token`` field
+
+    Returns:
+        Short identity; keys and tokens are hashed, never kept as sent
+    """
+    headers = Headers(scope=scope)
+    api_key = headers.get("x-api-key")
+    if api_key:
+        return "key-" + hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+    # Cheap substring test first; most bodies carry no token
+    if b'"token"' in body:
+        try:
+            token = orjson.loads(body).get("token")
+        except (orjson.JSONDecodeError, AttributeError):
+            token = None
+        if isinstance(token, str) and token:
+            return token_id(token)
+
+    return address_id(scope)
+
+
+def address_id(scope: Scope) -> str:
+    """Identify the client address a request comes from."""
+    forwarded = Headers(scope=scope).get("x-forwarded-for")
+    if forwarded and settings.rate_limit_trust_forwarded:
+        return "ip-" + forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return "ip-" + (client[0] if client else "unknown")
+
+
+class RateLimiter:
+    """Token buckets for any number of callers, one float each.
+
+    Args:
+        rate: Requests per second a caller's bucket refills by; 0 disables
+        burst: Requests a full bucket holds
+    """
+
+    def __init__(self, rate: float | None = None, burst: int | None = None):
+        self.rate = settings.rate_limit_rps if rate is None else rate
+        self.burst = settings.rate_limit_burst if burst is None else burst
+        # Caller identity to the time its bucket is full again
+        self._full_at: dict[str, float] = {}
+        self._sweep_at = SWEEP_SIZE
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, *keys: str, now: float | None = None) -> float:
+        """Take a token from the bucket of every one of ``keys``, or of none.
+
+        Returns:
+            0 if the request may proceed, else seconds until every bucket has a
+            token free
+        """
+        if now is None:
+            now = time.monotonic()
+        interval = 1 / self.rate
+        # How far past now a bucket may be drained: all but the last token
+        tolerance = interval * (max(1, self.burst) - 1)
+        full_at = {key: max(self._full_at.get(key, now), now) for key in keys}
+        wait = max(full_at.values()) - tolerance - now
+        if wait > 0:
+            return wait
+        for key, at in full_at.items():
+            self._full_at[key] = at + interval
+        if len(self._full_at) >= self._sweep_at:
+            self._sweep(now)
+        return 0.0
+
+    def _sweep(self, now: float) -> None:
+        self._full_at = {k: t for k, t in self._full_at.items() if t > now}
+        self._sweep_at = max(SWEEP_SIZE, 2 * len(self._full_at))
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware identifying callers and enforcing their rate limits.
+
+    Only ``POST`` requests, i.e. the API endpoints, are limited; health checks,
+    metrics and debugging endpoints are not, nor are requests from peers.
+    Every request's caller identity is also recorded for fair queuing in
+    ``admission``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        forwarded = peers.peer_router.is_peer(scope)
+        identity = Headers(scope=scope).get(peers.CALLER_HEADER) if forwarded else None
+        if identity:
+            # Limited already by the replica the caller reached
+            with admission.caller(identity):
+                await self.app(scope, receive, send)
+            return
+
+        # Buffer the body to find a token in it, then replay it to the app
+        messages: list[Message] = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        async def replay() -> Message:
+            return messages.pop(0) if messages else await receive()
+
+        identity = caller_id(scope, body)
+        if rate_limiter.enabled and not forwarded:
+            wait = rate_limiter.acquire(identity, address_id(scope))
+            if wait:
+                metrics.RATE_LIMITED.labels(identity.partition("-")[0]).inc()
+                response = JSONResponse(
+                    {"detail": "Rate limit exceeded"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, replay, send)
+                return
+
+        with admission.caller(identity):
+            await self.app(scope, replay, send)
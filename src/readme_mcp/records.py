@@ -0,0 +1,93 @@
+"""Compact records for GitHub contents API data.
+
+The contents API returns a dict per file or directory entry with a dozen
+fields (``url``, ``html_url``, ``git_url``, ``_links``...), of which the service
+uses six or seven. Records keep only those, in ``__slots__`` objects rather
+than dicts. Strings that repeat across entries (names, types, the listed
+directory) are interned so equal values share one object.
+"""
+
+import sys
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+class FileRecord:
+    """A file or README with its content, as returned by the contents API."""
+
+    __slots__ = ("name", "path", "sha", "size", "encoding", "content", "download_url")
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        sha: str,
+        size: int,
+        encoding: str | None,
+        content: str,
+        download_url: str | None,
+    ):
+        self.name = sys.intern(name)
+        self.path = path
+        self.sha = sha
+        self.size = size
+        self.encoding = _intern(encoding)
+        self.content = content
+        self.download_url = download_url
+
+    @classmethod
+    def from_github(cls, data: dict) -> "FileRecord":
+        """Build a record from a contents API file object."""
+        return cls(
+            name=data["name"],
+            path=data["path"],
+            sha=data["sha"],
+            size=data["size"],
+            encoding=data.get("encoding"),
+            content=data.get("content", ""),
+            download_url=data.get("download_url"),
+        )
+
+
+class DirectoryRecord:
+    """One entry of a directory listing.
+
+    ``path`` is derived from the parent directory, which is shared by all
+    entries of a listing, and the entry name.
+    """
+
+    __slots__ = ("parent", "name", "sha", "size", "type", "download_url")
+
+    def __init__(
+        self,
+        parent: str,
+        name: str,
+        sha: str,
+        size: int | None,
+        type: str,
+        download_url: str | None,
+    ):
+        self.parent = sys.intern(parent)
+        self.name = sys.intern(name)
+        self.sha = sha
+        self.size = size
+        self.type = sys.intern(type)
+        self.download_url = download_url
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent}/{self.name}" if self.parent else self.name
+
+    @classmethod
+    def from_github(cls, data: dict) -> "DirectoryRecord":
+        """Build a record from a contents API directory entry."""
+        return cls(
+            parent=data["path"].rpartition("/")[0],
+            name=data["name"],
+            sha=data["sha"],
+            size=data.get("size"),  # Directories don't have size
+            type=data["type"],
+            download_url=data.get("download_url"),  # Nor a download URL
+        )
@@ -0,0 +1,209 @@
+"""Cache of fully encoded response bodies for README-MCP.
+
+Responses are keyed by endpoint, repository, the commit SHA the reference
+resolved to, and every request parameter that shapes the body. Since commits
+are immutable, a hit can be sent without touching models, records or the
+JSON encoder. The reference is resolved with the caller's credentials, which
+is what checks access; a resolution is reused by the same caller for
+``settings.ref_cache_ttl`` seconds (see ``GitHubClient.resolve_ref``). In
+addition, bodies built for authenticated callers are never served to anonymous
+ones and vice versa.
+Compressed variants of a body and its ETag are stored alongside it.
+
+With several worker processes the cache is held in shared memory, in packed
+form, so that every worker serves the bodies any of them cached.
+"""
+
+import struct
+from collections.abc import Hashable
+
+from starlette.responses import Response
+
+from . import compression
+from .cache import LRUCache
+from .config import settings
+from .serialization import JSONBytesResponse
+from .shared_cache import SharedCache
+
+# Packed entry header: ETag length and number of encoded variants
+_PACKED = struct.Struct("<HB")
+# Packed variant header: coding name length and body length
+_VARIANT = struct.Struct("<BI")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` value matches ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class CachedResponse:
+    """An encoded JSON body, its ETag and its content-encoded variants."""
+
+    __slots__ = ("body", "etag", "encodings")
+
+    def __init__(
+        self,
+        body: bytes,
+        etag: str | None = None,
+        encodings: dict[str, bytes] | None = None,
+    ):
+        self.body = body
+        # Strong entity tag, quoted, derived from the blob or commit SHA
+        self.etag = etag
+        # Content-Encoding name to the body encoded with it
+        self.encodings = encodings or {}
+
+    def weight(self) -> int:
+        """Bytes held by the body and every variant."""
+        return len(self.body) + sum(map(len, self.encodings.values()))
+
+    def pack(self) -> bytes:
+        """Serialize the entry for storage shared between processes."""
+        etag = (self.etag or "").encode()
+        parts = [_PACKED.pack(len(etag), len(self.encodings)), etag]
+        for name, body in self.encodings.items():
+            parts += [_VARIANT.pack(len(name), len(body)), name.encode(), body]
+        parts.append(self.body)
+        return b"".join(parts)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        """Rebuild an entry serialized by ``pack``."""
+        etag_length, count = _PACKED.unpack_from(data)
+        at = _PACKED.size + etag_length
+        etag = data[_PACKED.size : at].decode() or None
+        encodings = {}
+        for _ in range(count):
+            name_length, length = _VARIANT.unpack_from(data, at)
+            at += _VARIANT.size + name_length
+            name = data[at - name_length : at].decode()
+            encodings[name] = data[at : at + length]
+            at += length
+        return cls(data[at:], etag, encodings)
+
+
+class ResponseCache:
+    """Byte-budgeted LRU cache of encoded response bodies.
+
+    Args:
+        max_bytes: Total body bytes kept; 0 disables caching
+        max_entries: Most bodies kept, whatever their size
+        shared: Keep bodies in memory shared with worker processes forked
+            later; by default, when running more than one worker
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        shared: bool | None = None,
+    ):
+        max_bytes = settings.response_cache_bytes if max_bytes is None else max_bytes
+        max_entries = max_entries or settings.response_cache_entries
+        if shared is None:
+            shared = settings.workers > 1
+        self._cache: LRUCache | SharedCache
+        if shared and max_bytes:
+            # Twice the slots, so hash probes rarely find the index full
+            self._cache = SharedCache(
+                max_bytes,
+                2 * max_entries,
+                name="response",
+                dump=CachedResponse.pack,
+                load=CachedResponse.unpack,
+            )
+        else:
+            self._cache = LRUCache(
+                max_entries,
+                name="response",
+                max_bytes=max_bytes,
+                weigh=CachedResponse.weight,
+            )
+
+    @staticmethod
+    def key(
+        endpoint: str,
+        owner: str,
+        repo: str,
+        sha: str,
+        token: str | None,
+        *params: Hashable,
+    ) -> tuple:
+        """Build the cache key of one response.
+
+        Args:
+            endpoint: Route the body was rendered for
+            owner: Repository owner
+            repo: Repository name
+            sha: Commit SHA the request's reference resolved to
+            token: Caller's GitHub token; only whether one was given matters
+            *params: Remaining request parameters that shape the body
+
+        Returns:
+            Hashable key
+        """
+        return (endpoint, owner, repo, sha, bool(token), *params)
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.max_bytes != 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._cache.total_bytes
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        """Return the cached response for ``key``, or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+        return self._cache.get(key)
+
+    def put(self, key: tuple, body: bytes, etag: str | None = None) -> CachedResponse:
+        """Cache an encoded body under ``key`` and return its cache entry."""
+        cached = CachedResponse(body, etag)
+        if self.enabled:
+            self._cache.set(key, cached)
+        return cached
+
+    async def respond(
+        self, key: tuple, cached: CachedResponse, if_none_match: str | None = None
+    ) -> Response:
+        """Build the response for a cache entry.
+
+        Returns 304 Not Modified when ``if_none_match`` matches the entry's
+        ETag. Otherwise the body is sent in the negotiated coding; a compressed
+        variant is made on first use and kept with the entry, so the body is
+        compressed at most once per coding while it stays cached.
+        """
+        headers = {"etag": cached.etag} if cached.etag else {}
+        if cached.etag and etag_matches(if_none_match, cached.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = compression.accepted()
+        if encoding is None or len(cached.body) < settings.compression_min_size:
+            return JSONBytesResponse(cached.body, headers=headers)
+
+        body = cached.encodings.get(encoding)
+        if body is None:
+            body = await compression.compress(encoding, cached.body)
+            cached.encodings[encoding] = body
+            if key in self._cache:
+                # Re-set to store the variant and account for its bytes
+                self._cache.set(key, cached)
+        headers.update({"content-encoding": encoding, "vary": "Accept-Encoding"})
+        return JSONBytesResponse(body, headers=headers)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
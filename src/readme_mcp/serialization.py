@@ -0,0 +1,35 @@
+"""Fast JSON response rendering for README-MCP.
+
+Endpoints that return a Pydantic model get it validated and serialized twice:
+once when the handler builds it and again when FastAPI checks it against
+``response_model`` and runs ``jsonable_encoder``. Bodies assembled from data
+the service already trusts (GitHub payloads it parsed itself) skip both: they
+are built as plain dicts, encoded once with orjson, and returned as a
+``JSONBytesResponse``, which FastAPI sends as is. Routes keep their
+``response_model`` for the OpenAPI schema.
+"""
+
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    return orjson.dumps(obj)
+
+
+class JSONBytesResponse(Response):
+    """JSON response whose body is encoded at most once.
+
+    ``content`` may be an already encoded body, which is sent unchanged, or a
+    JSON-compatible object, which is encoded with ``dumps``.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,133 @@
+"""Production entry point for README-MCP, with optional worker processes.
+
+``python -m readme_mcp.server`` serves the app with uvicorn. With more than
+one worker (``--workers`` or ``README_MCP_WORKERS``), a supervisor imports the
+app once, binds the listening socket and forks the workers from itself. The
+workers share the preloaded code pages and the response cache segment created
+on import (see ``shared_cache``), and accept connections from the same socket.
+A worker that dies is replaced, unless it dies right after starting, which
+stops the server rather than looping. SIGTERM or SIGINT stops every worker.
+
+Each worker keeps its own tree, snapshot index and path caches, admission and
+rate limit state, and metrics.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker must have run to be restarted when it exits
+MIN_UPTIME = 1.0
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> int:
+    """Serve on the inherited socket in a forked worker; return its exit code."""
+    # Forked from the supervisor, whose signal handlers uvicorn replaces
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def serve(
+    config: uvicorn.Config, workers: int, sock: socket.socket | None = None
+) -> int:
+    """Serve ``config``'s app until stopped, in ``workers`` forked processes.
+
+    Args:
+        config: Uvicorn configuration, holding the imported app
+        workers: Worker processes; one serves in this process instead
+        sock: Bound listening socket; by default one is bound as configured
+
+    Returns:
+        Exit code for the server
+    """
+    if workers <= 1:
+        server = uvicorn.Server(config)
+        server.run(sockets=[sock] if sock else None)
+        return 0 if server.started else 1
+
+    if sock is None:
+        sock = config.bind_socket()
+    started: dict[int, float] = {}
+    stopping = False
+    exit_code = 0
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _run_worker(config, sock)
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+            finally:
+                os._exit(code)
+        started[pid] = time.monotonic()
+
+    def stop(signum: int, frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in started:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    logger.info("Started %d workers", workers)
+
+    while started:
+        pid, status = os.wait()
+        uptime = time.monotonic() - started.pop(pid)
+        if stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        if uptime < MIN_UPTIME:
+            logger.error("Worker %d exited on startup with %d; stopping", pid, code)
+            exit_code = code or 1
+            stop(signal.SIGTERM, None)
+        else:
+            logger.warning("Worker %d exited with %d; restarting", pid, code)
+            spawn()
+    sock.close()
+    return exit_code
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=settings.workers, help="worker processes"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    # Before the app is imported, since the response cache is created on import
+    settings.workers = args.workers
+    from .main import app
+
+    config = uvicorn.Config(app, host=args.host, port=args.port)
+    return serve(config, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
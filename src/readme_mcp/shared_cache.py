@@ -0,0 +1,221 @@
+"""Cache storage shared by the worker processes of README-MCP.
+
+With more than one worker, the encoded response bodies of ``response_cache``
+are kept in one shared memory segment instead of a dict in every worker, so
+adding workers adds cores without multiplying cache memory. The segment is an
+unlinked file, on ``/dev/shm`` when it has room, mapped before the supervisor
+in ``server`` forks the workers from the preloaded app. Every worker maps the
+same pages, and the segment goes away with the last of them.
+
+The segment holds a fixed-size hash index and a ring buffer of records.
+Records are appended at the head of the ring, overwriting the oldest, so
+eviction is first in, first out. An index slot refers to a record by its
+position in the stream of bytes ever written, and is stale once the head has
+moved a whole ring past it. Keys are stored as 16-byte BLAKE2b digests of
+their ``repr``.
+
+Workers take POSIX record locks on the segment: shared to read, exclusive to
+write. The kernel drops a dead worker's locks. Clearing the cache in one
+worker empties the index, and so the cache, for all of them.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import weakref
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from . import metrics
+
+# Segment header: stream position of the ring's head
+_HEADER = struct.Struct("<Q")
+# Index slot: key digest and record stream position plus one; zero when empty
+_SLOT = struct.Struct("<16sQ")
+# Record header: value length
+_RECORD = struct.Struct("<I")
+
+# Index slots searched for a key, from the one its digest hashes to
+PROBES = 8
+
+# Every named shared cache, for memory accounting
+_named: "weakref.WeakSet[SharedCache]" = weakref.WeakSet()
+
+
+def shared_caches() -> list["SharedCache"]:
+    """Return the live shared caches that were given a name."""
+    return list(_named)
+
+
+def _allocate(size: int, directory: str | None) -> int:
+    """Create an unlinked file of ``size`` bytes and return its descriptor."""
+    fd, path = tempfile.mkstemp(prefix="readme-mcp-", dir=directory)
+    os.unlink(path)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            # Allocate up front; running out of space later would be SIGBUS
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _segment(size: int) -> int:
+    """Allocate the segment in memory if there is room, else on disk."""
+    if os.path.isdir("/dev/shm"):
+        # Containers often give /dev/shm only 64 MiB
+        with contextlib.suppress(OSError):
+            return _allocate(size, "/dev/shm")
+    return _allocate(size, None)
+
+
+class SharedCache:
+    """Bounded cache of byte values in memory shared across forked processes.
+
+    Args:
+        max_bytes: Size of the ring buffer of records
+        slots: Index slots, i.e. the most entries kept
+        name: Cache layer name reported in hit/miss metrics
+        dump: Turns a value into the bytes stored; values are bytes if unset
+        load: Turns stored bytes back into a value
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        slots: int,
+        name: str | None = None,
+        dump: Callable[[Any], bytes] | None = None,
+        load: Callable[[bytes], Any] | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.slots = slots
+        self.name = name
+        self._dump = dump
+        self._load = load
+        self._index_at = _HEADER.size
+        self._data_at = self._index_at + slots * _SLOT.size
+        self._fd = _segment(self._data_at + max_bytes)
+        self._map = mmap.mmap(self._fd, self._data_at + max_bytes)
+        if name:
+            _named.add(self)
+
+    @staticmethod
+    def digest(key: Hashable) -> bytes:
+        """Return the stored form of ``key``."""
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False) -> Iterator[int]:
+        """Lock the segment for the block, which gets the ring's head."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield _HEADER.unpack_from(self._map)[0]
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _probe(self, digest: bytes) -> Iterator[tuple[int, bytes, int]]:
+        """Yield the offset, digest and reference of the slots ``digest`` may use."""
+        start = int.from_bytes(digest[:8], "little")
+        for i in range(min(PROBES, self.slots)):
+            at = self._index_at + (start + i) % self.slots * _SLOT.size
+            yield (at, *_SLOT.unpack_from(self._map, at))
+
+    def _live(self, ref: int, head: int) -> bool:
+        return ref > 0 and ref - 1 >= head - self.max_bytes
+
+    def _find(self, digest: bytes, head: int) -> int | None:
+        """Return the stream position of ``digest``'s record, if still live."""
+        for _, slot_digest, ref in self._probe(digest):
+            if slot_digest == digest and self._live(ref, head):
+                return ref - 1
+        return None
+
+    def _read(self, position: int) -> bytes:
+        at = self._data_at + position % self.max_bytes
+        (length,) = _RECORD.unpack_from(self._map, at)
+        return self._map[at + _RECORD.size : at + _RECORD.size + length]
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        digest = self.digest(key)
+        with self._locked() as head:
+            position = self._find(digest, head)
+            data = None if position is None else self._read(position)
+        if self.name:
+            metrics.record_cache(self.name, data is not None)
+        if data is None or self._load is None:
+            return data
+        return self._load(data)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, overwriting the oldest records if full.
+
+        A value larger than the whole ring is not stored.
+        """
+        data = self._dump(value) if self._dump else value
+        size = _RECORD.size + len(data)
+        if size > self.max_bytes:
+            return
+        digest = self.digest(key)
+        with self._locked(exclusive=True) as head:
+            offset = head % self.max_bytes
+            if offset + size > self.max_bytes:
+                # Records don't wrap; skip the ring's tail
+                head += self.max_bytes - offset
+                offset = 0
+            record_at = self._data_at + offset
+            _RECORD.pack_into(self._map, record_at, len(data))
+            self._map[record_at + _RECORD.size : record_at + size] = data
+
+            # The key's own slot, else a free or stale one, else the oldest
+            slot, oldest = None, None
+            for at, slot_digest, ref in self._probe(digest):
+                if slot_digest == digest or not self._live(ref, head + size):
+                    slot = at
+                    break
+                if oldest is None or ref < oldest[1]:
+                    oldest = (at, ref)
+            if slot is None:
+                slot = oldest[0]
+            _SLOT.pack_into(self._map, slot, digest, head + 1)
+            _HEADER.pack_into(self._map, 0, head + size)
+
+    def clear(self) -> None:
+        """Drop every cached entry, for all processes."""
+        with self._locked(exclusive=True):
+            self._map[self._index_at : self._data_at] = bytes(
+                self._data_at - self._index_at
+            )
+
+    def _live_sizes(self) -> list[int]:
+        """Return the length of every live value."""
+        with self._locked() as head:
+            index = self._map[self._index_at : self._data_at]
+            return [
+                _RECORD.unpack_from(
+                    self._map, self._data_at + (ref - 1) % self.max_bytes
+                )[0]
+                for _, ref in _SLOT.iter_unpack(index)
+                if self._live(ref, head)
+            ]
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by live values."""
+        return sum(self._live_sizes())
+
+    def __len__(self) -> int:
+        return len(self._live_sizes())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._locked() as head:
+            return self._find(self.digest(key), head) is not None
@@ -0,0 +1,223 @@
+"""On-disk repository content snapshots for README-MCP."""
+
+import asyncio
+import contextlib
+import functools
+import os
+import shutil
+import tarfile
+import tempfile
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+
+from fastapi import HTTPException
+
+from . import metrics
+from .cache import SingleFlight
+from .config import settings
+from .github_client import GitHubClient
+
+
+def extract_archive(archive: str, dest: str, max_file_size: int) -> int:
+    """Extract regular files from a GitHub tarball into ``dest``.
+
+    GitHub archives wrap everything in one ``owner-repo-sha/`` directory, which
+    is stripped. Links, devices and files above ``max_file_size`` are skipped,
+    and member paths are never trusted: anything escaping ``dest`` is ignored.
+
+    Args:
+        archive: Path of the gzipped tarball
+        dest: Directory to extract into
+        max_file_size: Largest file to extract, in bytes
+
+    Returns:
+        Total bytes written
+    """
+    written = 0
+    root = os.path.realpath(dest)
+    with tarfile.open(archive, "r:gz") as tar:
+        for member in tar:
+            if not member.isfile() or member.size > max_file_size:
+                continue
+            _, _, rel = member.name.partition("/")
+            target = os.path.realpath(os.path.join(root, rel))
+            if not rel or not target.startswith(root + os.sep):
+                continue
+            source = tar.extractfile(member)
+            if source is None:
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with source, open(target, "wb") as f:
+                shutil.copyfileobj(source, f)
+            written += member.size
+    return written
+
+
+class SnapshotLease:
+    """A snapshot directory kept on disk until the lease is released."""
+
+    __slots__ = ("path", "_release")
+
+    def __init__(self, path: str, release: Callable[[], None]):
+        self.path = path
+        self._release: Callable[[], None] | None = release
+
+    def release(self) -> None:
+        """Let the snapshot be evicted again; later calls do nothing."""
+        if self._release is not None:
+            release, self._release = self._release, None
+            release()
+
+
+class SnapshotStore:
+    """Extracted commit contents on local disk, evicted by total byte size.
+
+    Snapshots leased by a running search are never evicted; the store may go
+    over its byte budget until they are released.
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Snapshot directory sizes keyed by (owner, repo, sha), oldest first
+        self._sizes: OrderedDict[tuple, int] = OrderedDict()
+        # Outstanding leases by key
+        self._pins: Counter[tuple] = Counter()
+        self._flight = SingleFlight("snapshot")
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _dir(self, key: tuple) -> str:
+        root = self.root or settings.snapshot_dir
+        return os.path.join(root, "-".join(key))
+
+    async def get(
+        self,
+        client: GitHubClient,
+        owner: str,
+        repo: str,
+        sha: str,
+        token: str | None = None,
+    ) -> str:
+        """Return the directory holding the contents of commit ``sha``.
+
+        The commit archive is downloaded and extracted at most once; callers
+        must already have resolved ``sha`` with their own credentials.
+
+        Args:
+            client: GitHub client used to download the archive
+            owner: Repository owner username
+            repo: Repository name
+            sha: Commit SHA
+            token: GitHub authentication token
+
+        Returns:
+            Path of the extracted snapshot directory
+
+        Raises:
+            HTTPException: If the archive cannot be downloaded
+        """
+        key = (owner.lower(), repo.lower(), sha)
+        if key in self._sizes:
+            metrics.record_cache("snapshot", True)
+            self._sizes.move_to_end(key)
+            return self._dir(key)
+        metrics.record_cache("snapshot", False)
+
+        async def build() -> str:
+            path = self._dir(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            staging = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".tmp-")
+            archive = os.path.join(staging, "archive.tar.gz")
+            try:
+                await client.download_archive(owner, repo, sha, archive, token)
+                content = os.path.join(staging, "content")
+                size = await asyncio.to_thread(
+                    extract_archive,
+                    archive,
+                    content,
+                    settings.snapshot_max_file_size,
+                )
+                await asyncio.to_thread(shutil.rmtree, path, True)
+                os.makedirs(content, exist_ok=True)
+                os.rename(content, path)
+            except tarfile.TarError:
+                raise HTTPException(
+                    status_code=502, detail="Invalid repository archive"
+                ) from None
+            finally:
+                await asyncio.to_thread(shutil.rmtree, staging, True)
+
+            self._sizes[key] = size
+            self._evict(keep=key)
+            return path
+
+        return await self._flight.do(key, build)
+
+    async def acquire(
+        self,
+        client: GitHubClient,
+        owner: str,
+        repo: str,
+        sha: str,
+        token: str | None = None,
+    ) -> SnapshotLease:
+        """Return a lease on the contents of commit ``sha``, as for ``get``.
+
+        The snapshot is not evicted until the lease is released, so files are
+        never removed under a search still reading them.
+
+        Raises:
+            HTTPException: If the archive cannot be downloaded
+        """
+        key = (owner.lower(), repo.lower(), sha)
+        while True:
+            path = await self.get(client, owner, repo, sha, token)
+            # Another build may have evicted it before this caller resumed
+            if key in self._sizes:
+                break
+        self._pins[key] += 1
+        return SnapshotLease(path, functools.partial(self._release, key))
+
+    def _release(self, key: tuple) -> None:
+        self._pins[key] -= 1
+        if not self._pins[key]:
+            del self._pins[key]
+            self._evict()
+
+    def _evict(self, keep: tuple | None = None) -> None:
+        """Remove least recently used snapshots until under the byte budget.
+
+        ``keep``, leased snapshots and the most recently used one are skipped.
+        """
+        max_bytes = self.max_bytes or settings.snapshot_max_bytes
+        for key in list(self._sizes)[:-1]:
+            if self.total_bytes <= max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            del self._sizes[key]
+            self._remove(self._dir(key))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete a snapshot directory without blocking the event loop.
+
+        The directory is first moved aside, so a rebuild of the same commit
+        can't be deleted with it, then removed in a worker thread.
+        """
+        trash = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".evicted-")
+        with contextlib.suppress(OSError):
+            os.rename(path, os.path.join(trash, "content"))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Released outside the loop, e.g. at shutdown
+            shutil.rmtree(trash, ignore_errors=True)
+        else:
+            loop.run_in_executor(None, shutil.rmtree, trash, True)
@@ -0,0 +1,205 @@
+"""Per-request phase timing for README-MCP.
+
+Sampled requests get a ``RequestTimings`` object in a context variable.
+Instrumented code wraps work in ``phase(name)`` blocks; the middleware emits
+the collected durations as a ``Server-Timing`` header and a JSON access-log
+line. Unsampled requests have no timings object, so ``phase`` returns a shared
+no-op context manager.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import random
+import sys
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+access_logger = logging.getLogger("readme_mcp.access")
+
+_current: contextvars.ContextVar["RequestTimings | None"] = contextvars.ContextVar(
+    "readme_mcp_timings", default=None
+)
+_NOOP = nullcontext()
+
+
+class RequestTimings:
+    """Phase durations and boundary marks for one request."""
+
+    __slots__ = ("start", "marks", "durations")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: dict[str, float] = {}
+        # Accumulated seconds per instrumented phase
+        self.durations: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.perf_counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def phases(self) -> dict[str, float]:
+        """Return all known phase durations in milliseconds."""
+        marks = self.marks
+        spans = {
+            "queue": (None, "route_start"),
+            "parse": ("route_start", "endpoint_start"),
+            "handler": ("endpoint_start", "endpoint_end"),
+            "serialize": ("endpoint_end", "response_start"),
+        }
+        result = {}
+        for name, (begin, end) in spans.items():
+            begin_time = self.start if begin is None else marks.get(begin)
+            end_time = marks.get(end)
+            if begin_time is not None and end_time is not None:
+                result[name] = (end_time - begin_time) * 1000
+        for name, seconds in self.durations.items():
+            result[name] = seconds * 1000
+        return result
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "begin")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> "_Phase":
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.timings.add(self.name, time.perf_counter() - self.begin)
+
+
+def current() -> RequestTimings | None:
+    """Return the timings of the current request, if it is sampled."""
+    return _current.get()
+
+
+def phase(name: str):
+    """Context manager adding the block's duration to phase ``name``."""
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _Phase(timings, name)
+
+
+def server_timing_header(phases: dict[str, float]) -> str:
+    """Format phase durations as a ``Server-Timing`` header value."""
+    return ", ".join(f"{name};dur={ms:.2f}" for name, ms in phases.items())
+
+
+class TimedRoute(APIRoute):
+    """API route marking parse, handler and serialization boundaries."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _current.get()
+            if timings is not None:
+                timings.mark("route_start")
+            return await handler(request)
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings.mark("endpoint_start")
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.mark("endpoint_end")
+
+    return wrapper
+
+
+class TimingMiddleware:
+    """ASGI middleware emitting Server-Timing headers and JSON access logs.
+
+    A fraction ``settings.timing_sample_rate`` of requests is timed; the rest
+    pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rate = settings.timing_sample_rate
+        if scope["type"] != "http" or rate <= 0 or random.random() >= rate:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings.mark("response_start")
+                phases = timings.phases()
+                phases["app"] = (timings.marks["response_start"] - timings.start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", server_timing_header(phases).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            total = (time.perf_counter() - timings.start) * 1000
+            if access_logger.isEnabledFor(logging.INFO):
+                route = scope.get("route")
+                access_logger.info(
+                    json.dumps(
+                        {
+                            "ts": time.time(),
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "route": route.path if route is not None else None,
+                            "status": status,
+                            "duration_ms": round(total, 3),
+                            "phases_ms": {
+                                k: round(v, 3) for k, v in timings.phases().items()
+                            },
+                        },
+                        separators=(",", ":"),
+                    )
+                )
+
+
+def configure_access_log() -> None:
+    """Send access-log lines to stdout, one JSON object per line."""
+    if access_logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
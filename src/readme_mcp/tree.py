@@ -0,0 +1,260 @@
+"""Recursive git tree snapshots for README-MCP."""
+
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+
+# GitHub tree entry types mapped onto the contents API vocabulary
+ENTRY_TYPES = {"blob": "file", "tree": "dir", "commit": "submodule"}
+# Stored in ``TreeSnapshot.sizes`` for entries without a size
+NO_SIZE = -1
+
+
+class ShaTable:
+    """Object IDs packed as raw bytes into one buffer.
+
+    A 40-character hex SHA costs ~90 bytes as a ``str`` plus a list slot; packed
+    it costs 20. IDs that are not all hex of one width are kept as a list.
+    """
+
+    __slots__ = ("_data", "_width", "_count")
+
+    def __init__(self, shas: list[str]):
+        self._count = len(shas)
+        self._width = len(shas[0]) // 2 if shas else 0
+        try:
+            data = b"".join(map(bytes.fromhex, shas))
+        except ValueError:
+            data = None
+        if data is None or len(data) != self._width * self._count:
+            self._data: bytes | list[str] = list(shas)
+        else:
+            self._data = data
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if isinstance(self._data, list):
+            return self._data[i]
+        if not -self._count <= i < self._count:
+            raise IndexError("sha index out of range")
+        start = (i % self._count) * self._width
+        return self._data[start : start + self._width].hex()
+
+
+class TreeSnapshot:
+    """Immutable, path-sorted view of a commit's recursive git tree.
+
+    Entries are kept in parallel lists rather than one dict per entry, which
+    keeps large trees (100k+ entries) compact and lets subtree lookups use a
+    binary search on the sorted path list.
+    """
+
+    __slots__ = (
+        "sha",
+        "truncated",
+        "paths",
+        "types",
+        "shas",
+        "sizes",
+        "_children",
+        "__weakref__",
+    )
+
+    def __init__(self, sha: str, items: Iterable[dict], truncated: bool = False):
+        self.sha = sha
+        self.truncated = truncated
+        self._children: dict[str, array] | None = None
+
+        rows = sorted(
+            (
+                item["path"],
+                ENTRY_TYPES.get(item["type"]) or sys.intern(item["type"]),
+                item["sha"],
+                item.get("size"),
+            )
+            for item in items
+        )
+        self.paths: list[str] = [row[0] for row in rows]
+        # Shared type strings, so each entry costs one pointer
+        self.types: list[str] = [row[1] for row in rows]
+        self.shas = ShaTable([row[2] for row in rows])
+        # Entries without a size (directories, submodules) hold NO_SIZE
+        self.sizes = array("q", [NO_SIZE if row[3] is None else row[3] for row in rows])
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def index(self, path: str) -> int | None:
+        """Return the position of ``path`` in the snapshot, if present."""
+        i = bisect_left(self.paths, path)
+        if i < len(self.paths) and self.paths[i] == path:
+            return i
+        return None
+
+    def type_of(self, path: str) -> str | None:
+        """Return the entry type at ``path`` (``"dir"`` for the root)."""
+        if not path:
+            return "dir"
+        i = self.index(path)
+        return self.types[i] if i is not None else None
+
+    def subtree_range(self, path: str) -> range:
+        """Return index range of all descendants of directory ``path``."""
+        if not path:
+            return range(len(self.paths))
+        # Every path under "a/b/" sorts between "a/b/" and "a/b0" ("0" follows "/")
+        start = bisect_left(self.paths, path + "/")
+        end = bisect_left(self.paths, path + "0", start)
+        return range(start, end)
+
+    def children(self, path: str) -> array:
+        """Return indices of the immediate children of directory ``path``.
+
+        The parent-to-children map is built on first use and kept for the life
+        of the snapshot, so listing any directory is a dictionary lookup.
+        """
+        if self._children is None:
+            children: dict[str, array] = {}
+            for i, entry_path in enumerate(self.paths):
+                parent = entry_path.rpartition("/")[0]
+                bucket = children.get(parent)
+                if bucket is None:
+                    bucket = children[parent] = array("I")
+                bucket.append(i)
+            self._children = children
+        return self._children.get(path, array("I"))
+
+    def size_of(self, i: int) -> int | None:
+        """Return the size of entry ``i``, or ``None`` if it has none."""
+        size = self.sizes[i]
+        return None if size == NO_SIZE else size
+
+    def entry(self, i: int) -> dict:
+        """Return entry ``i`` as a plain dictionary."""
+        return {
+            "path": self.paths[i],
+            "type": self.types[i],
+            "sha": self.shas[i],
+            "size": self.size_of(i),
+        }
+
+
+def parse_tree(sha: str, body: bytes) -> TreeSnapshot:
+    """Build a snapshot from a raw recursive git trees API response body."""
+    data = json.loads(body)
+    return TreeSnapshot(sha, data["tree"], truncated=data.get("truncated", False))
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> re.Pattern:
+    """Translate a glob pattern into a compiled regular expression.
+
+    Supports ``*`` (within one path segment), ``**`` (across segments),
+    ``?`` and ``[...]`` character classes. As in ``fnmatch``, a ``]`` right
+    after the opening ``[`` or ``[!`` belongs to the class, and a ``[`` with no
+    class closing it is literal.
+
+    Raises:
+        re.error: If a character class is invalid, such as ``[z-a]``
+    """
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if pattern.startswith("/", i):
+                    # "**/" matches zero or more whole directories
+                    i += 1
+                    out.append("(?:.*/)?")
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if pattern.startswith("!", j):
+                j += 1
+            if pattern.startswith("]", j):
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j].replace("\\", "\\\\").replace("[", "\\[")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                out.append(f"[{body}]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def match_glob(pattern: str, path: str) -> bool:
+    """Match ``path`` against ``pattern``.
+
+    Patterns without a ``/`` match the basename only (``*.py``); patterns
+    containing a ``/`` match the full repository path (``tests/**/*.py``).
+    """
+    if "/" not in pattern:
+        path = path.rsplit("/", 1)[-1]
+    return compile_glob(pattern).match(path) is not None
+
+
+def walk(
+    snapshot: TreeSnapshot,
+    path: str = "",
+    depth: int | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    min_size: int | None = None,
+    max_size: int | None = None,
+) -> Iterator[int]:
+    """Yield snapshot indices of entries under ``path`` matching the filters.
+
+    Args:
+        snapshot: Tree snapshot to walk
+        path: Directory to walk (empty for repository root)
+        depth: Maximum depth below ``path`` (1 lists immediate children only)
+        include: Glob patterns of which at least one must match
+        exclude: Glob patterns of which none may match
+        min_size: Minimum file size in bytes (excludes directories)
+        max_size: Maximum file size in bytes (excludes directories)
+
+    Yields:
+        Indices into the snapshot's parallel entry lists, in path order
+    """
+    base_depth = path.count("/") + 1 if path else 0
+    paths, sizes = snapshot.paths, snapshot.sizes
+    sized = min_size is not None or max_size is not None
+
+    for i in snapshot.subtree_range(path):
+        entry_path = paths[i]
+        if depth is not None and entry_path.count("/") + 1 - base_depth > depth:
+            continue
+        if sized:
+            size = sizes[i]
+            if size == NO_SIZE:
+                continue
+            if min_size is not None and size < min_size:
+                continue
+            if max_size is not None and size > max_size:
+                continue
+        if include and not any(match_glob(p, entry_path) for p in include):
+            continue
+        if exclude and any(match_glob(p, entry_path) for p in exclude):
+            continue
+        yield i
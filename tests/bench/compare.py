@@ -0,0 +1,37 @@
+"""Compare two benchmark result files.
+
+Usage: uv run python -m tests.bench.compare BASE.json HEAD.json
+"""
+
+import json
+import sys
+
+
+def _load(path: str) -> dict[str, dict]:
+    with open(path) as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+def _delta(base: float, head: float) -> str:
+    if not base:
+        return "n/a"
+    return f"{(head - base) / base * 100:+.1f}%"
+
+
+def main(base_path: str, head_path: str) -> None:
+    base, head = _load(base_path), _load(head_path)
+    print(f"{'name':<24}{'rps':>12}{'p50':>10}{'p99':>10}")
+    for name in sorted(base.keys() & head.keys()):
+        b, h = base[name], head[name]
+        print(
+            f"{name:<24}"
+            f"{_delta(b['throughput_rps'], h['throughput_rps']):>12}"
+            f"{_delta(b['latency_ms']['p50'], h['latency_ms']['p50']):>10}"
+            f"{_delta(b['latency_ms']['p99'], h['latency_ms']['p99']):>10}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2])
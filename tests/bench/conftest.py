@@ -0,0 +1,103 @@
+"""Benchmark fixtures: the service on a local port, backed by a fake GitHub.
+
+Benchmarks run as a quick smoke test by default. ``make bench`` raises the
+request count and writes results to JSON; see the README for the ``BENCH_*``
+variables.
+"""
+
+import os
+from dataclasses import asdict
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+import mcp_server
+from readme_mcp import metrics
+
+from .fake_github import FakeGitHubConfig
+from .harness import measure, measure_processes, write_results
+from .server import serve
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", "50"))
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", "10"))
+OUTPUT = os.environ.get("BENCH_OUTPUT")
+
+CONFIG = FakeGitHubConfig.from_env()
+RESULTS: list[dict] = []
+
+
+@pytest.fixture
+def fake_config() -> FakeGitHubConfig:
+    return CONFIG
+
+
+@pytest_asyncio.fixture
+async def service():
+    """Serve the app over HTTP and point the MCP tools at it."""
+    async with serve(CONFIG) as base_url:
+        with patch.object(mcp_server, "BASE_URL", base_url):
+            yield base_url
+
+
+def _upstream_calls() -> float:
+    return sum(child.value for child in metrics.UPSTREAM_REQUESTS._children.values())
+
+
+@pytest.fixture
+def bench():
+    """Measure a call under the configured load and record the result."""
+
+    async def run(name: str, call) -> dict:
+        before = _upstream_calls()
+        result = await measure(name, call, REQUESTS, CONCURRENCY)
+        # The service runs in this process, so its GitHub calls are counted here
+        result["upstream_per_request"] = round(
+            (_upstream_calls() - before) / REQUESTS, 3
+        )
+        RESULTS.append(result)
+        return result
+
+    return run
+
+
+@pytest.fixture
+def bench_processes():
+    """Measure a load run from several client processes and record the result."""
+
+    def run(name: str, load, processes: int) -> dict:
+        result = measure_processes(name, load, REQUESTS, CONCURRENCY, processes)
+        RESULTS.append(result)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<24}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}"
+        f"{'upstream':>10}{'ratio':>8}"
+    )
+    for r in RESULTS:
+        terminalreporter.write_line(
+            f"{r['name']:<24}{r['throughput_rps']:>10}"
+            f"{r['latency_ms']['p50']:>10}{r['latency_ms']['p99']:>10}{r['errors']:>8}"
+            # GitHub calls per request, for benchmarks against the local service
+            f"{r.get('upstream_per_request', ''):>10}"
+            # Compression benchmarks also report the size ratio
+            f"{r.get('ratio', ''):>8}"
+        )
+    if OUTPUT:
+        write_results(
+            OUTPUT,
+            RESULTS,
+            {
+                "requests": REQUESTS,
+                "concurrency": CONCURRENCY,
+                "fake_github": asdict(CONFIG),
+            },
+        )
+        terminalreporter.write_line(f"Results written to {OUTPUT}")
@@ -0,0 +1,144 @@
+"""In-process fake of api.github.com for benchmarks.
+
+An ASGI app serving one synthetic repository with the response shapes used by
+``GitHubClient``. Response bodies are rendered once up front so the fake adds
+as little CPU work as possible; latency and failures are injected per request.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+COMMIT_SHA = "be4c4" + "0" * 35
+
+
+def _env(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+@dataclass
+class FakeGitHubConfig:
+    """Shape and behaviour of the fake upstream."""
+
+    # Added to every response, in milliseconds
+    latency_ms: float = 0.0
+    # Uniform random extra latency, in milliseconds
+    jitter_ms: float = 0.0
+    # Fraction of requests answered with a 502
+    error_rate: float = 0.0
+    readme_size: int = 4 * 1024
+    file_size: int = 16 * 1024
+    # Files directly under the root and under ``src/``
+    dir_entries: int = 200
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeGitHubConfig":
+        """Read overrides from ``BENCH_*`` environment variables."""
+        return cls(
+            latency_ms=_env("BENCH_LATENCY_MS", cls.latency_ms),
+            jitter_ms=_env("BENCH_JITTER_MS", cls.jitter_ms),
+            error_rate=_env("BENCH_ERROR_RATE", cls.error_rate),
+            readme_size=int(_env("BENCH_README_SIZE", cls.readme_size)),
+            file_size=int(_env("BENCH_FILE_SIZE", cls.file_size)),
+            dir_entries=int(_env("BENCH_DIR_ENTRIES", cls.dir_entries)),
+        )
+
+    @property
+    def file_paths(self) -> list[str]:
+        return [f"src/module_{i}.py" for i in range(self.dir_entries)]
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _text(size: int, seed: str) -> str:
+    line = f"# {seed} " + "lorem ipsum dolor sit amet " * 3 + "\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def _content_item(path: str, text: str) -> dict:
+    return {
+        "type": "file",
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "sha": _sha(text),
+        "size": len(text),
+        "encoding": "base64",
+        "content": base64.b64encode(text.encode()).decode(),
+        "download_url": f"https://raw.githubusercontent.com/bench/repo/main/{path}",
+    }
+
+
+def build_fake_github(config: FakeGitHubConfig) -> Starlette:
+    """Create the fake GitHub ASGI app for ``config``."""
+    rng = random.Random(config.seed)
+
+    readme = json.dumps(
+        _content_item("README.md", _text(config.readme_size, "README"))
+    ).encode()
+    files = {
+        path: json.dumps(_content_item(path, _text(config.file_size, path))).encode()
+        for path in config.file_paths
+    }
+    items = [{"path": "README.md", "type": "blob", "size": config.readme_size}]
+    items.append({"path": "src", "type": "tree"})
+    items += [
+        {"path": path, "type": "blob", "size": config.file_size}
+        for path in config.file_paths
+    ]
+    items += [
+        {"path": f"doc_{i}.md", "type": "blob", "size": 100}
+        for i in range(config.dir_entries)
+    ]
+    for item in items:
+        item["sha"] = _sha(item["path"])
+        item["mode"] = "040000" if item["type"] == "tree" else "100644"
+    tree = json.dumps({"sha": COMMIT_SHA, "tree": items, "truncated": False}).encode()
+
+    async def upstream(body: bytes, media_type: str = "application/json") -> Response:
+        delay = config.latency_ms + rng.random() * config.jitter_ms
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            return Response(b'{"message": "Server Error"}', status_code=502)
+        return Response(body, media_type=media_type)
+
+    async def commit(request: Request) -> Response:
+        return await upstream(COMMIT_SHA.encode(), "application/vnd.github.sha")
+
+    async def get_readme(request: Request) -> Response:
+        return await upstream(readme)
+
+    async def contents(request: Request) -> Response:
+        # Any other path (e.g. replayed from a cassette) gets synthetic content
+        path = request.path_params["path"]
+        body = files.get(path)
+        if body is None:
+            text = _text(config.file_size, path)
+            body = files[path] = json.dumps(_content_item(path, text)).encode()
+        return await upstream(body)
+
+    async def git_tree(request: Request) -> Response:
+        return await upstream(tree)
+
+    prefix = "/repos/{owner}/{repo}"
+    return Starlette(
+        routes=[
+            Route(prefix + "/commits/{ref}", commit),
+            Route(prefix + "/readme", get_readme),
+            Route(prefix + "/contents/{path:path}", contents),
+            Route(prefix + "/git/trees/{sha}", git_tree),
+        ]
+    )
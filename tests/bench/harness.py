@@ -0,0 +1,148 @@
+"""Closed-loop latency and throughput measurement for benchmarks."""
+
+import asyncio
+import json
+import multiprocessing
+import platform
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+async def measure(
+    name: str,
+    call: Callable[[int], Awaitable[object]],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """Issue ``requests`` calls from ``concurrency`` workers and summarize them.
+
+    Args:
+        name: Benchmark name recorded in the result
+        call: Coroutine function taking the request number; raising counts as
+            an error
+        requests: Total calls to make
+        concurrency: Calls kept in flight at once
+
+    Returns:
+        Result dict with throughput, error count and latency percentiles (ms)
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "name": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+def _run_load(load: Callable[[int, int], Awaitable[dict]], args: tuple) -> dict:
+    return asyncio.run(load(*args))
+
+
+def measure_processes(
+    name: str,
+    load: Callable[[int, int], Awaitable[dict]],
+    requests: int,
+    concurrency: int,
+    processes: int,
+) -> dict:
+    """Run ``load`` in forked client processes and combine their results.
+
+    A single client process would saturate its own core before a server with
+    several workers does. Call from outside any running event loop.
+
+    Args:
+        name: Benchmark name recorded in the result
+        load: Coroutine function taking a request count and concurrency and
+            returning a ``measure`` result
+        requests: Total calls to make, split between the processes
+        concurrency: Calls each process keeps in flight
+        processes: Client processes
+
+    Returns:
+        Result dict like ``measure``'s; throughput is the sum over processes,
+        latency percentiles the worst of any process
+    """
+    share = [(requests // processes, concurrency)] * processes
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        results = pool.starmap(_run_load, [(load, args) for args in share])
+    return {
+        "name": name,
+        "requests": sum(r["requests"] for r in results),
+        "concurrency": concurrency * processes,
+        "errors": sum(r["errors"] for r in results),
+        "elapsed_s": max(r["elapsed_s"] for r in results),
+        "throughput_rps": round(sum(r["throughput_rps"] for r in results), 2),
+        "latency_ms": {
+            key: max(r["latency_ms"][key] for r in results)
+            for key in results[0]["latency_ms"]
+        },
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, results: list[dict], meta: dict) -> None:
+    """Write benchmark results with run metadata as JSON."""
+    document = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,82 @@
+"""Memory benchmark: load synthetic repositories and account for cache memory.
+
+Each repository gets README, listing, name search and file requests, which
+fill the tree cache and the path index layer. The report covers RSS growth, the
+deep size per cached entry of each layer, and the top tracemalloc allocation
+sites.
+
+Usage: uv run python -m tests.bench.memory [--repos 50] [--output mem.json]
+"""
+
+import argparse
+import asyncio
+import json
+import tracemalloc
+
+import httpx
+
+from readme_mcp import memory
+
+from .fake_github import FakeGitHubConfig
+from .server import serve
+
+
+async def run(repos: int, config: FakeGitHubConfig, top: int = 10) -> dict:
+    """Load ``repos`` fake repositories through the service and report memory."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        return await _load(repos, config, top)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+async def _load(repos: int, config: FakeGitHubConfig, top: int) -> dict:
+    async with serve(config) as base_url:
+        before = memory.process_memory()
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            for i in range(repos):
+                repo_url = f"https://github.com/bench/repo{i}"
+                for endpoint, body in [
+                    ("/readme", {}),
+                    ("/ls", {"dir": "src"}),
+                    ("/find", {"query": "module"}),
+                    ("/file", {"path": config.file_paths[0]}),
+                ]:
+                    response = await client.post(
+                        endpoint, json={"repo_url": repo_url, **body}
+                    )
+                    response.raise_for_status()
+        result = memory.report(top)
+        after = memory.process_memory()
+
+    rss_growth = None
+    if before["rss_bytes"] is not None:
+        rss_growth = after["rss_bytes"] - before["rss_bytes"]
+    return {
+        "repos": repos,
+        "tree_entries_per_repo": 2 + 2 * config.dir_entries,
+        "rss_growth_bytes": rss_growth,
+        **result,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=50)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.repos, FakeGitHubConfig.from_env(), args.top))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
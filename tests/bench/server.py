@@ -0,0 +1,113 @@
+"""Run the service on a loopback port against the fake GitHub."""
+
+import asyncio
+import json
+import socket
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+
+from readme_mcp import api
+from readme_mcp.github_client import GitHubClient
+from readme_mcp.main import app
+from readme_mcp.response_cache import ResponseCache
+
+from .fake_github import FakeGitHubConfig, build_fake_github
+
+
+@contextmanager
+def fake_backend(
+    config: FakeGitHubConfig, response_cache: ResponseCache | None = None
+) -> Iterator[None]:
+    """Point the app at a fake api.github.com built from ``config``.
+
+    The app also gets a fresh response cache unless ``response_cache`` is given.
+    """
+    client = GitHubClient(transport=httpx.ASGITransport(app=build_fake_github(config)))
+    if response_cache is None:
+        response_cache = ResponseCache()
+    with (
+        patch.object(api, "github_client", client),
+        patch.object(api, "response_cache", response_cache),
+    ):
+        yield
+
+
+@asynccontextmanager
+async def serve(
+    config: FakeGitHubConfig, response_cache: ResponseCache | None = None
+) -> AsyncIterator[str]:
+    """Serve the app on a free loopback port and yield its base URL.
+
+    The app runs in the current event loop against ``fake_backend``.
+    """
+    sock = socket.socket()
+    # Accepted connections inherit this; without it small responses on
+    # loopback stall ~40ms on Nagle's algorithm and delayed ACKs
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind(("127.0.0.1", 0))
+    base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+
+    with fake_backend(config, response_cache):
+        task = asyncio.create_task(server.serve(sockets=[sock]))
+        while not server.started:
+            await asyncio.sleep(0.01)
+        try:
+            yield base_url
+        finally:
+            server.should_exit = True
+            await task
+            sock.close()
+
+
+async def asgi_post(path: str, body: dict) -> tuple[int, bytes]:
+    """POST a JSON body straight to the app, with no socket or HTTP client.
+
+    Returns:
+        Response status and body
+    """
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    received = False
+    # Like a server, report the disconnect only once the response is complete
+    complete = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal received
+        if received:
+            await complete.wait()
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    status = 0
+    chunks: list[bytes] = []
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                complete.set()
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
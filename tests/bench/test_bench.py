@@ -0,0 +1,103 @@
+"""Throughput and latency benchmarks for the HTTP API and the MCP tools."""
+
+import httpx
+import pytest
+
+import mcp_server
+from readme_mcp.response_cache import ResponseCache
+
+from .memory import run as run_memory
+from .server import asgi_post, fake_backend
+
+pytestmark = [pytest.mark.bench, pytest.mark.asyncio]
+
+REPO_URL = "https://github.com/bench/repo"
+
+
+def _request_body(endpoint: str, paths: list[str], i: int) -> dict:
+    if endpoint == "/file":
+        return {"repo_url": REPO_URL, "path": paths[i % len(paths)]}
+    if endpoint == "/ls":
+        return {"repo_url": REPO_URL, "dir": "src"}
+    return {"repo_url": REPO_URL}
+
+
+def _check(result: dict, fake_config) -> None:
+    assert result["throughput_rps"] > 0
+    if not fake_config.error_rate:
+        assert result["errors"] == 0
+
+
+@pytest.mark.parametrize("endpoint", ["/readme", "/file", "/ls"])
+async def test_http_endpoint(service, bench, fake_config, endpoint):
+    """Benchmark an API endpoint over HTTP"""
+    paths = fake_config.file_paths
+    async with httpx.AsyncClient(base_url=service, timeout=30) as client:
+
+        async def call(i: int) -> None:
+            response = await client.post(
+                endpoint, json=_request_body(endpoint, paths, i)
+            )
+            response.raise_for_status()
+
+        result = await bench(f"http {endpoint}", call)
+
+    _check(result, fake_config)
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+async def test_ls_response_cache(bench, fake_config, cached):
+    """Benchmark /ls hits on the response cache against rebuilding each body.
+
+    Requests go straight to the ASGI app so client overhead doesn't hide the
+    difference.
+    """
+    cache = ResponseCache() if cached else ResponseCache(max_bytes=0)
+    with fake_backend(fake_config, cache):
+
+        async def call(i: int) -> None:
+            status, _ = await asgi_post("/ls", {"repo_url": REPO_URL})
+            assert status == 200
+
+        name = "cached" if cached else "uncached"
+        result = await bench(f"asgi /ls {name}", call)
+
+    _check(result, fake_config)
+
+
+async def test_mcp_get_readme(service, bench, fake_config):
+    """Benchmark the get_readme MCP tool"""
+
+    async def call(i: int) -> None:
+        await mcp_server.get_readme(REPO_URL)
+
+    _check(await bench("mcp get_readme", call), fake_config)
+
+
+async def test_mcp_get_file(service, bench, fake_config):
+    """Benchmark the get_file MCP tool"""
+    paths = fake_config.file_paths
+
+    async def call(i: int) -> None:
+        await mcp_server.get_file(REPO_URL, paths[i % len(paths)])
+
+    _check(await bench("mcp get_file", call), fake_config)
+
+
+async def test_mcp_list_directory(service, bench, fake_config):
+    """Benchmark the list_directory MCP tool"""
+
+    async def call(i: int) -> None:
+        await mcp_server.list_directory(REPO_URL, "src")
+
+    _check(await bench("mcp list_directory", call), fake_config)
+
+
+async def test_memory_report(fake_config):
+    """Measure cache memory per entry after loading a few repositories"""
+    report = await run_memory(3, fake_config)
+
+    assert report["caches"]["tree"]["entries"] >= 3
+    assert report["caches"]["tree"]["bytes_per_entry"] > 0
+    assert report["caches"]["path_index"]["entries"] >= 3
+    assert report["tracemalloc_top"]
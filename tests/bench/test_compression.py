@@ -0,0 +1,43 @@
+"""Compression cost and ratio per coding for typical response bodies."""
+
+from pathlib import Path
+
+import pytest
+
+from readme_mcp import compression
+from readme_mcp.serialization import dumps
+
+from .test_serialization import _records, render_fast
+
+pytestmark = [pytest.mark.bench, pytest.mark.asyncio]
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _file_body(path: str) -> bytes:
+    text = (ROOT / path).read_text()
+    return dumps({"content": text, "name": Path(path).name, "path": path})
+
+
+BODIES = {
+    "readme": lambda: _file_body("README.md"),
+    "file": lambda: _file_body("src/readme_mcp/api.py"),
+    "ls": lambda: render_fast(_records()),
+}
+
+
+@pytest.mark.parametrize("encoding", sorted(compression.CODECS))
+@pytest.mark.parametrize("body", sorted(BODIES))
+async def test_compress(bench, body, encoding):
+    """Benchmark compressing one response body with one coding"""
+    data = BODIES[body]()
+    codec = compression.CODECS[encoding]
+
+    async def call(i: int) -> None:
+        codec(data)
+
+    result = await bench(f"{encoding} {body}", call)
+    result["ratio"] = round(len(data) / len(codec(data)), 2)
+
+    assert result["errors"] == 0
+    assert result["ratio"] > 1
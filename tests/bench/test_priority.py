@@ -0,0 +1,40 @@
+"""Interactive latency while a bulk crawl saturates the upstream slots."""
+
+import asyncio
+
+import pytest
+
+from readme_mcp.admission import AdmissionController, priority
+
+pytestmark = [pytest.mark.bench, pytest.mark.asyncio]
+
+# Simulated GitHub round trip, slots shared by both workloads, crawl workers
+UPSTREAM_S = 0.005
+SLOTS = 8
+CRAWLERS = 32
+
+
+@pytest.mark.parametrize("crawl_lane", ["interactive", "batch"])
+async def test_interactive_during_crawl(bench, crawl_lane):
+    """Benchmark interactive calls racing a crawl in the same or its own lane"""
+    controller = AdmissionController(max_in_flight=SLOTS, max_queue=10_000)
+    stop = asyncio.Event()
+
+    async def upstream(i: int = 0) -> None:
+        async with controller.slot():
+            await asyncio.sleep(UPSTREAM_S)
+
+    async def crawl() -> None:
+        with priority(crawl_lane):
+            while not stop.is_set():
+                await upstream()
+
+    crawlers = [asyncio.create_task(crawl()) for _ in range(CRAWLERS)]
+    try:
+        lanes = "shared lane" if crawl_lane == "interactive" else "lanes"
+        result = await bench(f"crawl, {lanes}", upstream)
+    finally:
+        stop.set()
+        await asyncio.gather(*crawlers)
+
+    assert result["errors"] == 0
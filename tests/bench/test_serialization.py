@@ -0,0 +1,74 @@
+"""Microbenchmark: rendering a 1,000-entry /ls page, model path vs fast path."""
+
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from readme_mcp.api import _directory_page, _sort_directory
+from readme_mcp.models import DirectoryEntry, DirectoryRequest, DirectoryResponse
+from readme_mcp.records import DirectoryRecord
+from readme_mcp.serialization import JSONBytesResponse
+
+pytestmark = [pytest.mark.bench, pytest.mark.asyncio]
+
+ENTRIES = 1000
+REQUEST = DirectoryRequest(repo_url="https://github.com/bench/repo", dir="src")
+SHA = "0" * 40
+
+
+def _records() -> list[DirectoryRecord]:
+    return [
+        DirectoryRecord(
+            parent="src",
+            name=f"module_{i}.py",
+            sha=f"{i:040x}",
+            size=1000 + i,
+            type="file",
+            download_url=f"https://raw.githubusercontent.com/bench/repo/{SHA}/src/module_{i}.py",
+        )
+        for i in range(ENTRIES)
+    ]
+
+
+def render_models(items: list[DirectoryRecord]) -> bytes:
+    """Build response models, then validate and encode them as FastAPI does."""
+    _sort_directory(items, REQUEST.sort, REQUEST.order)
+    response = DirectoryResponse(
+        entries=[
+            DirectoryEntry(
+                name=item.name,
+                path=item.path,
+                sha=item.sha,
+                size=item.size,
+                type=item.type,
+                download_url=item.download_url,
+            )
+            for item in items
+        ],
+        total_count=len(items),
+        path=REQUEST.dir,
+    )
+    # response_model check of the returned value, then rendering
+    validated = DirectoryResponse.model_validate(response.model_dump())
+    return JSONResponse(validated.model_dump(mode="json")).body
+
+
+def render_fast(items: list[DirectoryRecord]) -> bytes:
+    """Build the page as a dict and encode it once."""
+    return JSONBytesResponse(_directory_page(REQUEST, SHA, items, 0)).body
+
+
+@pytest.mark.parametrize("path", ["models", "fast"])
+async def test_ls_page_rendering(bench, path):
+    """Benchmark rendering one full /ls page without the network"""
+    items = _records()
+    render = render_models if path == "models" else render_fast
+
+    async def call(i: int) -> None:
+        render(list(items))
+
+    result = await bench(f"render /ls {path}", call)
+
+    assert result["errors"] == 0
+    assert json.loads(render(list(items))) == json.loads(render_models(list(items)))
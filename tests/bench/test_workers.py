@@ -0,0 +1,80 @@
+"""Throughput of cached requests as worker processes are added."""
+
+import functools
+import multiprocessing
+import os
+import socket
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from readme_mcp import server
+from readme_mcp.main import app
+from readme_mcp.response_cache import ResponseCache
+
+from .harness import measure
+from .server import fake_backend
+
+pytestmark = pytest.mark.bench
+
+REPO_URL = "https://github.com/bench/repo"
+
+# Worker counts compared; set BENCH_WORKERS to the cores available
+WORKER_COUNTS = sorted({1, int(os.environ.get("BENCH_WORKERS", "2"))})
+
+
+async def _load(base_url: str, requests: int, concurrency: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+
+        async def call(i: int) -> None:
+            response = await client.post("/readme", json={"repo_url": REPO_URL})
+            response.raise_for_status()
+
+        return await measure("load", call, requests, concurrency)
+
+
+def _wait_healthy(base_url: str) -> None:
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            httpx.get(f"{base_url}/health").raise_for_status()
+            return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@pytest.mark.parametrize("workers", WORKER_COUNTS)
+def test_cached_readme_per_worker(bench_processes, fake_config, workers):
+    """Benchmark cached /readme from forked workers sharing one response cache"""
+    sock = socket.socket()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind(("127.0.0.1", 0))
+    base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    config = uvicorn.Config(app, log_level="warning", access_log=False)
+
+    # Workers inherit the fake backend and the shared cache segment
+    with fake_backend(fake_config, ResponseCache(shared=True)):
+        supervisor = multiprocessing.get_context("fork").Process(
+            target=server.serve, args=(config, workers, sock)
+        )
+        supervisor.start()
+    sock.close()
+    try:
+        _wait_healthy(base_url)
+        # Warm the cache once; every worker then serves it from shared memory
+        httpx.post(f"{base_url}/readme", json={"repo_url": REPO_URL})
+        result = bench_processes(
+            f"{workers} workers /readme",
+            functools.partial(_load, base_url),
+            workers,
+        )
+    finally:
+        supervisor.terminate()
+        supervisor.join(10)
+
+    result["rps_per_worker"] = round(result["throughput_rps"] / workers, 2)
+    assert result["errors"] == 0
@@ -0,0 +1,184 @@
+"""Shared fixtures: an in-memory fake of the GitHub REST API."""
+
+import base64
+import hashlib
+import io
+import tarfile
+from collections import Counter
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from readme_mcp import api
+from readme_mcp.github_client import GitHubClient
+from readme_mcp.response_cache import ResponseCache
+from readme_mcp.snapshot import SnapshotStore
+
+COMMIT_SHA = "c0ffee" + "0" * 34
+
+FAKE_FILES = {
+    "README.md": "# Fake Repo\n\nA repository used in tests.\n",
+    "pyproject.toml": '[project]\nname = "fake"\n',
+    "src/fake/__init__.py": '"""Fake package."""\n',
+    "src/fake/core.py": "def answer():\n    return 42\n",
+    "src/fake/util/helpers.py": "def helper():\n    pass\n",
+    "tests/test_core.py": "from fake.core import answer\n",
+    "tests/unit/test_helpers.py": "from fake.util.helpers import helper\n",
+    "docs/index.md": "# Docs\n",
+    "docs/big.bin": "x" * 5000,
+    "docs/blob.dat": "\0binary\0answer",
+}
+
+
+def blob_sha(content: str) -> str:
+    """Return the git blob SHA of ``content``."""
+    data = content.encode()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FakeGitHub:
+    """Serves a single fake repository over the GitHub REST API shapes."""
+
+    def __init__(self, files: dict[str, str], owner: str = "fake", repo: str = "repo"):
+        self.files = files
+        self.owner = owner
+        self.repo = repo
+        self.calls: Counter[str] = Counter()
+        # Report the recursive tree as truncated, like GitHub does for huge repos
+        self.truncated = False
+
+        dirs = set()
+        for path in files:
+            parts = path.split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                dirs.add("/".join(parts[:i]))
+        self.dirs = dirs
+
+    def tree_items(self) -> list[dict]:
+        items = [
+            {"path": d, "type": "tree", "sha": blob_sha(d), "mode": "040000"}
+            for d in self.dirs
+        ]
+        items += [
+            {
+                "path": p,
+                "type": "blob",
+                "sha": blob_sha(c),
+                "size": len(c.encode()),
+                "mode": "100644",
+            }
+            for p, c in self.files.items()
+        ]
+        return items
+
+    def content_item(self, path: str, with_content: bool = True) -> dict:
+        name = path.rsplit("/", 1)[-1]
+        if path in self.dirs:
+            return {
+                "name": name,
+                "path": path,
+                "sha": blob_sha(path),
+                "size": 0,
+                "type": "dir",
+                "download_url": None,
+            }
+        data = self.files[path].encode()
+        item = {
+            "name": name,
+            "path": path,
+            "sha": blob_sha(self.files[path]),
+            "size": len(data),
+            "type": "file",
+            "download_url": f"https://raw.githubusercontent.com/{self.owner}/{self.repo}/main/{path}",
+        }
+        if with_content:
+            item["content"] = base64.b64encode(data).decode()
+            item["encoding"] = "base64"
+        return item
+
+    def tarball(self) -> bytes:
+        buffer = io.BytesIO()
+        top = f"{self.owner}-{self.repo}-{COMMIT_SHA[:7]}"
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for path, content in self.files.items():
+                data = content.encode()
+                info = tarfile.TarInfo(f"{top}/{path}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        prefix = f"/repos/{self.owner}/{self.repo}"
+        path = request.url.path
+        if not path.startswith(prefix):
+            return httpx.Response(404, json={"message": "Not Found"})
+        path = path[len(prefix) :]
+
+        if path.startswith("/commits/"):
+            self.calls["commits"] += 1
+            # HEAD is the default branch, as on GitHub
+            if path[len("/commits/") :] not in ("main", "HEAD", COMMIT_SHA):
+                return httpx.Response(422, json={"message": "No commit found"})
+            return httpx.Response(200, text=COMMIT_SHA)
+
+        if path.startswith("/git/trees/"):
+            self.calls["trees"] += 1
+            return httpx.Response(
+                200,
+                json={
+                    "sha": "t" * 40,
+                    "tree": self.tree_items(),
+                    "truncated": self.truncated,
+                },
+            )
+
+        if path.startswith("/tarball/"):
+            self.calls["tarball"] += 1
+            return httpx.Response(200, content=self.tarball())
+
+        if path == "/readme":
+            self.calls["readme"] += 1
+            return httpx.Response(200, json=self.content_item("README.md"))
+
+        if path == "/contents" or path.startswith("/contents/"):
+            self.calls["contents"] += 1
+            target = path[len("/contents/") :]
+            if not target or target in self.dirs:
+                children = [
+                    p
+                    for p in sorted(set(self.files) | self.dirs)
+                    if (p.rsplit("/", 1)[0] if "/" in p else "") == target
+                ]
+                return httpx.Response(
+                    200,
+                    json=[self.content_item(p, with_content=False) for p in children],
+                )
+            if target in self.files:
+                return httpx.Response(200, json=self.content_item(target))
+
+        return httpx.Response(404, json={"message": "Not Found"})
+
+
+@pytest.fixture
+def fake_github_factory(tmp_path):
+    """Return a function pointing the API at a fake repository of given files."""
+    with ExitStack() as stack:
+
+        def use(files: dict[str, str]) -> FakeGitHub:
+            fake = FakeGitHub(files)
+            client = GitHubClient(transport=httpx.MockTransport(fake.handler))
+            snapshots = SnapshotStore(root=str(tmp_path / "snapshots"))
+            stack.enter_context(patch.object(api, "github_client", client))
+            stack.enter_context(patch.object(api, "snapshot_store", snapshots))
+            stack.enter_context(patch.object(api, "response_cache", ResponseCache()))
+            return fake
+
+        yield use
+
+
+@pytest.fixture
+def fake_github(fake_github_factory):
+    """Point the API's GitHub client at an in-memory fake repository."""
+    return fake_github_factory(FAKE_FILES)
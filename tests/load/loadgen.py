@@ -0,0 +1,282 @@
+"""Open-loop load generator replaying recorded traffic against README-MCP.
+
+Requests come from recorded sources and are replayed with a Zipfian key
+distribution, so a few hot repositories and files dominate, as they do in
+production:
+
+- VCR cassettes (``tests/fixtures/*.yaml``). The recorded GitHub API calls are
+  mapped back to the ``/readme`` and ``/file`` requests that caused them.
+- JSON-lines request logs, one ``{"path": "/file", "json": {...}}`` object per
+  line. ``"method"`` defaults to ``POST``.
+
+With no sources, a synthetic key set over the fake repository is used. Arrivals
+are a Poisson process at a fixed rate, independent of how fast responses come
+back (open loop). Latency is measured from each request's scheduled start, so
+server stalls are not hidden by a slowed-down client. Unless ``--base-url`` is
+given, the service runs in-process against the local fake GitHub
+(``tests/bench/fake_github.py``, configured with the ``BENCH_*`` variables).
+
+Usage:
+    uv run python -m tests.load.loadgen --rate 200 --duration 30 \\
+        [--source tests/fixtures/*.yaml] [--zipf 1.1] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import AsyncExitStack
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import yaml
+
+from tests.bench.fake_github import FakeGitHubConfig
+from tests.bench.harness import percentile
+from tests.bench.server import serve
+
+GITHUB_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/(readme|contents/(.+))$")
+CACHE_SAMPLE = re.compile(
+    r'^readme_mcp_cache_requests_total\{cache="([^"]+)",result="(hit|miss)"\} (\S+)$',
+    re.MULTILINE,
+)
+
+
+def request_from_github_uri(uri: str) -> dict | None:
+    """Map a recorded GitHub API URI to the service request that issues it."""
+    parsed = urlparse(uri)
+    match = GITHUB_PATH.match(parsed.path)
+    if match is None:
+        return None
+    owner, repo, kind, path = match.groups()
+    body = {
+        "repo_url": f"https://github.com/{owner}/{repo}",
+        "ref": parse_qs(parsed.query).get("ref", ["main"])[0],
+    }
+    if kind == "readme":
+        return {"method": "POST", "path": "/readme", "json": body}
+    return {"method": "POST", "path": "/file", "json": {**body, "path": path}}
+
+
+def load_cassette(path: str) -> list[dict]:
+    """Read service requests from a VCR cassette."""
+    with open(path) as f:
+        cassette = yaml.safe_load(f) or {}
+    requests = []
+    for interaction in cassette.get("interactions", []):
+        request = request_from_github_uri(interaction["request"]["uri"])
+        if request is not None:
+            requests.append(request)
+    return requests
+
+
+def load_log(path: str) -> list[dict]:
+    """Read service requests from a JSON-lines request log."""
+    requests = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                requests.append(
+                    {
+                        "method": entry.get("method", "POST"),
+                        "path": entry["path"],
+                        "json": entry.get("json"),
+                    }
+                )
+    return requests
+
+
+def synthetic_requests(config: FakeGitHubConfig, repos: int = 20) -> list[dict]:
+    """Requests spread over ``repos`` fake repositories and their files."""
+    requests = []
+    for i in range(repos):
+        repo_url = f"https://github.com/bench/repo{i}"
+        requests.append(
+            {"method": "POST", "path": "/readme", "json": {"repo_url": repo_url}}
+        )
+        requests.append(
+            {"method": "POST", "path": "/ls", "json": {"repo_url": repo_url}}
+        )
+        for path in config.file_paths[:10]:
+            requests.append(
+                {
+                    "method": "POST",
+                    "path": "/file",
+                    "json": {"repo_url": repo_url, "path": path},
+                }
+            )
+    return requests
+
+
+class ZipfSampler:
+    """Draw keys with probability proportional to ``1 / rank ** s``.
+
+    Keys are ranked by how often they occur in the source, most frequent first,
+    and ties keep their first-seen order.
+    """
+
+    def __init__(self, requests: Iterable[dict], s: float, seed: int | None = None):
+        counts: Counter[str] = Counter()
+        keys: dict[str, dict] = {}
+        for request in requests:
+            key = json.dumps(request, sort_keys=True)
+            counts[key] += 1
+            keys.setdefault(key, request)
+        if not keys:
+            raise ValueError("No replayable requests found")
+        ranked = sorted(keys, key=lambda k: -counts[k])
+        self.keys = [keys[k] for k in ranked]
+        total = 0.0
+        self._cumulative = []
+        for rank in range(1, len(self.keys) + 1):
+            total += 1 / rank**s
+            self._cumulative.append(total)
+        self._random = random.Random(seed)
+
+    def sample(self) -> dict:
+        point = self._random.random() * self._cumulative[-1]
+        return self.keys[bisect.bisect_left(self._cumulative, point)]
+
+
+async def _cache_counts(client: httpx.AsyncClient) -> dict[tuple[str, str], float]:
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return {}
+    return {
+        (cache, result): float(value)
+        for cache, result, value in CACHE_SAMPLE.findall(response.text)
+    }
+
+
+def _hit_ratios(before: dict, after: dict) -> dict[str, float | None]:
+    ratios = {}
+    for cache in sorted({cache for cache, _ in after}):
+        hits = after.get((cache, "hit"), 0) - before.get((cache, "hit"), 0)
+        misses = after.get((cache, "miss"), 0) - before.get((cache, "miss"), 0)
+        ratios[cache] = round(hits / (hits + misses), 4) if hits + misses else None
+    return ratios
+
+
+async def run_load(
+    base_url: str,
+    sampler: ZipfSampler,
+    rate: float,
+    duration: float,
+    seed: int | None = None,
+    timeout: float = 30.0,
+) -> dict:
+    """Send Poisson arrivals at ``rate`` per second for ``duration`` seconds.
+
+    Args:
+        base_url: Service base URL
+        sampler: Source of requests
+        rate: Mean arrivals per second
+        duration: Seconds to keep generating arrivals
+        seed: Seed for arrival times
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Report with latency percentiles (ms), error rates and cache hit ratios
+    """
+    arrivals = random.Random(seed)
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits
+    ) as client:
+        before = await _cache_counts(client)
+
+        async def fire(request: dict, scheduled: float) -> None:
+            try:
+                response = await client.request(
+                    request["method"], request["path"], json=request["json"]
+                )
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        tasks = []
+        start = time.perf_counter()
+        scheduled = start
+        while True:
+            scheduled += arrivals.expovariate(rate)
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(sampler.sample(), scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+        after = await _cache_counts(client)
+
+    latencies.sort()
+    total = len(latencies)
+    errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": total,
+        "distinct_keys": len(sampler.keys),
+        "target_rate": rate,
+        "achieved_rate": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": dict(statuses),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "p999": round(percentile(latencies, 99.9), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "cache_hit_ratio": _hit_ratios(before, after),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    config = FakeGitHubConfig.from_env()
+    requests: list[dict] = []
+    for source in args.source:
+        if source.endswith((".yaml", ".yml")):
+            requests.extend(load_cassette(source))
+        else:
+            requests.extend(load_log(source))
+    sampler = ZipfSampler(requests or synthetic_requests(config), args.zipf, args.seed)
+
+    async with AsyncExitStack() as stack:
+        base_url = args.base_url or await stack.enter_async_context(serve(config))
+        return await run_load(base_url, sampler, args.rate, args.duration, args.seed)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--source", nargs="*", default=[], help="cassettes or JSONL logs"
+    )
+    parser.add_argument("--rate", type=float, default=100.0, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--base-url", help="target a running service instead")
+    parser.add_argument("--output", help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,240 @@
+"""Tests for admission control of upstream calls."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from readme_mcp import api, metrics
+from readme_mcp.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    caller,
+    priority,
+)
+from readme_mcp.config import settings
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+@pytest.mark.asyncio
+async def test_waiters_admitted_in_order():
+    """Test queued calls get freed slots first come, first served"""
+    controller = AdmissionController(max_in_flight=1, max_queue=2)
+    order = []
+
+    async def call(name: str) -> None:
+        async with controller.slot():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(call("a"), call("b"), call("c"))
+
+    assert order == ["a", "b", "c"]
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_full_rejected():
+    """Test calls beyond the queue bound get 503 with Retry-After at once"""
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    before = metrics.ADMISSION_REJECTED.labels("interactive", "queue_full").value
+
+    async with controller.slot():
+        with pytest.raises(HTTPException) as exc_info:
+            async with controller.slot():
+                pass
+
+    assert exc_info.value.status_code == 503
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+    assert (
+        metrics.ADMISSION_REJECTED.labels("interactive", "queue_full").value
+        == before + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_deadline_expires_in_queue():
+    """Test a queued call is shed once its request's deadline passes"""
+    controller = AdmissionController(max_in_flight=1, max_queue=4)
+
+    with patch.object(settings, "admission_queue_timeout", 0.05):
+        async with controller.slot():
+            with pytest.raises(HTTPException) as exc_info:
+                async with controller.slot():
+                    pass
+
+    assert exc_info.value.status_code == 503
+    assert controller.queued == 0
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_expected_wait_rejects_early():
+    """Test a call that cannot be admitted before its deadline is not queued"""
+    controller = AdmissionController(max_in_flight=2, max_queue=100)
+    controller.in_flight = 2
+    controller.hold_time = 30.0
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller._acquire()
+
+    assert exc_info.value.headers["Retry-After"] == "15"
+    assert controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test a cancelled waiter neither keeps its place nor leaks a slot"""
+    controller = AdmissionController(max_in_flight=1, max_queue=4)
+
+    async with controller.slot():
+        waiter = asyncio.create_task(controller._acquire())
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert controller.queued == 0
+    assert controller.in_flight == 0
+
+
+def test_overloaded_endpoint_returns_503(fake_github):
+    """Test a saturated pod sheds requests with 503 and Retry-After"""
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    controller.in_flight = 1
+
+    with patch.object(api.github_client, "admission", controller):
+        response = client.post("/readme", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert fake_github.calls["commits"] == 0
+
+
+def test_cache_hit_skips_admission(fake_github):
+    """Test a repeat request is answered while the pod is saturated"""
+    body = {"repo_url": REPO_URL, "path": "src/fake/core.py"}
+    first = client.post("/file", json=body)
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    controller.in_flight = 1
+
+    with patch.object(api.github_client, "admission", controller):
+        again = client.post("/file", json=body)
+        # Resolved per caller, so another token's first request goes upstream
+        other = client.post("/file", json={**body, "token": "ghp_other"})
+
+    assert again.status_code == 200
+    assert again.content == first.content
+    assert other.status_code == 503
+    assert fake_github.calls["commits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lanes_keep_slots_for_interactive():
+    """Test bulk lanes are capped at their share, leaving room for interactive"""
+    controller = AdmissionController(max_in_flight=6, max_queue=10)
+
+    for _ in range(3):
+        await controller._acquire("batch")
+    assert controller.lane_limit("batch") == 3
+    assert controller.lane_limit("background") == 1
+
+    waiter = asyncio.create_task(controller._acquire("batch"))
+    await asyncio.sleep(0)
+    await controller._acquire("interactive")
+
+    assert controller.queued == 1
+    assert controller.lane_in_flight == {
+        "interactive": 1,
+        "batch": 3,
+        "background": 0,
+    }
+    controller._release("batch")
+    await waiter
+    assert controller.lane_in_flight["batch"] == 3
+
+
+async def _admission_order(controller: AdmissionController, lanes: list[str]):
+    order = []
+
+    async def call(lane: str) -> None:
+        with priority(lane):
+            async with controller.slot():
+                order.append(lane)
+                await asyncio.sleep(0)
+
+    async with controller.slot():
+        tasks = [asyncio.create_task(call(lane)) for lane in lanes]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_waiting_lanes_share_by_weight():
+    """Test freed slots go to waiting lanes in proportion to their weights"""
+    controller = AdmissionController(max_in_flight=1, max_queue=100)
+
+    order = await _admission_order(controller, ["batch"] * 6 + ["interactive"] * 12)
+
+    assert order[:9].count("interactive") == 6
+    assert order[:9].count("batch") == 3
+
+
+@pytest.mark.asyncio
+async def test_starved_waiters_served_first():
+    """Test a call waiting past the starvation bound jumps the weights"""
+    controller = AdmissionController(max_in_flight=1, max_queue=100)
+
+    with patch.object(settings, "priority_max_wait", 0.0):
+        order = await _admission_order(
+            controller, ["background", "interactive", "interactive"]
+        )
+
+    assert order == ["background", "interactive", "interactive"]
+
+
+def test_middleware_lanes():
+    """Test routes pick a lane, and X-Priority can only lower it"""
+
+    def lane(path: str, priority_header: str | None = None) -> str:
+        headers = [(b"x-priority", priority_header.encode())] if priority_header else []
+        return AdmissionMiddleware._lane(
+            {"type": "http", "path": path, "headers": headers}
+        )
+
+    assert lane("/readme") == "interactive"
+    assert lane("/tree") == "batch"
+    assert lane("/readme", "background") == "background"
+    assert lane("/tree", "interactive") == "batch"
+    assert lane("/ls", "urgent") == "interactive"
+
+
+@pytest.mark.asyncio
+async def test_callers_take_turns():
+    """Test a caller's queued burst doesn't hold up another caller in the lane"""
+    controller = AdmissionController(max_in_flight=1, max_queue=100)
+    order = []
+
+    async def call(identity: str) -> None:
+        with caller(identity):
+            async with controller.slot():
+                order.append(identity)
+                await asyncio.sleep(0)
+
+    async with controller.slot():
+        tasks = [asyncio.create_task(call("noisy")) for _ in range(5)]
+        tasks.append(asyncio.create_task(call("quiet")))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order[:2] == ["noisy", "quiet"]
+    assert controller.queued == 0
@@ -0,0 +1,97 @@
+"""Tests for response compression and cached compressed variants."""
+
+import gzip
+import pickle
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from readme_mcp import api, compression
+from readme_mcp.config import settings
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+@pytest.fixture
+def small_min_size():
+    with patch.object(settings, "compression_min_size", 64):
+        yield
+
+
+def test_negotiate():
+    """Test q-values, wildcards and unsupported codings"""
+    with patch.object(settings, "compression_encodings", "br,zstd,gzip"):
+        assert compression.negotiate("gzip, deflate") == "gzip"
+        assert compression.negotiate("gzip;q=0") is None
+        assert compression.negotiate("*") == compression.available()[0]
+        assert compression.negotiate("*, gzip;q=0") in ("br", "zstd", None)
+        assert compression.negotiate("identity") is None
+        assert compression.negotiate("deflate, GZIP;q=0.5") == "gzip"
+        assert compression.negotiate(None) is None
+    with patch.object(settings, "compression_encodings", ""):
+        assert compression.negotiate("gzip") is None
+
+
+def test_middleware_compresses_large_bodies(fake_github, small_min_size):
+    """Test uncached responses are gzipped above the size threshold only"""
+    response = client.post(
+        "/find",
+        json={"repo_url": REPO_URL, "pattern": "**/*.py"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json()["total_count"] > 0
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_identity_gets_vary_without_encoding(fake_github, small_min_size):
+    """Test clients not accepting compression get plain bodies"""
+    response = client.post(
+        "/ls", json={"repo_url": REPO_URL}, headers={"Accept-Encoding": "identity"}
+    )
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json()["total_count"] == 5
+
+
+def test_cached_variant_compressed_once(fake_github, small_min_size):
+    """Test a cached body is compressed on first use and reused afterwards"""
+    calls = []
+
+    def counting_gzip(data: bytes) -> bytes:
+        calls.append(len(data))
+        return gzip.compress(data, mtime=0)
+
+    with patch.dict(compression.CODECS, {"gzip": counting_gzip}):
+        for _ in range(3):
+            response = client.post(
+                "/ls", json={"repo_url": REPO_URL}, headers={"Accept-Encoding": "gzip"}
+            )
+            assert response.headers["content-encoding"] == "gzip"
+            assert response.json()["total_count"] == 5
+
+    assert len(calls) == 1
+    (cached,) = api.response_cache._cache.values()
+    assert set(cached.encodings) == {"gzip"}
+    assert api.response_cache.total_bytes == cached.weight()
+
+
+@pytest.mark.parametrize(
+    ("encoding", "module"), [("br", "brotli"), ("zstd", "zstandard")]
+)
+def test_optional_codecs(encoding, module):
+    """Test brotli and zstd are offered once their packages are installed"""
+    codec = pytest.importorskip(module)
+
+    assert compression.negotiate(encoding) == encoding
+    # Picklable, for the process offload executor
+    compress = pickle.loads(pickle.dumps(compression.CODECS[encoding]))
+    assert codec.decompress(compress(b"readme" * 100)) == b"readme" * 100
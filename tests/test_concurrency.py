@@ -0,0 +1,177 @@
+"""Tests for adaptive per-token upstream concurrency limits."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from readme_mcp import metrics
+from readme_mcp.concurrency import (
+    AdaptiveLimit,
+    AdaptiveLimiter,
+    is_secondary_limit,
+    token_id,
+)
+from readme_mcp.config import settings
+from readme_mcp.github_client import GitHubClient
+
+
+@pytest.fixture
+def limits():
+    with (
+        patch.object(settings, "upstream_limit_initial", 4),
+        patch.object(settings, "upstream_limit_min", 1),
+        patch.object(settings, "upstream_limit_max", 6),
+        patch.object(settings, "upstream_latency_tolerance", 2.0),
+    ):
+        yield
+
+
+def test_is_secondary_limit():
+    """Test secondary limits are told apart from primary quota exhaustion"""
+    secondary = httpx.Response(
+        403, json={"message": "You have exceeded a secondary rate limit."}
+    )
+    retry_after = httpx.Response(429, headers={"retry-after": "60"})
+    primary = httpx.Response(
+        403, headers={"x-ratelimit-remaining": "0", "retry-after": "60"}
+    )
+
+    assert is_secondary_limit(secondary)
+    assert is_secondary_limit(retry_after)
+    assert not is_secondary_limit(primary)
+    assert not is_secondary_limit(httpx.Response(403, json={"message": "Forbidden"}))
+    assert not is_secondary_limit(httpx.Response(200))
+
+
+def test_zero_limits_clamped():
+    """Test limits configured as 0 still admit one call and can grow"""
+    with (
+        patch.object(settings, "upstream_limit_initial", 0),
+        patch.object(settings, "upstream_limit_min", 0),
+    ):
+        limit = AdaptiveLimit("test-zero")
+    assert limit.max_in_flight == 1
+
+    limit.in_flight = 1
+    limit.record(0.01)
+    limit.record(0.01, throttled=True)
+    assert limit.max_in_flight == 1
+
+
+def test_additive_increase_multiplicative_decrease(limits):
+    """Test fast calls grow a busy limit and throttling halves it once per RTT"""
+    limit = AdaptiveLimit("test-aimd")
+    limit.in_flight = 4
+    for _ in range(8):
+        limit.record(0.01)
+    assert limit.max_in_flight == 5
+
+    limit.record(0.01, throttled=True)
+    limit.record(0.01, throttled=True)
+    assert limit.max_in_flight == 2
+    assert metrics.UPSTREAM_CONCURRENCY_LIMIT.labels("test-aimd").value == 2
+
+
+def test_latency_backoff_and_cap(limits):
+    """Test slow calls shrink the limit, which never leaves its bounds"""
+    limit = AdaptiveLimit("test-latency")
+    limit.record(0.01)
+    limit.record(0.5)
+    assert limit.limit == pytest.approx(3.6)
+    assert limit.baseline < 0.02
+
+    limit.in_flight = 6
+    for _ in range(100):
+        limit.record(0.01)
+    assert limit.max_in_flight == 6
+
+    for _ in range(10):
+        limit._last_decrease = 0.0
+        limit.record(0.01, throttled=True)
+    assert limit.max_in_flight == 1
+
+
+def test_idle_limit_does_not_grow(limits):
+    """Test a limit that isn't being used stays where it is"""
+    limit = AdaptiveLimit("test-idle")
+    limit.in_flight = 1
+    for _ in range(50):
+        limit.record(0.01)
+
+    assert limit.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_growth_admits_waiters(limits):
+    """Test a raised limit lets queued calls through without a release"""
+    limit = AdaptiveLimit("test-admit")
+    limit.max_in_flight = limit.in_flight = 1
+    limit.limit = 1.0
+
+    waiter = asyncio.create_task(limit._acquire())
+    await asyncio.sleep(0)
+    assert limit.queued == 1
+
+    limit.record(0.01)
+    await waiter
+    assert limit.in_flight == 2
+
+
+def test_limiter_keys_by_token_identity(limits):
+    """Test tokens get separate limits, labelled without the token itself"""
+    limiter = AdaptiveLimiter(max_tokens=2)
+    first = limiter.get("secret-a")
+
+    assert limiter.get("secret-a") is first
+    assert limiter.get("secret-b") is not first
+    assert first.name == token_id("secret-a")
+    assert "secret" not in first.name
+    assert limiter.get(None).name == "anonymous"
+    # The oldest idle identity was dropped to stay within max_tokens
+    assert len(limiter) == 2
+    assert (first.name,) not in metrics.UPSTREAM_CONCURRENCY_LIMIT._children
+
+
+@pytest.mark.asyncio
+async def test_client_backs_off_on_secondary_limit(limits):
+    """Test the client halves a token's limit when GitHub throttles it"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers["authorization"] == "token noisy":
+            return httpx.Response(403, headers={"retry-after": "30"})
+        return httpx.Response(200, text="a" * 40)
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(HTTPException):
+        await client.resolve_ref("o", "r", "main", "noisy")
+    await client.resolve_ref("o", "r", "main", "quiet")
+
+    assert client.limits.get("noisy").max_in_flight == 2
+    assert client.limits.get("quiet").max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_quota_reserved_for_higher_lanes(limits):
+    """Test lower lanes stop spending a token's quota below their reserve"""
+    limit = AdaptiveLimit("test-quota")
+    limit.track_quota(
+        httpx.Headers(
+            {
+                "x-ratelimit-limit": "5000",
+                "x-ratelimit-remaining": "1500",
+                "x-ratelimit-reset": str(int(time.time()) + 600),
+            }
+        )
+    )
+
+    await limit._acquire("interactive")
+    await limit._acquire("batch")
+    with pytest.raises(HTTPException) as exc_info:
+        await limit._acquire("background")
+
+    assert exc_info.value.status_code == 503
+    assert 590 <= int(exc_info.value.headers["Retry-After"]) <= 600
@@ -0,0 +1,236 @@
+"""Tests for request deadlines and cancellation on disconnect."""
+
+import asyncio
+import contextvars
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import mcp_server
+from readme_mcp import deadline, metrics
+from readme_mcp.cache import SingleFlight
+from readme_mcp.deadline import DeadlineMiddleware
+from readme_mcp.github_client import GitHubClient
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_timeout_capped_by_deadline():
+    """Test upstream timeouts shrink to the time left and fail once it's gone"""
+
+    def check() -> None:
+        assert deadline.timeout(5.0) == 5.0
+        deadline.limit(0.5)
+        assert 0 < deadline.timeout(5.0) <= 0.5
+        deadline.limit(10.0)
+        assert deadline.remaining() <= 0.5
+        deadline.limit(-1.0)
+        with pytest.raises(HTTPException) as exc_info:
+            deadline.timeout(5.0)
+        assert exc_info.value.status_code == 504
+
+    contextvars.copy_context().run(check)
+
+
+def test_parse_timeout():
+    """Test only positive, finite header values set a deadline"""
+    assert deadline.parse_timeout("2.5") == 2.5
+    assert deadline.parse_timeout(None) is None
+    for value in ("", "0", "-1", "inf", "nan", "soon"):
+        assert deadline.parse_timeout(value) is None
+
+
+def test_expired_header_skips_upstream(fake_github):
+    """Test a request out of time gets 504 without calling GitHub"""
+    before = metrics.DEADLINE_EXCEEDED._children[()].value
+
+    expired = client.post(
+        "/readme", json={"repo_url": REPO_URL}, headers={"X-Request-Timeout": "1e-9"}
+    )
+    assert expired.status_code == 504
+    assert fake_github.calls["commits"] == 0
+    assert metrics.DEADLINE_EXCEEDED._children[()].value == before + 1
+
+    ignored = client.post(
+        "/readme", json={"repo_url": REPO_URL}, headers={"X-Request-Timeout": "x"}
+    )
+    assert ignored.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_upstream_timeout():
+    """Test GitHub calls are sent with the request's remaining time as timeout"""
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"sha": "abc"})
+
+    github = GitHubClient(transport=httpx.MockTransport(handler))
+    await github.resolve_ref("o", "r", "main")
+    deadline.limit(1.0)
+    await github.resolve_ref("o", "r", "dev")
+
+    assert timeouts[0] == 5.0
+    assert 0 < timeouts[1] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_is_504():
+    """Test an upstream call timing out fails the request with 504"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    github = GitHubClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(HTTPException) as exc_info:
+        await github.resolve_ref("o", "r", "main")
+
+    assert exc_info.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_shared_call_outlives_one_waiter():
+    """Test a coalesced call keeps running while any waiter still needs it"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert not flight._inflight
+
+
+@pytest.mark.asyncio
+async def test_shared_call_cancelled_with_last_waiter():
+    """Test a coalesced call is cancelled once every waiter has gone"""
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def work() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for waiter in waiters:
+        waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert not flight._inflight
+
+
+@pytest.mark.asyncio
+async def test_caller_after_last_waiter_starts_new_call():
+    """Test a call made as the last waiter leaves isn't joined to the cancelled one"""
+    flight = SingleFlight()
+    calls = []
+
+    async def work() -> int:
+        calls.append(None)
+        await asyncio.sleep(0 if len(calls) > 1 else 10)
+        return len(calls)
+
+    first = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    # Same tick: the cancelled call's done callback hasn't run yet
+    assert await flight.do("k", work) == 2
+    await asyncio.sleep(0)
+    assert not flight._inflight
+
+
+@pytest.mark.asyncio
+async def test_waiter_deadline_does_not_bind_others():
+    """Test a waiter out of time gets 504 while the call finishes for others"""
+    flight = SingleFlight()
+
+    async def work() -> str:
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def hurried() -> str:
+        deadline.limit(0.01)
+        return await flight.do("k", work)
+
+    patient = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as exc_info:
+        await hurried()
+
+    assert exc_info.value.status_code == 504
+    assert await patient == "done"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_handler():
+    """Test the handler is cancelled when the client disconnects mid-request"""
+    cancelled = asyncio.Event()
+    disconnected = asyncio.Event()
+
+    async def slow_app(scope, receive, send) -> None:
+        await receive()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        raise AssertionError("nothing should be sent")
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": []}
+    before = metrics.REQUESTS_CANCELLED._children[()].value
+    middleware = asyncio.create_task(DeadlineMiddleware(slow_app)(scope, receive, send))
+    await asyncio.sleep(0.01)
+    disconnected.set()
+    await asyncio.wait_for(middleware, 1)
+
+    assert cancelled.is_set()
+    assert metrics.REQUESTS_CANCELLED._children[()].value == before + 1
+
+
+@pytest.mark.asyncio
+async def test_mcp_proxy_sends_timeout():
+    """Test the MCP tools tell the service how long they will wait"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("x-request-timeout"))
+        return httpx.Response(200, json={"content": "# Hi"})
+
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as http:
+        await mcp_server._post(http, "/readme", {"repo_url": REPO_URL})
+
+    assert seen == [str(mcp_server.REQUEST_TIMEOUT)]
@@ -0,0 +1,93 @@
+"""Tests for ETags and conditional requests."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import mcp_server
+from readme_mcp.main import app
+from readme_mcp.response_cache import etag_matches
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_readme_etag_is_blob_sha(fake_github):
+    """Test /readme revalidates with the header or the request field"""
+    first = client.post("/readme", json={"repo_url": REPO_URL})
+    etag = first.headers["etag"]
+    assert etag == f'"{fake_github.content_item("README.md")["sha"]}"'
+
+    by_header = client.post(
+        "/readme", json={"repo_url": REPO_URL}, headers={"If-None-Match": etag}
+    )
+    by_field = client.post(
+        "/readme", json={"repo_url": REPO_URL, "if_none_match": etag}
+    )
+    stale = client.post("/readme", json={"repo_url": REPO_URL, "if_none_match": '"x"'})
+
+    assert by_header.status_code == by_field.status_code == 304
+    assert by_header.content == b""
+    assert by_header.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert stale.json()["name"] == "README.md"
+
+
+def test_file_not_modified_on_first_fetch(fake_github):
+    """Test a matching ETag gets a 304 even when the body was not cached"""
+    etag = f'W/"{fake_github.content_item("src/fake/core.py")["sha"]}"'
+    response = client.post(
+        "/file",
+        json={"repo_url": REPO_URL, "path": "src/fake/core.py"},
+        headers={"If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert fake_github.calls["contents"] == 1
+
+
+def test_ls_etag_depends_on_listing(fake_github):
+    """Test listing ETags differ per page shape and revalidate"""
+    by_name = client.post("/ls", json={"repo_url": REPO_URL})
+    by_size = client.post("/ls", json={"repo_url": REPO_URL, "sort": "size"})
+    etag = by_name.headers["etag"]
+
+    again = client.post(
+        "/ls", json={"repo_url": REPO_URL}, headers={"If-None-Match": etag}
+    )
+
+    assert etag != by_size.headers["etag"]
+    assert again.status_code == 304
+
+
+def test_etag_matches():
+    """Test If-None-Match lists, wildcards and weak comparison"""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert not etag_matches('"ab"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+@pytest.mark.asyncio
+async def test_mcp_proxy_revalidates():
+    """Test the MCP tools reuse their last body when the service answers 304"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, json={"content": "# Hi"}, headers={"etag": '"v1"'})
+
+    transport = httpx.MockTransport(handler)
+    with patch.dict(mcp_server._etag_cache, clear=True):
+        async with httpx.AsyncClient(transport=transport) as http:
+            first = await mcp_server._post(http, "/readme", {"repo_url": REPO_URL})
+            second = await mcp_server._post(http, "/readme", {"repo_url": REPO_URL})
+
+    assert first == second == {"content": "# Hi"}
+    assert seen == [None, '"v1"']
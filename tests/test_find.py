@@ -0,0 +1,151 @@
+"""Tests for the /find filename search endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from readme_mcp.find import FUZZY_MAX_CANDIDATES, find_fuzzy, find_glob, load_index
+from readme_mcp.main import app
+from readme_mcp.tree import TreeSnapshot
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_find_glob_basename(fake_github):
+    """Test basename glob matches anywhere in the tree"""
+    response = client.post("/find", json={"repo_url": REPO_URL, "pattern": "*.py"})
+
+    assert response.status_code == 200
+    data = response.json()
+    paths = [m["path"] for m in data["matches"]]
+    assert paths == [
+        "src/fake/__init__.py",
+        "src/fake/core.py",
+        "src/fake/util/helpers.py",
+        "tests/test_core.py",
+        "tests/unit/test_helpers.py",
+    ]
+    assert data["total_count"] == 5
+    assert all(m["sha"] and m["size"] for m in data["matches"])
+    assert all(m["score"] is None for m in data["matches"])
+
+
+def test_find_glob_full_path(fake_github):
+    """Test full-path glob with recursive wildcard"""
+    response = client.post(
+        "/find", json={"repo_url": REPO_URL, "pattern": "tests/**/*.py"}
+    )
+
+    assert response.status_code == 200
+    paths = [m["path"] for m in response.json()["matches"]]
+    assert paths == ["tests/test_core.py", "tests/unit/test_helpers.py"]
+
+
+def test_find_exact_name(fake_github):
+    """Test literal filename lookup"""
+    response = client.post(
+        "/find", json={"repo_url": REPO_URL, "pattern": "pyproject.toml"}
+    )
+
+    assert response.status_code == 200
+    assert [m["path"] for m in response.json()["matches"]] == ["pyproject.toml"]
+
+
+def test_find_type_and_path_filters(fake_github):
+    """Test restricting matches to a directory and entry type"""
+    response = client.post(
+        "/find",
+        json={"repo_url": REPO_URL, "pattern": "*", "path": "src", "type": "dir"},
+    )
+
+    assert response.status_code == 200
+    paths = [m["path"] for m in response.json()["matches"]]
+    assert paths == ["src/fake", "src/fake/util"]
+
+
+def test_find_fuzzy_query(fake_github):
+    """Test fuzzy query ranks the closest filename first"""
+    response = client.post("/find", json={"repo_url": REPO_URL, "query": "helpr"})
+
+    assert response.status_code == 200
+    matches = response.json()["matches"]
+    assert matches[0]["path"] == "src/fake/util/helpers.py"
+    assert matches[0]["score"] > 0
+
+
+def test_find_limit(fake_github):
+    """Test limit caps matches but not the total count"""
+    response = client.post(
+        "/find", json={"repo_url": REPO_URL, "pattern": "*.py", "limit": 2}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["matches"]) == 2
+    assert data["total_count"] == 5
+
+
+def test_find_requires_pattern_or_query():
+    """Test exactly one of pattern or query is required"""
+    neither = client.post("/find", json={"repo_url": REPO_URL})
+    both = client.post(
+        "/find", json={"repo_url": REPO_URL, "pattern": "*.py", "query": "core"}
+    )
+
+    assert neither.status_code == 422
+    assert both.status_code == 422
+
+
+def test_find_invalid_pattern():
+    """Test glob patterns that can't compile are rejected"""
+    response = client.post("/find", json={"repo_url": REPO_URL, "pattern": "[z-a]"})
+
+    assert response.status_code == 422
+
+
+def test_find_large_tree():
+    """Test glob and fuzzy search over a 100k-entry snapshot"""
+    items = [
+        {
+            "path": f"pkg{i // 1000}/mod{i % 1000}/file{i}.py",
+            "type": "blob",
+            "sha": f"{i:040x}",
+            "size": i,
+        }
+        for i in range(100_000)
+    ]
+    items.append({"path": "pkg7/pyproject.toml", "type": "blob", "sha": "a" * 40})
+    snapshot = TreeSnapshot("c" * 40, items)
+
+    found = list(find_glob(snapshot, "pyproject.toml"))
+    assert [snapshot.paths[i] for i in found] == ["pkg7/pyproject.toml"]
+
+    found = list(find_glob(snapshot, "pkg42/**/file4200?.py"))
+    assert len(found) == 10
+
+    ranked, total = find_fuzzy(snapshot, "file99999.py", limit=5)
+    assert snapshot.paths[ranked[0][1]] == "pkg99/mod999/file99999.py"
+    assert len(ranked) == 5
+    assert total > FUZZY_MAX_CANDIDATES
+
+    # A broad query still ranks the best candidates first
+    ranked, total = find_fuzzy(snapshot, "file", limit=3)
+    assert total == 100_000
+    assert [snapshot.paths[i] for _, i in ranked][0] == "pkg0/mod0/file0.py"
+
+
+@pytest.mark.asyncio
+async def test_index_built_once_off_loop():
+    """Test concurrent first searches of a commit share one threaded index build"""
+    items = [
+        {"path": f"dir/file{i}.py", "type": "blob", "sha": "b" * 40} for i in range(100)
+    ]
+    snapshot = TreeSnapshot("d" * 40, items)
+
+    first, second = await asyncio.gather(load_index(snapshot), load_index(snapshot))
+
+    assert first is second
+    assert await load_index(snapshot) is first
@@ -0,0 +1,223 @@
+"""Tests for the /grep content search endpoint."""
+
+import asyncio
+import json
+import os
+import shutil
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from readme_mcp import api, grep, snapshot
+from readme_mcp.config import settings
+from readme_mcp.grep import GrepStats, chunk_paths, run_grep, search_files
+from readme_mcp.main import app
+from readme_mcp.snapshot import SnapshotStore
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_grep_literal(fake_github):
+    """Test literal search returns matches with line numbers"""
+    response = client.post("/grep", json={"repo_url": REPO_URL, "pattern": "answer"})
+
+    assert response.status_code == 200
+    data = response.json()
+    found = [(m["path"], m["line_number"]) for m in data["matches"]]
+    # docs/blob.dat also contains "answer" but is skipped as binary
+    assert found == [("src/fake/core.py", 1), ("tests/test_core.py", 1)]
+    assert data["total_count"] == 2
+    assert data["limit_reached"] is False
+    assert data["timed_out"] is False
+    assert fake_github.calls["tarball"] == 1
+
+
+def test_grep_regex_with_context(fake_github):
+    """Test regex search with surrounding context lines"""
+    response = client.post(
+        "/grep",
+        json={
+            "repo_url": REPO_URL,
+            "pattern": r"return \d+",
+            "regex": True,
+            "context": 1,
+        },
+    )
+
+    assert response.status_code == 200
+    [match] = response.json()["matches"]
+    assert match["path"] == "src/fake/core.py"
+    assert match["line_number"] == 2
+    assert match["before"] == ["def answer():"]
+    assert match["after"] == []
+
+
+def test_grep_case_insensitive_with_filters(fake_github):
+    """Test case-insensitive search limited by path and include globs"""
+    response = client.post(
+        "/grep",
+        json={
+            "repo_url": REPO_URL,
+            "pattern": "FAKE",
+            "case_sensitive": False,
+            "path": "src",
+            "include": ["*.py"],
+        },
+    )
+
+    assert response.status_code == 200
+    paths = {m["path"] for m in response.json()["matches"]}
+    assert paths == {"src/fake/__init__.py"}
+
+
+def test_grep_max_results(fake_github):
+    """Test result limit stops the search"""
+    response = client.post(
+        "/grep", json={"repo_url": REPO_URL, "pattern": "def", "max_results": 1}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_count"] == 1
+    assert data["limit_reached"] is True
+
+
+def test_grep_stream_ndjson(fake_github):
+    """Test NDJSON streaming ends with a summary line"""
+    response = client.post(
+        "/grep", json={"repo_url": REPO_URL, "pattern": "answer", "stream": True}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {m["path"] for m in lines[:-1]} == {"src/fake/core.py", "tests/test_core.py"}
+    assert lines[-1]["summary"]["total_count"] == 2
+
+
+def test_grep_snapshot_reused(fake_github):
+    """Test repeated searches reuse the downloaded snapshot"""
+    for pattern in ["answer", "helper", "fake"]:
+        response = client.post("/grep", json={"repo_url": REPO_URL, "pattern": pattern})
+        assert response.status_code == 200
+
+    assert fake_github.calls["tarball"] == 1
+    assert fake_github.calls["trees"] == 1
+
+
+def test_grep_invalid_regex():
+    """Test invalid regular expressions are rejected"""
+    response = client.post(
+        "/grep", json={"repo_url": REPO_URL, "pattern": "(", "regex": True}
+    )
+
+    assert response.status_code == 422
+
+
+def test_grep_invalid_glob():
+    """Test include and exclude globs that can't compile are rejected"""
+    for field in ("include", "exclude"):
+        response = client.post(
+            "/grep", json={"repo_url": REPO_URL, "pattern": "x", field: ["[z-a]"]}
+        )
+        assert response.status_code == 422
+
+
+def test_search_files_deadline(tmp_path):
+    """Test workers stop scanning once the deadline has passed"""
+    (tmp_path / "a.txt").write_text("needle\n")
+
+    matches, scanned = search_files(
+        str(tmp_path), ["a.txt"], "needle", False, True, 0, 10, deadline=0
+    )
+
+    assert matches == []
+    assert scanned == 0
+
+
+def test_chunk_paths():
+    """Test chunking respects file count and byte limits"""
+    chunks = chunk_paths(["a", "b", "c"], [3 * 1024 * 1024, 2 * 1024 * 1024, 1])
+
+    assert chunks == [["a"], ["b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_stuck_worker_replaced(tmp_path, monkeypatch):
+    """Test a catastrophic regex can't hold the pool from later searches"""
+    (tmp_path / "slow.txt").write_text("a" * 40 + "b\n")
+    (tmp_path / "ok.txt").write_text("hello\n")
+    grep.shutdown_executor()
+    monkeypatch.setattr(settings, "grep_workers", 1)
+    monkeypatch.setattr(grep, "KILL_GRACE", 0.1)
+    try:
+        stats = GrepStats()
+        slow = run_grep(
+            str(tmp_path),
+            ["slow.txt"],
+            [41],
+            "(a+)+$",
+            regex=True,
+            timeout=1.0,
+            stats=stats,
+        )
+        assert [m async for m in slow] == []
+        assert stats.timed_out
+
+        stuck = grep._retired[0]
+
+        stats = GrepStats()
+        found = run_grep(str(tmp_path), ["ok.txt"], [6], "hello", stats=stats)
+        assert [m["path"] async for m in found] == ["ok.txt"]
+        assert not stats.timed_out
+
+        await asyncio.sleep(0.3)
+        assert not grep._retired
+        assert not any(process.is_alive() for process in stuck)
+    finally:
+        grep.shutdown_executor()
+
+
+@pytest.mark.asyncio
+async def test_leased_snapshot_not_evicted(fake_github, tmp_path):
+    """Test a snapshot being searched outlives eviction until released"""
+    store = SnapshotStore(root=str(tmp_path / "snapshots"), max_bytes=1)
+    lease = await store.acquire(api.github_client, "fake", "repo", "a" * 40)
+
+    await store.get(api.github_client, "fake", "repo", "b" * 40)
+    assert os.path.isdir(lease.path)
+    assert len(store) == 2
+
+    lease.release()
+    lease.release()
+    assert not os.path.isdir(lease.path)
+    assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_snapshot_removed_off_loop(fake_github, tmp_path, monkeypatch):
+    """Test evicted snapshot directories are deleted in a worker thread"""
+    root = tmp_path / "snapshots"
+    store = SnapshotStore(root=str(root), max_bytes=1)
+    threads = []
+    rmtree = shutil.rmtree
+
+    def record(path, *args, **kwargs):
+        threads.append(threading.current_thread())
+        rmtree(path, *args, **kwargs)
+
+    old = await store.get(api.github_client, "fake", "repo", "a" * 40)
+    monkeypatch.setattr(snapshot.shutil, "rmtree", record)
+    new = await store.get(api.github_client, "fake", "repo", "b" * 40)
+    # Moved aside at once, so a rebuild of the commit can't be removed with it
+    assert not os.path.isdir(old)
+    for _ in range(100):
+        if os.listdir(root) == [os.path.basename(new)]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert os.listdir(root) == [os.path.basename(new)]
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,94 @@
+"""Tests for the replaying load generator."""
+
+import json
+from collections import Counter
+
+import pytest
+import yaml
+
+from tests.bench.fake_github import FakeGitHubConfig
+from tests.bench.server import serve
+from tests.load.loadgen import (
+    ZipfSampler,
+    load_cassette,
+    load_log,
+    request_from_github_uri,
+    run_load,
+    synthetic_requests,
+)
+
+
+def test_request_from_github_uri():
+    """Test recorded GitHub calls map back to service requests"""
+    readme = request_from_github_uri(
+        "https://api.github.com/repos/pallets/flask/readme?ref=3.0.x"
+    )
+    file = request_from_github_uri(
+        "https://api.github.com/repos/pallets/flask/contents/src/flask/app.py"
+    )
+
+    assert readme == {
+        "method": "POST",
+        "path": "/readme",
+        "json": {"repo_url": "https://github.com/pallets/flask", "ref": "3.0.x"},
+    }
+    assert file["path"] == "/file"
+    assert file["json"]["path"] == "src/flask/app.py"
+    assert file["json"]["ref"] == "main"
+    assert request_from_github_uri("https://api.github.com/rate_limit") is None
+
+
+def test_load_sources(tmp_path):
+    """Test cassettes and JSON-lines logs are both readable"""
+    cassette = tmp_path / "flask.yaml"
+    cassette.write_text(
+        yaml.safe_dump(
+            {
+                "interactions": [
+                    {"request": {"uri": "https://api.github.com/repos/a/b/readme"}},
+                    {"request": {"uri": "https://api.github.com/user"}},
+                ]
+            }
+        )
+    )
+    log = tmp_path / "requests.jsonl"
+    log.write_text(
+        json.dumps({"path": "/ls", "json": {"repo_url": "https://github.com/a/b"}})
+        + "\n\n"
+    )
+
+    assert [r["path"] for r in load_cassette(str(cassette))] == ["/readme"]
+    assert load_log(str(log)) == [
+        {
+            "method": "POST",
+            "path": "/ls",
+            "json": {"repo_url": "https://github.com/a/b"},
+        }
+    ]
+
+
+def test_zipf_sampler_skew():
+    """Test the most frequent key is drawn far more often than the tail"""
+    requests = [{"path": f"/k{i}"} for i in range(100)] + [{"path": "/k50"}] * 5
+    sampler = ZipfSampler(requests, s=1.1, seed=7)
+
+    counts = Counter(sampler.sample()["path"] for _ in range(20000))
+
+    assert sampler.keys[0] == {"path": "/k50"}
+    assert counts["/k50"] > 10 * counts["/k99"]
+    assert counts.most_common(1)[0][0] == "/k50"
+
+
+@pytest.mark.asyncio
+async def test_run_load_reports():
+    """Test a short open-loop run reports latency, errors and cache ratios"""
+    config = FakeGitHubConfig(dir_entries=20)
+    sampler = ZipfSampler(synthetic_requests(config, repos=3), s=1.1, seed=1)
+
+    async with serve(config) as base_url:
+        report = await run_load(base_url, sampler, rate=50, duration=0.5, seed=1)
+
+    assert report["requests"] > 0
+    assert report["error_rate"] == 0.0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+    assert "tree" in report["cache_hit_ratio"]
@@ -0,0 +1,50 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from readme_mcp import metrics
+from readme_mcp.loop_monitor import LoopMonitor
+
+
+def _blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_counted_and_logged(caplog):
+    """Test a blocking call is counted and its stack logged in debug mode"""
+    blocked = metrics.LOOP_BLOCKED._children[()].value
+    monitor = LoopMonitor(interval=0.02, threshold=0.05, debug=True)
+
+    with caplog.at_level(logging.WARNING, logger="readme_mcp.loop_monitor"):
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    assert metrics.LOOP_BLOCKED._children[()].value == blocked + 1
+    [record] = caplog.records
+    assert "Event loop blocked" in record.getMessage()
+    assert "_blocking_call" in record.getMessage()
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_reports_small_lag(caplog):
+    """Test an idle loop records lag samples without stalls"""
+    lag = metrics.LOOP_LAG._children[()]
+    samples = sum(lag.counts)
+    blocked = metrics.LOOP_BLOCKED._children[()].value
+    monitor = LoopMonitor(interval=0.01, threshold=0.2, debug=True)
+
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    assert sum(lag.counts) > samples
+    assert metrics.LOOP_BLOCKED._children[()].value == blocked
+    assert caplog.records == []
@@ -0,0 +1,108 @@
+"""Tests for /ls pagination, sorting and filtering."""
+
+from fastapi.testclient import TestClient
+
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_ls_root_from_tree(fake_github):
+    """Test root listing is served from the recursive tree"""
+    response = client.post("/ls", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 200
+    data = response.json()
+    names = [e["name"] for e in data["entries"]]
+    assert names == ["README.md", "docs", "pyproject.toml", "src", "tests"]
+    assert data["total_count"] == 5
+    assert data["next_cursor"] is None
+
+    readme = data["entries"][0]
+    assert readme["type"] == "file"
+    assert readme["download_url"].endswith("/README.md")
+    assert fake_github.calls["contents"] == 0
+
+
+def test_ls_type_filter_and_sort(fake_github):
+    """Test type filter and descending size sort"""
+    dirs = client.post("/ls", json={"repo_url": REPO_URL, "type": "dir"})
+    assert [e["name"] for e in dirs.json()["entries"]] == ["docs", "src", "tests"]
+
+    by_size = client.post(
+        "/ls",
+        json={"repo_url": REPO_URL, "dir": "docs", "sort": "size", "order": "desc"},
+    )
+    assert [e["name"] for e in by_size.json()["entries"]] == [
+        "big.bin",
+        "blob.dat",
+        "index.md",
+    ]
+
+    by_type = client.post("/ls", json={"repo_url": REPO_URL, "sort": "type"})
+    assert [e["type"] for e in by_type.json()["entries"]] == [
+        "dir",
+        "dir",
+        "dir",
+        "file",
+        "file",
+    ]
+
+
+def test_ls_pages_large_directory(fake_github_factory):
+    """Test paging through a directory larger than 1,000 entries"""
+    files = {f"big/file{i:05d}.txt": "x" for i in range(2500)}
+    fake = fake_github_factory(files)
+
+    names, cursor, pages = [], None, 0
+    while True:
+        body = {"repo_url": REPO_URL, "dir": "big", "limit": 1000}
+        if cursor:
+            body["cursor"] = cursor
+        response = client.post("/ls", json=body)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 2500
+        names += [e["name"] for e in data["entries"]]
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == sorted(files_name.split("/")[1] for files_name in files)
+    assert fake.calls["trees"] == 1
+
+
+def test_ls_cursor_mismatch(fake_github):
+    """Test a cursor cannot be reused with different listing parameters"""
+    first = client.post("/ls", json={"repo_url": REPO_URL, "limit": 2}).json()
+
+    response = client.post(
+        "/ls",
+        json={
+            "repo_url": REPO_URL,
+            "limit": 2,
+            "sort": "size",
+            "cursor": first["next_cursor"],
+        },
+    )
+    assert response.status_code == 400
+
+    garbage = client.post("/ls", json={"repo_url": REPO_URL, "cursor": "not-a-cursor"})
+    assert garbage.status_code == 400
+
+
+def test_null_ref_is_default_branch(fake_github):
+    """Test listings and searches with ref null read the default branch"""
+    body = {"repo_url": REPO_URL, "ref": None}
+    ls = client.post("/ls", json=body)
+    tree = client.post("/tree", json=body)
+    find = client.post("/find", json={**body, "pattern": "*.py"})
+    grep = client.post("/grep", json={**body, "pattern": "answer"})
+
+    assert [r.status_code for r in (ls, tree, find, grep)] == [200] * 4
+    assert ls.json()["entries"][0]["name"] == "README.md"
+    assert grep.json()["matches"]
@@ -0,0 +1,70 @@
+"""Tests for the /ls/batch multi-directory listing endpoint."""
+
+from fastapi.testclient import TestClient
+
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_batch_lists_many_directories(fake_github):
+    """Test several directories are listed from one tree fetch"""
+    response = client.post(
+        "/ls/batch", json={"repo_url": REPO_URL, "dirs": ["", "src", "tests", "docs"]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["results"]) == {"", "src", "tests", "docs"}
+    assert data["errors"] == {}
+    assert [e["name"] for e in data["results"]["src"]["entries"]] == ["fake"]
+    assert data["results"]["tests"]["total_count"] == 2
+    assert fake_github.calls["trees"] == 1
+    assert fake_github.calls["commits"] == 1
+    assert fake_github.calls["contents"] == 0
+
+
+def test_batch_reports_per_path_errors(fake_github):
+    """Test failing paths are reported without failing the batch"""
+    response = client.post(
+        "/ls/batch",
+        json={"repo_url": REPO_URL, "dirs": ["src", "missing", "README.md"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data["results"]) == ["src"]
+    assert data["errors"]["missing"]["status_code"] == 404
+    assert data["errors"]["README.md"]["status_code"] == 400
+
+
+def test_batch_truncated_tree_falls_back(fake_github):
+    """Test truncated trees fall back to one contents call per directory"""
+    fake_github.truncated = True
+
+    response = client.post(
+        "/ls/batch", json={"repo_url": REPO_URL, "dirs": ["src", "docs", "nope"]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [e["name"] for e in data["results"]["docs"]["entries"]] == [
+        "big.bin",
+        "blob.dat",
+        "index.md",
+    ]
+    assert data["errors"]["nope"]["status_code"] == 404
+    assert fake_github.calls["contents"] == 3
+
+
+def test_batch_deduplicates_and_validates_dirs():
+    """Test path traversal is rejected and an empty batch is invalid"""
+    traversal = client.post(
+        "/ls/batch", json={"repo_url": REPO_URL, "dirs": ["src", "../etc"]}
+    )
+    empty = client.post("/ls/batch", json={"repo_url": REPO_URL, "dirs": []})
+
+    assert traversal.status_code == 422
+    assert empty.status_code == 422
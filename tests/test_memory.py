@@ -0,0 +1,83 @@
+"""Tests for memory accounting and the /debug/memory endpoint."""
+
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+from readme_mcp import api, memory
+from readme_mcp.config import settings
+from readme_mcp.main import app
+from readme_mcp.memory import deep_sizeof, layer_usage
+from readme_mcp.response_cache import ResponseCache
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """Test objects reachable from several entries are counted once per layer"""
+    shared = "x" * 1000
+    first, second = {"a": shared}, {"b": shared}
+
+    usage = layer_usage([first, second])
+
+    assert deep_sizeof(first) > sys.getsizeof(shared)
+    assert usage["bytes"] < deep_sizeof(first) + deep_sizeof(second)
+    assert usage["entries"] == 2
+
+
+def test_debug_memory_reports_layers(fake_github, monkeypatch):
+    """Test the endpoint reports the tree cache after a listing"""
+    monkeypatch.setattr(settings, "profile_secret", "s3cret")
+    client.post("/ls", json={"repo_url": REPO_URL})
+
+    response = client.get("/debug/memory", headers={"X-Profile": "s3cret"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["caches"]["tree"]["entries"] >= 1
+    assert data["caches"]["tree"]["bytes_per_entry"] > 0
+    assert data["snapshots_on_disk"] == {"entries": 0, "bytes": 0}
+    assert data["process"]["rss_bytes"] > 0
+
+
+def test_debug_memory_reports_shared_response_cache(fake_github, monkeypatch):
+    """Test the response cache is reported when held in shared memory"""
+    monkeypatch.setattr(settings, "profile_secret", "s3cret")
+    monkeypatch.setattr(
+        api, "response_cache", ResponseCache(max_bytes=1 << 20, shared=True)
+    )
+    client.post("/readme", json={"repo_url": REPO_URL})
+
+    response = client.get("/debug/memory", headers={"X-Profile": "s3cret"})
+
+    layer = response.json()["caches"]["response"]
+    assert layer["entries"] == 1
+    assert layer["bytes"] == layer["bytes_per_entry"] > 0
+    assert layer["max_bytes"] == 1 << 20
+
+
+def test_debug_memory_requires_secret(monkeypatch):
+    """Test the endpoint is hidden without the admin secret"""
+    monkeypatch.setattr(settings, "profile_secret", "s3cret")
+
+    assert client.get("/debug/memory").status_code == 404
+    assert client.get("/debug/memory", headers={"X-Profile": "no"}).status_code == 404
+
+
+def test_debug_memory_walks_off_loop(monkeypatch):
+    """Test cache walking runs in a worker thread, not on the event loop"""
+    monkeypatch.setattr(settings, "profile_secret", "s3cret")
+    threads = []
+    report = memory.report
+
+    def record(*args):
+        threads.append(threading.current_thread())
+        return report(*args)
+
+    monkeypatch.setattr(memory, "report", record)
+    client.get("/debug/memory", headers={"X-Profile": "s3cret"})
+    # The default executor's threads, which asyncio.to_thread uses
+    assert threads and threads[0].name.startswith("asyncio")
@@ -0,0 +1,68 @@
+"""Tests for the in-process Prometheus metrics."""
+
+from fastapi.testclient import TestClient
+
+from readme_mcp.main import app
+from readme_mcp.metrics import Counter, Gauge, Histogram, Registry
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_registry_renders_exposition_format():
+    """Test counters, gauges and histograms render in Prometheus text format"""
+    registry = Registry()
+    hits = Counter("hits_total", "Hits.", ["layer"], registry=registry)
+    depth = Gauge("depth", "Depth.", registry=registry, function=lambda: 3)
+    latency = Histogram(
+        "latency_seconds", "Latency.", registry=registry, buckets=(0.1, 1.0)
+    )
+
+    hits.labels("tree").inc()
+    hits.labels("tree").inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{layer="tree"} 3' in text
+    assert "depth 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert depth.labelnames == ()
+
+
+def test_metrics_endpoint_reports_requests_and_upstream(fake_github):
+    """Test /metrics exposes route latency, upstream calls and cache results"""
+    for _ in range(2):
+        assert client.post("/tree", json={"repo_url": REPO_URL}).status_code == 200
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert (
+        'readme_mcp_request_duration_seconds_count{method="POST",route="/tree",status="200"}'
+        in text
+    )
+    assert 'readme_mcp_upstream_requests_total{endpoint="trees",status="200"}' in text
+    assert 'readme_mcp_upstream_duration_seconds_bucket{endpoint="commits"' in text
+    assert 'readme_mcp_cache_requests_total{cache="tree",result="hit"}' in text
+    assert 'readme_mcp_cache_hit_ratio{cache="tree"}' in text
+    assert "readme_mcp_requests_in_flight" in text
+    assert "readme_mcp_upstream_requests_in_flight 0" in text
+
+
+def test_unmatched_routes_share_one_label():
+    """Test unknown paths don't create per-path label values"""
+    client.get("/no-such-path-1")
+    client.get("/no-such-path-2")
+
+    text = client.get("/metrics").text
+    assert 'route="unmatched",status="404"' in text
+    assert "no-such-path" not in text
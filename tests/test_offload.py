@@ -0,0 +1,72 @@
+"""Tests for offloading CPU-heavy decoding from the event loop."""
+
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+from readme_mcp import metrics, offload
+from readme_mcp.config import settings
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def _count(histogram, task: str) -> int:
+    return sum(histogram.labels(task).counts)
+
+
+@pytest.fixture
+def offload_pool():
+    yield
+    offload.shutdown_executor()
+
+
+@pytest.mark.asyncio
+async def test_small_payload_inline(offload_pool):
+    """Test payloads under the threshold skip the pool"""
+    before = _count(metrics.OFFLOAD_DURATION, "base64")
+
+    text = await offload.run("base64", offload.decode_base64_text, "aGVsbG8=", size=8)
+
+    assert text == "hello"
+    assert _count(metrics.OFFLOAD_DURATION, "base64") == before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_large_payload_offloaded(offload_pool, monkeypatch, kind):
+    """Test payloads over the threshold run on the configured pool"""
+    monkeypatch.setattr(settings, "offload_executor", kind)
+    monkeypatch.setattr(settings, "offload_threshold", 1024)
+    encoded = base64.b64encode(b"x" * 4096).decode()
+    before = _count(metrics.OFFLOAD_DURATION, "base64")
+
+    text = await offload.run(
+        "base64", offload.decode_base64_text, encoded, size=len(encoded)
+    )
+
+    assert text == "x" * 4096
+    assert _count(metrics.OFFLOAD_DURATION, "base64") == before + 1
+    assert _count(metrics.OFFLOAD_WAIT, "base64") >= 1
+    assert metrics.OFFLOAD_PENDING._children[()].value == 0
+
+
+def test_endpoints_offload_decoding(fake_github, offload_pool, monkeypatch):
+    """Test file content and tree parsing go through the pool when large"""
+    monkeypatch.setattr(settings, "offload_threshold", 0)
+    before = _count(metrics.OFFLOAD_DURATION, "base64")
+    trees = _count(metrics.OFFLOAD_DURATION, "tree")
+
+    file_response = client.post(
+        "/file", json={"repo_url": REPO_URL, "path": "README.md"}
+    )
+    ls_response = client.post("/ls", json={"repo_url": REPO_URL})
+
+    assert file_response.status_code == 200
+    assert file_response.json()["content"].startswith("# Fake")
+    assert ls_response.status_code == 200
+    assert _count(metrics.OFFLOAD_DURATION, "base64") == before + 1
+    assert _count(metrics.OFFLOAD_DURATION, "tree") == trees + 1
@@ -0,0 +1,379 @@
+"""Tests for consistent-hash request routing across replicas."""
+
+import asyncio
+import socket
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from readme_mcp import admission, metrics, peers, ratelimit
+from readme_mcp.main import app
+from readme_mcp.peers import (
+    CALLER_HEADER,
+    PEER_HEADER,
+    HashRing,
+    PeerRouter,
+    PeerRoutingMiddleware,
+    repo_key,
+)
+from readme_mcp.ratelimit import RateLimiter
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+REPLICAS = [f"http://replica-{i}:8000" for i in range(3)]
+
+
+def _replica(name: str):
+    """Return an app answering with the replica that served the request."""
+
+    async def serve(scope, receive, send) -> None:
+        request = Request(scope, receive)
+        body = await request.json()
+        response = JSONResponse(
+            {
+                "served_by": name,
+                "repo_url": body["repo_url"],
+                "peer": request.headers.get(PEER_HEADER),
+            }
+        )
+        await response(scope, receive, send)
+
+    return serve
+
+
+class _Network(httpx.AsyncBaseTransport):
+    """Transport delivering peer requests to in-process replicas by URL."""
+
+    def __init__(self, down: frozenset[str] = frozenset()):
+        self.apps: dict[str, PeerRoutingMiddleware] = {}
+        self.down = down
+        self.calls: list[str] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = f"{request.url.scheme}://{request.url.netloc.decode()}"
+        self.calls.append(url)
+        if url in self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        transport = httpx.ASGITransport(self.apps[url])
+        return await transport.handle_async_request(request)
+
+
+def _cluster(down: frozenset[str] = frozenset()) -> _Network:
+    network = _Network(down)
+    for url in REPLICAS:
+        router = PeerRouter(peers=REPLICAS, self_url=url, dns="", transport=network)
+        network.apps[url] = PeerRoutingMiddleware(_replica(url), router)
+    return network
+
+
+def test_ring_moves_few_keys():
+    """Test keys spread evenly and a new node takes only its share of them"""
+    keys = [f"owner-{i}/repo" for i in range(3000)]
+    ring = HashRing(REPLICAS)
+    before = {key: ring.owner(key) for key in keys}
+
+    assert HashRing(reversed(REPLICAS)).owner(keys[0]) == before[keys[0]]
+    for node in REPLICAS:
+        assert 0.2 < list(before.values()).count(node) / len(keys) < 0.47
+
+    grown = HashRing([*REPLICAS, "http://replica-3:8000"])
+    moved = [key for key in keys if grown.owner(key) != before[key]]
+    assert 0.15 < len(moved) / len(keys) < 0.35
+    assert {grown.owner(key) for key in moved} == {"http://replica-3:8000"}
+    assert HashRing().owner(keys[0]) is None
+
+
+def test_repo_key():
+    """Test the repository is read from request bodies, case-insensitively"""
+    assert repo_key(b'{"repo_url": "https://github.com/Fake/Repo"}') == "fake/repo"
+    assert repo_key(b'{"repo_url": "https://gitlab.com/fake/repo"}') is None
+    assert repo_key(b'{"repo_url": 1}') is None
+    assert repo_key(b'["repo_url"]') is None
+    assert repo_key(b"not json") is None
+
+
+def test_router_disabled_alone():
+    """Test a replica without peers, or without knowing itself, serves locally"""
+    assert not PeerRouter(peers=[], self_url="http://a", dns="").enabled
+    assert not PeerRouter(peers=REPLICAS, self_url="", dns="").enabled
+    router = PeerRouter(peers=REPLICAS, self_url=REPLICAS[0] + "/", dns="")
+    assert router.enabled
+    assert len(router.ring) == 3
+
+
+@pytest.mark.asyncio
+async def test_requests_served_by_owner():
+    """Test every replica forwards a repository's requests to the same owner"""
+    network = _cluster()
+    ring = HashRing(REPLICAS)
+
+    for i in range(12):
+        repo_url = f"https://github.com/owner-{i}/repo"
+        owner = ring.owner(f"owner-{i}/repo")
+        for entry in REPLICAS:
+            transport = httpx.ASGITransport(network.apps[entry])
+            async with httpx.AsyncClient(transport=transport, base_url=entry) as http:
+                response = await http.post("/readme", json={"repo_url": repo_url})
+            assert response.status_code == 200
+            assert response.json()["served_by"] == owner
+            assert response.json()["repo_url"] == repo_url
+            # Forwarded once, by the replica first reached, and not again
+            assert response.json()["peer"] == (None if entry == owner else entry)
+    assert all(url in network.calls for url in REPLICAS)
+
+
+@pytest.mark.asyncio
+async def test_unreachable_owner_served_locally():
+    """Test a replica serves requests itself while their owner is unreachable"""
+    owner = REPLICAS[1]
+    network = _cluster(down=frozenset({owner}))
+    key = next(
+        f"owner-{i}/repo"
+        for i in range(100)
+        if HashRing(REPLICAS).owner(f"owner-{i}/repo") == owner
+    )
+    fallback = metrics.PEER_REQUESTS.labels("fallback").value
+    transport = httpx.ASGITransport(network.apps[REPLICAS[0]])
+
+    async with httpx.AsyncClient(transport=transport, base_url=REPLICAS[0]) as http:
+        for _ in range(3):
+            response = await http.post(
+                "/readme", json={"repo_url": f"https://github.com/{key}"}
+            )
+            assert response.json()["served_by"] == REPLICAS[0]
+
+    # Tried once, then skipped until it may be back
+    assert network.calls == [owner]
+    assert metrics.PEER_REQUESTS.labels("fallback").value == fallback + 1
+
+
+@pytest.mark.asyncio
+async def test_dns_refresh():
+    """Test replicas found in DNS are placed on the ring"""
+    router = PeerRouter(peers=[], self_url="http://10.0.0.1:8000", dns="peers:8000")
+    addresses = [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 8000)),
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", 8000)),
+        (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("fd00::3", 8000, 0, 0)),
+    ]
+
+    async def getaddrinfo(host, port, **kwargs):
+        assert (host, port) == ("peers", 8000)
+        return addresses
+
+    loop = asyncio.get_running_loop()
+    with patch.object(loop, "getaddrinfo", getaddrinfo):
+        await router.refresh()
+    assert router.ring.nodes == {
+        "http://10.0.0.1:8000",
+        "http://10.0.0.2:8000",
+        "http://[fd00::3]:8000",
+    }
+    assert metrics.PEERS._children[()].value == 3
+
+
+@pytest.mark.asyncio
+async def test_peer_verified_by_address():
+    """Test only requests from a replica's own address count as a peer's"""
+    router = PeerRouter(
+        peers=["http://10.0.0.2:8000", "http://replica-3:8000"],
+        self_url="http://10.0.0.1:8000",
+        dns="",
+    )
+
+    def scope(sender: str, address: str) -> dict:
+        headers = [(PEER_HEADER.encode(), sender.encode())]
+        return {"type": "http", "headers": headers, "client": (address, 4000)}
+
+    assert router.is_peer(scope("http://10.0.0.2:8000", "10.0.0.2"))
+    assert not router.is_peer(scope("http://10.0.0.2:8000", "10.0.0.9"))
+    assert not router.is_peer(scope("http://10.0.0.9:8000", "10.0.0.9"))
+    assert not router.is_peer(scope("http://10.0.0.1:8000", "10.0.0.1"))
+    assert not router.is_peer(scope("http://replica-3:8000", "10.0.0.3"))
+
+    async def getaddrinfo(host, port, **kwargs):
+        assert (host, port) == ("replica-3", 8000)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.3", 8000))]
+
+    loop = asyncio.get_running_loop()
+    with patch.object(loop, "getaddrinfo", getaddrinfo):
+        await router.refresh()
+    assert router.is_peer(scope("http://replica-3:8000", "10.0.0.3"))
+
+
+class _Body(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _foreign_router(transport: httpx.AsyncBaseTransport) -> PeerRouter:
+    """Return a router for the app whose peer owns the fake repository."""
+    for i in range(100):
+        router = PeerRouter(
+            peers=[f"http://peer-{i}"],
+            self_url="http://testserver",
+            dns="",
+            transport=transport,
+        )
+        if router.owner("fake/repo"):
+            return router
+    raise AssertionError("No peer owns the fake repository")
+
+
+def _addressed_router(
+    owned: bool, transport: httpx.AsyncBaseTransport | None = None
+) -> tuple[str, PeerRouter]:
+    """Return a peer's address and a router by which the app owns the fake
+    repository, or the peer does.
+    """
+    for i in range(100):
+        address = f"10.0.0.{i}"
+        router = PeerRouter(
+            peers=[f"http://{address}:8000"],
+            self_url="http://testserver",
+            dns="",
+            transport=transport,
+        )
+        if (router.owner("fake/repo") is None) == owned:
+            return address, router
+    raise AssertionError("No router found")
+
+
+def test_app_forwards_to_owner(fake_github, monkeypatch):
+    """Test the app passes a peer's response through without calling GitHub"""
+
+    def owner(request: httpx.Request) -> httpx.Response:
+        assert request.headers[PEER_HEADER] == "http://testserver"
+        assert request.headers[CALLER_HEADER] == "ip-testclient"
+        assert request.url.path == "/readme"
+        # Streamed, as from a real peer; content given directly counts as read
+        return httpx.Response(
+            200, headers={"etag": '"peer"'}, stream=_Body([b'{"from": ', b'"peer"}'])
+        )
+
+    monkeypatch.setattr(
+        peers, "peer_router", _foreign_router(httpx.MockTransport(owner))
+    )
+    response = client.post("/readme", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 200
+    assert response.json() == {"from": "peer"}
+    assert response.headers["etag"] == '"peer"'
+    assert fake_github.calls["readme"] == 0
+
+
+def test_app_falls_back_when_owner_down(fake_github, monkeypatch):
+    """Test the app serves a peer's repository itself when the peer is down"""
+
+    def owner(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    monkeypatch.setattr(
+        peers, "peer_router", _foreign_router(httpx.MockTransport(owner))
+    )
+    response = client.post("/readme", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 200
+    assert fake_github.calls["readme"] == 1
+
+
+def test_app_times_out_waiting_for_owner(fake_github, monkeypatch):
+    """Test an owner slow to answer gets 504, not a repeat of its work"""
+
+    def owner(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("Timed out", request=request)
+
+    router = _foreign_router(httpx.MockTransport(owner))
+    monkeypatch.setattr(peers, "peer_router", router)
+    timeouts = metrics.PEER_REQUESTS.labels("timeout").value
+    response = client.post("/readme", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Peer did not respond in time"}
+    assert fake_github.calls["readme"] == 0
+    assert metrics.PEER_REQUESTS.labels("timeout").value == timeouts + 1
+    # Still considered up
+    assert router.owner("fake/repo")
+
+
+def test_app_expired_deadline_not_forwarded(fake_github, monkeypatch):
+    """Test a request out of time gets 504 instead of being forwarded"""
+    forwarded = []
+    monkeypatch.setattr(
+        peers, "peer_router", _foreign_router(httpx.MockTransport(forwarded.append))
+    )
+    response = client.post(
+        "/readme", json={"repo_url": REPO_URL}, headers={"X-Request-Timeout": "1e-9"}
+    )
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+    assert forwarded == []
+
+
+def test_peer_requests_not_limited_again(fake_github, monkeypatch):
+    """Test a peer's requests keep their caller and aren't rate limited again"""
+    address, router = _addressed_router(owned=True)
+    peer = f"http://{address}:8000"
+    monkeypatch.setattr(peers, "peer_router", router)
+    monkeypatch.setattr(ratelimit, "rate_limiter", RateLimiter(rate=0.01, burst=1))
+    callers = []
+    caller = admission.caller
+
+    @contextmanager
+    def record(identity: str):
+        callers.append(identity)
+        with caller(identity):
+            yield
+
+    monkeypatch.setattr(admission, "caller", record)
+    body = {"repo_url": REPO_URL}
+    from_peer = TestClient(app, client=(address, 40000))
+
+    for i in range(3):
+        headers = {PEER_HEADER: peer, CALLER_HEADER: f"ip-203.0.113.{i}"}
+        assert from_peer.post("/readme", json=body, headers=headers).status_code == 200
+    assert callers == [f"ip-203.0.113.{i}" for i in range(3)]
+
+    # The same headers from anywhere else are a client's own
+    headers = {PEER_HEADER: peer, CALLER_HEADER: "ip-203.0.113.0"}
+    spoofed = [client.post("/readme", json=body, headers=headers) for _ in range(2)]
+    assert [response.status_code for response in spoofed] == [200, 429]
+    assert callers[3:] == ["ip-testclient"]
+
+
+def test_app_routes_requests_claiming_to_be_forwarded(fake_github, monkeypatch):
+    """Test a client sending the peer header is routed; only a peer is not"""
+    forwarded = []
+
+    def owner(request: httpx.Request) -> httpx.Response:
+        forwarded.append(request)
+        return httpx.Response(200, stream=_Body([b'{"from": "peer"}']))
+
+    address, router = _addressed_router(
+        owned=False, transport=httpx.MockTransport(owner)
+    )
+    monkeypatch.setattr(peers, "peer_router", router)
+    body = {"repo_url": REPO_URL}
+    headers = {PEER_HEADER: f"http://{address}:8000"}
+
+    claimed = client.post("/readme", json=body, headers=headers)
+    assert claimed.json() == {"from": "peer"}
+    assert len(forwarded) == 1
+
+    from_peer = TestClient(app, client=(address, 4000))
+    served = from_peer.post("/readme", json=body, headers=headers)
+    assert served.status_code == 200
+    assert len(forwarded) == 1
+    assert fake_github.calls["readme"] == 1
@@ -0,0 +1,76 @@
+"""Tests for on-demand request profiling."""
+
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from readme_mcp import profiling
+from readme_mcp.config import settings
+from readme_mcp.main import app
+
+client = TestClient(profiling.ProfilingMiddleware(app))
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+@pytest.fixture
+def profile_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profile_secret", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    return tmp_path
+
+
+def test_profile_with_secret(fake_github, profile_settings):
+    """Test an authorized request stores a pstats profile of the handlers"""
+    response = client.post(
+        "/file",
+        json={"repo_url": REPO_URL, "path": "README.md"},
+        headers={"X-Profile": "s3cret"},
+    )
+
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    stats = pstats.Stats(str(profile_settings / f"{profile_id}.pstats"))
+    functions = {name for _, _, name in stats.stats}
+    assert {"get_file", "_get"} <= functions
+
+    download = client.get(
+        f"/debug/profile/{profile_id}", headers={"X-Profile": "s3cret"}
+    )
+    assert download.status_code == 200
+    assert download.content == (profile_settings / f"{profile_id}.pstats").read_bytes()
+
+
+def test_profile_requires_secret(fake_github, profile_settings):
+    """Test requests without the right secret are not profiled"""
+    for headers in [{}, {"X-Profile": "wrong"}]:
+        response = client.post("/readme", json={"repo_url": REPO_URL}, headers=headers)
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    assert list(profile_settings.iterdir()) == []
+
+
+def test_profile_download_requires_secret(profile_settings):
+    """Test stored profiles cannot be fetched without the secret"""
+    (profile_settings / "abc123.pstats").write_bytes(b"data")
+
+    response = client.get("/debug/profile/abc123")
+
+    assert response.status_code == 404
+
+
+def test_profile_retention(profile_settings, monkeypatch):
+    """Test old artifacts are pruned beyond the configured count"""
+    monkeypatch.setattr(settings, "profile_max_files", 2)
+    for _ in range(4):
+        response = client.get("/health", headers={"X-Profile": "s3cret"})
+        assert response.status_code == 200
+
+    assert len(list(profile_settings.glob("*.pstats"))) == 2
+
+
+def test_disabled_by_default():
+    """Test profiling is off without a secret or sample rate"""
+    assert not profiling.enabled()
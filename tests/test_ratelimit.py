@@ -0,0 +1,114 @@
+"""Tests for per-caller inbound rate limiting."""
+
+import sys
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from readme_mcp import ratelimit
+from readme_mcp.config import settings
+from readme_mcp.main import app
+from readme_mcp.ratelimit import RateLimiter, caller_id
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_bucket_allows_burst_then_rate():
+    """Test a full bucket allows a burst, then one request per interval"""
+    limiter = RateLimiter(rate=2.0, burst=3)
+
+    assert [limiter.acquire("a", now=100.0) for _ in range(3)] == [0.0] * 3
+    assert limiter.acquire("a", now=100.0) == 0.5
+    assert limiter.acquire("a", now=100.25) == 0.25
+    assert limiter.acquire("a", now=100.5) == 0.0
+    assert limiter.acquire("b", now=100.5) == 0.0
+
+
+def test_all_buckets_or_none():
+    """Test a request takes a token from every bucket only if all have one"""
+    limiter = RateLimiter(rate=1.0, burst=1)
+    limiter.acquire("ip", now=0.0)
+
+    assert limiter.acquire("token-a", "ip", now=0.0) == 1.0
+    assert limiter.acquire("token-a", now=0.0) == 0.0
+    assert limiter.acquire("token-b", "ip", now=1.0) == 0.0
+    assert limiter.acquire("ip", "ip", now=2.0) == 0.0
+
+
+def test_refused_requests_do_not_drain():
+    """Test requests over quota don't push the next token further away"""
+    limiter = RateLimiter(rate=0.5, burst=1)
+    limiter.acquire("a", now=0.0)
+
+    for _ in range(10):
+        assert limiter.acquire("a", now=1.0) == 1.0
+    assert limiter.acquire("a", now=2.0) == 0.0
+
+
+def test_compact_at_many_callers():
+    """Test 100k callers cost little and refilled buckets are swept out"""
+    limiter = RateLimiter(rate=1.0, burst=5)
+    for i in range(100_000):
+        limiter.acquire(f"ip-10.{i >> 16}.{(i >> 8) & 255}.{i & 255}", now=0.0)
+
+    table = limiter._full_at
+    size = sys.getsizeof(table) + sum(
+        sys.getsizeof(key) + sys.getsizeof(value) for key, value in table.items()
+    )
+    assert size / len(table) < 200
+
+    # Everyone's bucket is full again, so the next sweep drops them all
+    limiter.acquire("late", now=10.0)
+    limiter._sweep(now=10.0)
+    assert len(limiter) == 1
+
+
+def test_caller_identity():
+    """Test callers are told apart by API key, then token, then address"""
+
+    def scope(headers: dict | None = None) -> dict:
+        raw = [(k.encode(), v.encode()) for k, v in (headers or {}).items()]
+        return {"type": "http", "headers": raw, "client": ("10.0.0.1", 1234)}
+
+    body = b'{"repo_url": "x", "token": "ghp_secret"}'
+    by_key = caller_id(scope({"x-api-key": "k1"}), body)
+    by_token = caller_id(scope(), body)
+
+    assert by_key.startswith("key-") and "k1" not in by_key
+    assert by_token.startswith("token-") and "secret" not in by_token
+    assert caller_id(scope(), b'{"token": null}') == "ip-10.0.0.1"
+    assert caller_id(scope(), b'{"token"') == "ip-10.0.0.1"
+
+    forwarded = scope({"x-forwarded-for": "203.0.113.9, 10.0.0.2"})
+    assert caller_id(forwarded) == "ip-10.0.0.1"
+    with patch.object(settings, "rate_limit_trust_forwarded", True):
+        assert caller_id(forwarded) == "ip-203.0.113.9"
+
+
+def test_endpoint_returns_429(fake_github):
+    """Test a caller over quota gets 429 with Retry-After; others don't"""
+    with patch.object(ratelimit, "rate_limiter", RateLimiter(rate=0.01, burst=2)):
+        statuses = [
+            client.post("/readme", json={"repo_url": REPO_URL}).status_code
+            for _ in range(2)
+        ]
+        refused = client.post("/readme", json={"repo_url": REPO_URL})
+        # A new token does not get the same address a fresh bucket
+        token = client.post("/readme", json={"repo_url": REPO_URL, "token": "t"})
+        with patch.object(settings, "rate_limit_trust_forwarded", True):
+            other = client.post(
+                "/readme",
+                json={"repo_url": REPO_URL},
+                headers={"x-forwarded-for": "203.0.113.9"},
+            )
+        health = client.get("/health")
+
+    assert statuses == [200, 200]
+    assert refused.status_code == 429
+    assert refused.headers["retry-after"] == "100"
+    assert refused.json() == {"detail": "Rate limit exceeded"}
+    assert token.status_code == 429
+    assert other.status_code == 200
+    assert health.status_code == 200
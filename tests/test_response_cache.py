@@ -0,0 +1,106 @@
+"""Tests for the encoded response body cache."""
+
+from fastapi.testclient import TestClient
+
+from readme_mcp import api
+from readme_mcp.cache import LRUCache
+from readme_mcp.config import settings
+from readme_mcp.main import app
+from readme_mcp.response_cache import ResponseCache
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_repeat_file_served_from_cache(fake_github):
+    """Test a repeated /file request reuses the encoded body"""
+    body = {"repo_url": REPO_URL, "path": "src/fake/core.py"}
+    first = client.post("/file", json=body)
+    second = client.post("/file", json=body)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first.json()["content"] == "def answer():\n    return 42\n"
+    assert fake_github.calls["contents"] == 1
+    # The caller's reference resolution is reused too
+    assert fake_github.calls["commits"] == 1
+
+
+def test_ref_resolution_expires(fake_github, monkeypatch):
+    """Test a branch is resolved again once its resolution expires"""
+    body = {"repo_url": REPO_URL, "path": "src/fake/core.py"}
+    monkeypatch.setattr(settings, "ref_cache_ttl", 0)
+    client.post("/file", json=body)
+    client.post("/file", json=body)
+
+    assert fake_github.calls["commits"] == 2
+    assert fake_github.calls["contents"] == 1
+
+
+def test_null_ref_is_default_branch(fake_github):
+    """Test requests with ref null are served from the default branch"""
+    readme = client.post("/readme", json={"repo_url": REPO_URL, "ref": None})
+    file = client.post(
+        "/file", json={"repo_url": REPO_URL, "path": "src/fake/core.py", "ref": None}
+    )
+
+    assert readme.status_code == file.status_code == 200
+    assert file.json()["content"] == "def answer():\n    return 42\n"
+    # Resolved once, as HEAD
+    assert fake_github.calls["commits"] == 1
+
+
+def test_ls_pages_cached_separately(fake_github):
+    """Test listing parameters are part of the cache key"""
+    by_name = client.post("/ls", json={"repo_url": REPO_URL})
+    by_type = client.post("/ls", json={"repo_url": REPO_URL, "sort": "type"})
+    again = client.post("/ls", json={"repo_url": REPO_URL})
+
+    assert by_name.json()["entries"][0]["name"] == "README.md"
+    assert by_type.json()["entries"][0]["name"] == "docs"
+    assert again.content == by_name.content
+    assert len(api.response_cache) == 2
+
+
+def test_authenticated_and_anonymous_not_shared(fake_github):
+    """Test bodies cached for token holders are not served anonymously"""
+    client.post("/readme", json={"repo_url": REPO_URL, "token": "secret"})
+    client.post("/readme", json={"repo_url": REPO_URL})
+    client.post("/readme", json={"repo_url": REPO_URL, "token": "other"})
+
+    assert fake_github.calls["readme"] == 2
+    assert len(api.response_cache) == 2
+
+
+def test_response_cache_byte_budget():
+    """Test the cache evicts the oldest bodies to stay within its budget"""
+    cache = ResponseCache(max_bytes=10, max_entries=100)
+    for i in range(4):
+        cache.put(("k", i), b"abcd")
+    cache.put(("big",), b"x" * 11)
+
+    assert cache.total_bytes == 8
+    assert cache.get(("k", 0)) is None
+    assert cache.get(("k", 3)).body == b"abcd"
+    assert cache.get(("big",)) is None
+
+
+def test_response_cache_disabled():
+    """Test a zero byte budget disables caching"""
+    cache = ResponseCache(max_bytes=0)
+    cache.put(("k",), b"body")
+
+    assert not cache.enabled
+    assert cache.get(("k",)) is None
+
+
+def test_lru_cache_replacing_value_updates_weight():
+    """Test re-setting a key replaces its weight instead of adding to it"""
+    cache = LRUCache(10, max_bytes=100, weigh=len)
+    cache.set("a", b"12345")
+    cache.set("a", b"12")
+
+    assert cache.total_bytes == 2
+    cache.clear()
+    assert cache.total_bytes == 0
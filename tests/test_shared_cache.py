@@ -0,0 +1,94 @@
+"""Tests for the response cache shared between worker processes."""
+
+import multiprocessing
+
+from fastapi.testclient import TestClient
+
+from readme_mcp import api
+from readme_mcp.main import app
+from readme_mcp.response_cache import CachedResponse, ResponseCache
+from readme_mcp.shared_cache import SharedCache
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def _in_child(target, *args) -> int:
+    process = multiprocessing.get_context("fork").Process(target=target, args=args)
+    process.start()
+    process.join(10)
+    return process.exitcode
+
+
+def test_get_set():
+    """Test values round-trip and keys are told apart"""
+    cache = SharedCache(max_bytes=4096, slots=16)
+
+    cache.set(("ls", "o", "r", 1), b"one")
+    cache.set(("ls", "o", "r", "1"), b"other")
+    cache.set(("ls", "o", "r", 1), b"replaced")
+
+    assert cache.get(("ls", "o", "r", 1)) == b"replaced"
+    assert cache.get(("ls", "o", "r", "1")) == b"other"
+    assert cache.get(("ls", "o", "r", 2)) is None
+    assert len(cache) == 2
+
+
+def test_ring_overwrites_oldest():
+    """Test a full ring drops its oldest values first and stays in budget"""
+    cache = SharedCache(max_bytes=1000, slots=64)
+
+    for i in range(30):
+        cache.set(i, bytes([i]) * 100)
+
+    assert cache.get(0) is None
+    assert cache.get(29) == bytes([29]) * 100
+    assert 0 < cache.total_bytes <= 1000
+    cache.set("huge", b"x" * 1000)
+    assert "huge" not in cache
+
+
+def test_shared_across_fork():
+    """Test forked processes see each other's entries and clears"""
+    cache = SharedCache(max_bytes=4096, slots=16)
+    cache.set("parent", b"p")
+
+    def child() -> None:
+        assert cache.get("parent") == b"p"
+        cache.set("child", b"c")
+
+    assert _in_child(child) == 0
+    assert cache.get("child") == b"c"
+
+    assert _in_child(cache.clear) == 0
+    assert cache.get("parent") is None
+    assert len(cache) == 0
+
+
+def test_packed_response_round_trip():
+    """Test cache entries keep their ETag and compressed variants when packed"""
+    cached = CachedResponse(b'{"a": 1}', '"sha"', {"gzip": b"\x1f\x8b..."})
+
+    unpacked = CachedResponse.unpack(cached.pack())
+
+    assert unpacked.body == cached.body
+    assert unpacked.etag == cached.etag
+    assert unpacked.encodings == cached.encodings
+    assert CachedResponse.unpack(CachedResponse(b"{}").pack()).etag is None
+
+
+def test_endpoint_served_from_shared_cache(fake_github, monkeypatch):
+    """Test a body cached by one worker is served by another without rendering"""
+    shared = ResponseCache(shared=True)
+    monkeypatch.setattr(api, "response_cache", shared)
+    first = client.post("/readme", json={"repo_url": REPO_URL})
+
+    def child() -> None:
+        before = fake_github.calls["readme"]
+        response = client.post("/readme", json={"repo_url": REPO_URL})
+        assert response.content == first.content
+        assert fake_github.calls["readme"] == before
+
+    assert _in_child(child) == 0
+    assert len(shared) == 1
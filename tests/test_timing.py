@@ -0,0 +1,56 @@
+"""Tests for Server-Timing headers and the JSON access log."""
+
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from readme_mcp.config import settings
+from readme_mcp.main import app
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def _phases(header: str) -> dict[str, float]:
+    phases = {}
+    for part in header.split(", "):
+        name, _, duration = part.partition(";dur=")
+        phases[name] = float(duration)
+    return phases
+
+
+def test_server_timing_phases(fake_github):
+    """Test file requests report queue, upstream, decode and serialize phases"""
+    response = client.post("/file", json={"repo_url": REPO_URL, "path": "README.md"})
+
+    assert response.status_code == 200
+    phases = _phases(response.headers["server-timing"])
+    for name in ["queue", "parse", "handler", "upstream", "decode", "encode"]:
+        assert name in phases
+    assert "serialize" in phases
+    assert phases["upstream"] <= phases["handler"] <= phases["app"]
+
+
+def test_access_log_line(fake_github, caplog):
+    """Test each sampled request logs one JSON line with its phases"""
+    with caplog.at_level(logging.INFO, logger="readme_mcp.access"):
+        client.post("/ls", json={"repo_url": REPO_URL})
+
+    [record] = [r for r in caplog.records if r.name == "readme_mcp.access"]
+    entry = json.loads(record.getMessage())
+    assert entry["route"] == "/ls"
+    assert entry["status"] == 200
+    assert entry["phases_ms"]["upstream"] > 0
+    assert entry["duration_ms"] >= entry["phases_ms"]["handler"]
+
+
+def test_unsampled_requests_not_timed(fake_github, monkeypatch):
+    """Test a zero sample rate disables the header and phase recording"""
+    monkeypatch.setattr(settings, "timing_sample_rate", 0.0)
+
+    response = client.post("/readme", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
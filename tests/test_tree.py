@@ -0,0 +1,177 @@
+"""Tests for the recursive /tree endpoint."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from readme_mcp.main import app
+from readme_mcp.tree import ShaTable, TreeSnapshot, match_glob
+
+client = TestClient(app)
+
+REPO_URL = "https://github.com/fake/repo"
+
+
+def test_tree_root_full(fake_github):
+    """Test full recursive listing of the repository root"""
+    response = client.post("/tree", json={"repo_url": REPO_URL})
+
+    assert response.status_code == 200
+    data = response.json()
+    paths = [e["path"] for e in data["entries"]]
+
+    assert paths == sorted(paths)
+    assert "src/fake/util/helpers.py" in paths
+    assert "src/fake/util" in paths
+    assert data["total_count"] == len(paths)
+    assert data["truncated"] is False
+    assert len(data["sha"]) == 40
+
+
+def test_tree_subtree_with_depth(fake_github):
+    """Test depth-limited listing below a subdirectory"""
+    response = client.post(
+        "/tree", json={"repo_url": REPO_URL, "path": "src", "depth": 2}
+    )
+
+    assert response.status_code == 200
+    paths = [e["path"] for e in response.json()["entries"]]
+    assert paths == [
+        "src/fake",
+        "src/fake/__init__.py",
+        "src/fake/core.py",
+        "src/fake/util",
+    ]
+
+
+def test_tree_include_exclude_filters(fake_github):
+    """Test include and exclude glob filters"""
+    response = client.post(
+        "/tree",
+        json={
+            "repo_url": REPO_URL,
+            "include": ["tests/**/*.py", "*.toml"],
+            "exclude": ["**/unit/*"],
+        },
+    )
+
+    assert response.status_code == 200
+    paths = [e["path"] for e in response.json()["entries"]]
+    assert paths == ["pyproject.toml", "tests/test_core.py"]
+
+
+def test_tree_size_filters(fake_github):
+    """Test size filters only match files in range"""
+    response = client.post(
+        "/tree", json={"repo_url": REPO_URL, "min_size": 1000, "max_size": 10000}
+    )
+
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    assert [e["path"] for e in entries] == ["docs/big.bin"]
+    assert entries[0]["type"] == "file"
+    assert entries[0]["size"] == 5000
+
+
+def test_tree_stream_ndjson(fake_github):
+    """Test NDJSON streaming output matches the JSON listing"""
+    body = {"repo_url": REPO_URL, "path": "src"}
+    listing = client.post("/tree", json=body).json()
+
+    response = client.post("/tree", json={**body, "stream": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-tree-sha"] == listing["sha"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == listing["entries"]
+
+
+def test_tree_fetched_once_per_commit(fake_github):
+    """Test repeated tree calls reuse the cached recursive tree"""
+    for path in ["", "src", "tests", "docs"]:
+        response = client.post("/tree", json={"repo_url": REPO_URL, "path": path})
+        assert response.status_code == 200
+
+    assert fake_github.calls["trees"] == 1
+    assert fake_github.calls["commits"] == 1
+
+
+def test_tree_path_errors(fake_github):
+    """Test missing directories and file paths are rejected"""
+    missing = client.post("/tree", json={"repo_url": REPO_URL, "path": "nope"})
+    assert missing.status_code == 404
+
+    file_path = client.post("/tree", json={"repo_url": REPO_URL, "path": "README.md"})
+    assert file_path.status_code == 400
+
+
+def test_tree_unknown_ref(fake_github):
+    """Test unknown references return 404"""
+    response = client.post("/tree", json={"repo_url": REPO_URL, "ref": "nope"})
+
+    assert response.status_code == 404
+
+
+def test_tree_invalid_depth():
+    """Test validation of depth parameter"""
+    response = client.post("/tree", json={"repo_url": REPO_URL, "depth": 0})
+
+    assert response.status_code == 422
+
+
+def test_tree_invalid_glob(fake_github):
+    """Test globs that can't compile get 422, and unclosed brackets are literal"""
+    for patterns in (["[z-a]"], ["*.py", "x[b-a]"]):
+        for stream in (False, True):
+            response = client.post(
+                "/tree",
+                json={"repo_url": REPO_URL, "include": patterns, "stream": stream},
+            )
+            assert response.status_code == 422
+
+    response = client.post("/tree", json={"repo_url": REPO_URL, "include": ["[]"]})
+    assert response.status_code == 200
+    assert response.json()["entries"] == []
+
+
+def test_match_glob():
+    """Test glob semantics for basename and full-path patterns"""
+    assert match_glob("*.py", "src/fake/core.py")
+    assert not match_glob("src/*.py", "src/fake/core.py")
+    assert match_glob("src/**/*.py", "src/fake/core.py")
+    assert match_glob("**/*.py", "core.py")
+    assert match_glob("test_[!x]*.py", "tests/test_core.py")
+    assert not match_glob("*.py", "src/fake/core.pyc")
+    # Brackets as in fnmatch: "]" first is a member, unclosed ones are literal
+    assert match_glob("[]x]", "]")
+    assert match_glob("[!]x]", "a")
+    assert match_glob("a[", "a[")
+    assert match_glob("[]", "[]")
+    assert match_glob("[!]", "[!]")
+    assert match_glob("[^]", "^")
+
+
+def test_snapshot_compact_columns():
+    """Test SHAs and sizes round-trip through the packed snapshot columns"""
+    snapshot = TreeSnapshot(
+        "c" * 40,
+        [
+            {"path": "src", "type": "tree", "sha": "a" * 40},
+            {"path": "src/core.py", "type": "blob", "sha": "0f" * 20, "size": 0},
+        ],
+    )
+
+    assert snapshot.shas[1] == "0f" * 20
+    assert snapshot.shas[-2] == "a" * 40
+    assert snapshot.size_of(0) is None
+    assert snapshot.size_of(1) == 0
+    assert snapshot.entry(0)["size"] is None
+
+
+def test_sha_table_irregular_ids():
+    """Test non-hex IDs are kept as given"""
+    table = ShaTable(["abc", "not-hex"])
+
+    assert len(table) == 2
+    assert table[1] == "not-hex"